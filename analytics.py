@@ -0,0 +1,339 @@
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import connection
+from borc import _ay_no, parse_group_concat
+from connection import get_connection
+from database import DEGISIKLIK_KAYNAKLARI, read_degisiklik_sayaclari
+
+# Tarihler 1970-01-01'den bu yana gün sayısı ("gun"), aylar 1970 Ocak'tan bu
+# yana ay sırası ("ay") olarak tutulur. Boş ya da okunamayan tarihler
+# GECERSIZ olur ve tarih gruplamalarına girmez.
+GECERSIZ = np.iinfo(np.int32).min
+
+# Metin ve tarih sütunlarının group_concat ayracı (ASCII birim ayracı, char(31))
+_AYRAC = "\x1f"
+
+def _tarih_sayisi(deger):
+    # "2024-03-15" -> 20240315; okunamayan değer 0
+    try:
+        return int(deger[:4] + deger[5:7] + deger[8:10])
+    except ValueError:
+        return 0
+
+def _tarih_sayilari(metin, adet):
+    """group_concat(tarih) metninden yyyymmdd dizisi
+
+    Tüm değerler YYYY-AA-GG biçimindeyse metin sabit genişlikli bayt
+    matrisi olarak doğrudan çözülür; değilse değerler tek tek ayrıştırılır.
+    """
+    ham = np.frombuffer((metin + _AYRAC).encode(), dtype=np.uint8)
+    if len(ham) != adet * 11:
+        return np.array([_tarih_sayisi(v) for v in metin.split(_AYRAC)], dtype=np.int64)
+    ham = ham.reshape(adet, 11)
+    rakam = ham[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - ord("0")
+    gecerli = ((rakam >= 0) & (rakam <= 9)).all(axis=1) & (ham[:, 4] == ord("-")) & (ham[:, 7] == ord("-"))
+    return np.where(gecerli, rakam @ 10 ** np.arange(7, -1, -1), 0)
+
+def _ay_sirasi(yil, ay_no):
+    gecerli = (yil > 0) & (ay_no >= 1) & (ay_no <= 12)
+    return np.where(gecerli, (yil - 1970) * 12 + ay_no - 1, GECERSIZ).astype(np.int32)
+
+def _tarih_sutunlari(tarih):
+    """yyyymmdd tamsayılarından (gun, ay) dizileri
+
+    Ay, aylık özetteki gibi tarihin yıl ve ay hanelerinden alınır.
+    """
+    gun_no = tarih % 100
+    ay = _ay_sirasi(tarih // 10000, tarih // 100 % 100)
+    gecerli = (ay != GECERSIZ) & (gun_no >= 1) & (gun_no <= 31)
+    ay_basi = np.where(gecerli, ay, 0).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    return np.where(gecerli, ay_basi + gun_no - 1, GECERSIZ).astype(np.int32), ay
+
+def _aidat(parca, tablo):
+    # Ödemenin dönemi (yil, ay adı); ay adları kod tablosu üzerinden bir kez çevrilir
+    ay_nolari = np.array([_ay_no(ay) for ay in tablo.degerler["ay_adi"]] or [0], dtype=np.int64)
+    gun, _ = _tarih_sutunlari(parca["tarih"])
+    return {"id": parca["id"], "gun": gun, "ay": _ay_sirasi(parca["yil"], ay_nolari[parca["ay_adi"]]),
+            "uye_id": parca["uye_id"].astype(np.int32), "tutar": parca["tutar"]}
+
+def _gider(parca, tablo):
+    gun, ay = _tarih_sutunlari(parca["tarih"])
+    return {"id": parca["id"], "gun": gun, "ay": ay, "tutar": parca["tutar"],
+            "banka": parca["banka"].astype(np.bool_), "kategori": parca["kategori"]}
+
+def _banka(parca, tablo):
+    gun, ay = _tarih_sutunlari(parca["tarih"])
+    return {"id": parca["id"], "gun": gun, "ay": ay, "hesap_id": parca["hesap_id"].astype(np.int32),
+            "tutar": parca["tutar"], "gelir": parca["gelir"].astype(np.bool_)}
+
+# Giderlerin kategorisi açıklamanın sonundaki dönem/numara atılarak bulunur:
+# "Elektrik 03/2019" -> "Elektrik"
+_KATEGORI_SQL = "COALESCE(NULLIF(rtrim(aciklama, ' 0123456789/.-'), ''), 'Diğer')"
+
+# Kaynak tablo -> (okunan sütunlar, türetme). Okunan sütun (ad, SQL ifadesi,
+# tür); ilk sütun her zaman id'dir. Türler: "int", "real" (yuvarlanır),
+# "tarih" (YYYY-AA-GG, yyyymmdd sayısına çevrilir) ve "metin" (tablo başına
+# koda çevrilir). İfadeler NULL döndürmemelidir: group_concat NULL'ları
+# atlar, sütunlar kayar. Türetme okunan parçadan saklanacak dizileri üretir.
+KAYNAKLAR = {
+    "aidat_odemeleri": (
+        (("id", "id", "int"), ("yil", "COALESCE(yil, 0)", "int"), ("ay_adi", "COALESCE(ay, '')", "metin"),
+         ("tarih", "COALESCE(odeme_tarihi, '')", "tarih"), ("uye_id", "COALESCE(uye_id, 0)", "int"),
+         ("tutar", "COALESCE(tutar, 0)", "real")),
+        _aidat,
+    ),
+    "giderler": (
+        (("id", "id", "int"), ("tarih", "COALESCE(odeme_tarihi, '')", "tarih"),
+         ("tutar", "COALESCE(tutar, 0)", "real"), ("banka", "COALESCE(odeme_sekli = 'Banka', 0)", "int"),
+         ("kategori", _KATEGORI_SQL, "metin")),
+        _gider,
+    ),
+    "banka_hareketleri": (
+        (("id", "id", "int"), ("tarih", "COALESCE(tarih, '')", "tarih"),
+         ("hesap_id", "COALESCE(hesap_id, 0)", "int"), ("tutar", "COALESCE(tutar, 0)", "real"),
+         ("gelir", "COALESCE(hareket_tipi = 'Gelir', 0)", "int")),
+        _banka,
+    ),
+}
+
+# Bir okumada sütunlara çevrilen en fazla satır sayısı
+BATCH_SIZE = 50000
+
+# aylik() sonucundaki ölçüler (get_aylik_ozet ile aynı adlar)
+OLCULER = ("tahsil_edilen", "beklenen", "gider_banka", "gider_nakit", "banka_gelir", "banka_gider")
+
+class Tablo:
+    """Bir tablonun sütun dizileri ve yüklenen en büyük id (watermark)"""
+    def __init__(self, table):
+        self.table = table
+        self.okunan, self.turet = KAYNAKLAR[table]
+        self.kodlar = {name: {} for name, _, tur in self.okunan if tur == "metin"}     # değer -> kod
+        self.degerler = {name: [] for name, _, tur in self.okunan if tur == "metin"}   # kod -> değer
+        self.watermark = 0
+        self.diziler = self.turet({name: np.zeros(0, dtype=np.int32 if tur == "metin" else np.int64)
+                                   for name, _, tur in self.okunan}, self)
+
+    def __len__(self):
+        return len(self.diziler["id"])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["diziler"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def select_sql(self):
+        """watermark'tan sonraki en fazla BATCH_SIZE satırı tek satırda döndüren sorgu
+
+        Her sütun virgülle (metin ve tarihler _AYRAC ile) birleştirilmiş tek bir
+        metin olarak gelir; satır başına Python nesnesi oluşmaz. Tüm
+        group_concat'lar aynı satır sırasını gezdiğinden sütunlar hizalıdır.
+        """
+        sutunlar = ", ".join(f"group_concat(c{i})" if tur in ("int", "real") else f"group_concat(c{i}, char(31))"
+                             for i, (_, _, tur) in enumerate(self.okunan))
+        ifadeler = ", ".join(f"{expr} AS c{i}" for i, (_, expr, _) in enumerate(self.okunan))
+        return (f"SELECT COUNT(*), {sutunlar} FROM "
+                f"(SELECT {ifadeler} FROM {self.table} WHERE id > ? ORDER BY id LIMIT {BATCH_SIZE})")
+
+    def encode(self, row):
+        """select_sql() satırını saklanacak sütun dizilerine çevirir"""
+        adet, degerler = row[0], row[1:]
+        parca = {}
+        for (name, _, tur), deger in zip(self.okunan, degerler):
+            if tur == "metin":
+                kodlar, sozluk = self.kodlar[name], self.degerler[name]
+                metinler = deger.split(_AYRAC)
+                for yeni in sorted(set(metinler).difference(kodlar)):
+                    kodlar[yeni] = len(sozluk)
+                    sozluk.append(yeni)
+                parca[name] = np.fromiter(map(kodlar.__getitem__, metinler), dtype=np.int32, count=adet)
+            elif tur == "tarih":
+                parca[name] = _tarih_sayilari(deger, adet)
+            elif tur == "real":
+                # Tutarlar REAL olarak da kaydedilmiş olabilir: ondalıklı okunur, yuvarlanır
+                parca[name] = np.rint(parse_group_concat(deger, np.float64)).astype(np.int64)
+            else:
+                parca[name] = parse_group_concat(deger)
+            if len(parca[name]) != adet:
+                raise ValueError(f"{self.table}.{name}: {adet} satır beklenirken {len(parca[name])} değer")
+        return self.turet(parca, self)
+
+    def extend(self, parcalar):
+        """encode() çıktılarını tablonun sonuna ekler; her sütun bir kez kopyalanır"""
+        if parcalar:
+            self.diziler = {name: np.concatenate([dizi] + [parca[name] for parca in parcalar])
+                            for name, dizi in self.diziler.items()}
+
+    def nbytes(self):
+        return sum(dizi.nbytes for dizi in self.diziler.values())
+
+class AnalizGoruntusu:
+    """Genel rapor için aidat, gider ve banka verilerinin sütunlu bellek kopyası
+
+    Tablolar bir kez sütun dizilerine yüklenir; aylık, kategori ve yıllar
+    arası karşılaştırmalar NumPy ile vektörel hesaplanır. refresh() tablonun
+    değişiklik sayacı değişmediyse yalnızca son yüklenen id'den sonra
+    eklenen satırları okur; güncelleme ya da silme olduysa o tabloyu
+    baştan yükler.
+    """
+    def __init__(self, path=None):
+        self.path = path or connection.DB_PATH
+        self.tablolar = {name: Tablo(name) for name in KAYNAKLAR}
+        self.sayaclar = {}
+        self.tarife = {}       # (yil, ay_no) -> tutar
+        self.daire_sayisi = 0
+        self.yenilenen_satir = 0
+        self.sure = 0.0
+        self._lock = threading.Lock()
+
+    def __getitem__(self, table):
+        return self.tablolar[table]
+
+    def refresh(self):
+        """Görüntüyü veritabanıyla eşitler; okunan satır sayısını döndürür"""
+        start = time.perf_counter()
+        okunan = 0
+        with self._lock, get_connection(self.path) as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            # Sayaçlar ve yeni satırlar aynı okuma işleminden gelsin
+            if not conn.in_transaction:
+                cursor.execute("BEGIN")
+            try:
+                sayaclar = read_degisiklik_sayaclari(cursor)
+            except sqlite3.OperationalError:
+                # Sayaç tablosu henüz yok (geçiş adımı bekliyor): her seferinde baştan
+                sayaclar = dict.fromkeys(DEGISIKLIK_KAYNAKLARI)
+            for table in KAYNAKLAR:
+                if sayaclar[table] is None or sayaclar[table] != self.sayaclar.get(table):
+                    self.tablolar[table] = Tablo(table)
+                tablo = self.tablolar[table]
+                sql = tablo.select_sql()
+                parcalar = []
+                while True:
+                    row = cursor.execute(sql, (tablo.watermark,)).fetchone()
+                    if not row[0]:
+                        break
+                    parca = tablo.encode(row)
+                    parcalar.append(parca)
+                    tablo.watermark = int(parca["id"].max())
+                    okunan += row[0]
+                    if row[0] < BATCH_SIZE:
+                        break
+                tablo.extend(parcalar)
+            self.sayaclar = sayaclar
+            # Tarife ve daire sayısı küçüktür, her seferinde okunur
+            cursor.execute("SELECT yil, ay_no, tutar FROM aidat_tarifeleri")
+            self.tarife = {(yil, ay_no): tutar or 0 for yil, ay_no, tutar in cursor.fetchall()}
+            self.daire_sayisi = cursor.execute("SELECT COUNT(*) FROM uyeler").fetchone()[0]
+        self.yenilenen_satir = okunan
+        self.sure = time.perf_counter() - start
+        return okunan
+
+    def _tarife_dizisi(self, start_year, ay_sayisi):
+        tarife = np.zeros(ay_sayisi, dtype=np.int64)
+        for (yil, ay_no), tutar in self.tarife.items():
+            i = (yil - start_year) * 12 + ay_no - 1
+            if 1 <= ay_no <= 12 and 0 <= i < ay_sayisi:
+                tarife[i] = tutar
+        return tarife
+
+    def aylik(self, start_year, end_year=None):
+        """{ölçü: (ay_sayisi,) dizi} start_year Ocak'tan end_year Aralık'a
+
+        Ölçüler get_aylik_ozet ile aynıdır; aidat tahsilatı ödemenin ait
+        olduğu döneme (yil, ay), gider ve banka hareketleri tarihlerine göre
+        gruplanır.
+        """
+        end_year = end_year or start_year
+        ay_sayisi = (end_year - start_year + 1) * 12
+        ilk_ay = (start_year - 1970) * 12
+
+        def topla(tablo, maske=None):
+            # Çıkarma seçimden sonra: GECERSIZ int32'de taşmasın
+            gecerli = (tablo.ay >= ilk_ay) & (tablo.ay < ilk_ay + ay_sayisi)
+            if maske is not None:
+                gecerli &= maske
+            return np.bincount(tablo.ay[gecerli] - ilk_ay, weights=tablo.tutar[gecerli],
+                               minlength=ay_sayisi).round().astype(np.int64)
+
+        aidat = self.tablolar["aidat_odemeleri"]
+        gider = self.tablolar["giderler"]
+        banka = self.tablolar["banka_hareketleri"]
+
+        return {
+            "tahsil_edilen": topla(aidat),
+            "beklenen": self._tarife_dizisi(start_year, ay_sayisi) * self.daire_sayisi,
+            "gider_banka": topla(gider, gider.banka),
+            "gider_nakit": topla(gider, ~gider.banka),
+            "banka_gelir": topla(banka, banka.gelir),
+            "banka_gider": topla(banka, ~banka.gelir),
+        }
+
+    def yillik(self, start_year, end_year=None):
+        """{ölçü: (yil_sayisi,) dizi}"""
+        return {olcu: dizi.reshape(-1, 12).sum(axis=1)
+                for olcu, dizi in self.aylik(start_year, end_year).items()}
+
+    def gider_kategorileri(self, start_year, end_year=None):
+        """[(kategori, adet, toplam)] toplama göre azalan"""
+        end_year = end_year or start_year
+        gider = self.tablolar["giderler"]
+        secili = (gider.ay >= (start_year - 1970) * 12) & (gider.ay < (end_year + 1 - 1970) * 12)
+        kategori = gider.kategori[secili]
+        adlar = gider.degerler["kategori"]
+        adet = np.bincount(kategori, minlength=len(adlar))
+        toplam = np.bincount(kategori, weights=gider.tutar[secili], minlength=len(adlar)).round().astype(np.int64)
+        sira = np.argsort(-toplam, kind="stable")
+        return [(adlar[i], int(adet[i]), int(toplam[i])) for i in sira if adet[i]]
+
+    def yil_karsilastirma(self, yil):
+        """Ay başına {ölçü: (bu yıl, geçen yıl, değişim oranı)} ve yıl toplamı
+
+        Dönüş [(ay_no, {ölçü: (bu yıl, geçen yıl, oran)})] 12 ay ve sonda
+        ay_no=0 olan yıl toplamıdır. Geçen yıl 0 ise oran None'dır.
+        """
+        aylik = self.aylik(yil - 1, yil)
+        onceki = {olcu: dizi[:12] for olcu, dizi in aylik.items()}
+        bu_yil = {olcu: dizi[12:] for olcu, dizi in aylik.items()}
+        for olcular in (onceki, bu_yil):
+            for olcu, dizi in list(olcular.items()):
+                olcular[olcu] = np.append(dizi, dizi.sum())
+        oranlar = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for olcu in OLCULER:
+                oranlar[olcu] = np.where(onceki[olcu] != 0,
+                                         (bu_yil[olcu] - onceki[olcu]) / np.abs(onceki[olcu]), np.nan)
+        return [(ay_no, {olcu: (int(bu_yil[olcu][i]), int(onceki[olcu][i]),
+                                None if np.isnan(oranlar[olcu][i]) else float(oranlar[olcu][i]))
+                         for olcu in OLCULER})
+                for i, ay_no in enumerate(list(range(1, 13)) + [0])]
+
+    def nbytes(self):
+        return sum(tablo.nbytes() for tablo in self.tablolar.values())
+
+_goruntuler = {}
+_goruntuler_lock = threading.Lock()
+
+def get_snapshot(path=None):
+    """Veritabanının (yoksa varsayılanın) güncellenmiş analiz görüntüsü
+
+    Görüntü dosya yolu başına bir kez oluşturulur ve süreç boyunca tutulur;
+    sonraki çağrılar yalnızca artımlı refresh() yapar.
+    """
+    path = path or connection.DB_PATH
+    with _goruntuler_lock:
+        goruntu = _goruntuler.get(path)
+        if goruntu is None:
+            goruntu = _goruntuler[path] = AnalizGoruntusu(path)
+    goruntu.refresh()
+    return goruntu
+
+def drop_snapshots():
+    """Tutulan görüntüleri bırakır (bellek ya da test için)"""
+    with _goruntuler_lock:
+        _goruntuler.clear()
@@ -1,23 +1,59 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, Menu
-import sqlite3
+from tkinter import ttk, messagebox, filedialog, simpledialog, Menu
+import importlib
+import sys
 from datetime import date, datetime
 import calendar
-import os
-import csv
-import bcrypt
 from utils import center_window, set_icon, is_valid_phone, is_valid_email, format_currency
-from database import create_connection, init_database
-from forms import (
-    UyeForm, AidatForm, AidatOdemeForm, GiderForm, BankaHesapForm, 
-    BankaHareketForm, ApartmanBilgileriForm, KullaniciForm
-)
-from reports import (
-    AidatRaporu, GiderRaporu, BankaRaporuForm, GenelRaporForm,
-    export_data_to_csv
-)
+from database import init_database, schema_is_current, get_dashboard_ozeti
+from db_executor import run_in_background, shutdown_executor
+from tenants import list_tenants, activate_tenant, current_tenant, shutdown_pool
+from metrics import timed_ui
+
+def _lazy(module_name, attr):
+    """Modülü ilk çağrıda içe aktaran yer tutucu
+
+    forms / reports modülleri (ve onların çektiği numpy, csv, bcrypt) açılışta
+    değil, ilgili menü ilk kullanıldığında yüklenir.
+    """
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+    call.__name__ = attr
+    return call
+
+class TimedMenu(Menu):
+    """Komutlarının tıklamadan ekrana gelişe kadar geçen süresini ölçen menü"""
+    def add_command(self, cnf=None, **kw):
+        if kw.get("command") is not None:
+            kw["command"] = timed_ui(kw.get("label", "?"), kw["command"], self)
+        return super().add_command(cnf or {}, **kw)
+
+UyeForm = _lazy("forms", "UyeForm")
+AidatForm = _lazy("forms", "AidatForm")
+AidatOdemeForm = _lazy("forms", "AidatOdemeForm")
+GiderForm = _lazy("forms", "GiderForm")
+BankaHesapForm = _lazy("forms", "BankaHesapForm")
+BankaHareketForm = _lazy("forms", "BankaHareketForm")
+ApartmanBilgileriForm = _lazy("forms", "ApartmanBilgileriForm")
+KullaniciForm = _lazy("forms", "KullaniciForm")
+AidatRaporu = _lazy("reports", "AidatRaporu")
+GiderRaporu = _lazy("reports", "GiderRaporu")
+BankaRaporuForm = _lazy("reports", "BankaRaporuForm")
+GenelRaporForm = _lazy("reports", "GenelRaporForm")
+BorcRaporu = _lazy("reports", "BorcRaporu")
+EkstreForm = _lazy("reports", "EkstreForm")
+MutabakatRaporu = _lazy("reports", "MutabakatRaporu")
+KonsolideRapor = _lazy("reports", "KonsolideRapor")
+PerformansRaporu = _lazy("reports", "PerformansRaporu")
+AramaPenceresi = _lazy("reports", "AramaPenceresi")
+export_data_to_csv = _lazy("reports", "export_data_to_csv")
+import_data_from_csv = _lazy("reports", "import_data_from_csv")
 from styles import apply_styles, PRIMARY_COLOR, SECONDARY_COLOR, BG_COLOR, TEXT_COLOR
 
+def _run_online_migrations():
+    from migrations import migrate
+    return migrate()
+
 # Global değişkenler
 current_user = None
 current_role = None
@@ -38,12 +74,21 @@ class ApartmanYonetimSistemi:
         # Stil uygula
         apply_styles()
         
-        # Veritabanını başlat
-        init_database()
+        # Kayıtlı binalar varsa veritabanı girişte seçilen binanınkidir
+        self.binalar = list_tenants()
+        if not self.binalar:
+            init_database()
+            self.finish_migrations()
         
         # Login ekranını göster
         self.show_login_form()
     
+    def finish_migrations(self):
+        """Parça parça çalışan geçiş adımlarını arayüzü bekletmeden arka planda tamamlar"""
+        if not schema_is_current():
+            run_in_background(self.root, _run_online_migrations,
+                              on_error=lambda e: print(f"Veritabanı geçiş hatası: {str(e)}"))
+    
     def toggle_fullscreen(self, event=None):
         """Tam ekran modunu değiştirir"""
         is_fullscreen = self.root.attributes('-fullscreen')
@@ -63,12 +108,26 @@ class ApartmanYonetimSistemi:
         login_frame.pack(expand=True, fill="both")
         
         # Pozisyonu ayarla
-        login_frame.place(relx=0.5, rely=0.5, anchor="center", width=400, height=300)
+        login_frame.place(relx=0.5, rely=0.5, anchor="center", width=400,
+                          height=370 if self.binalar else 300)
         
         # Başlık
         title_label = ttk.Label(login_frame, text="Apartman Yönetim Sistemi", font=("Arial", 18, "bold"))
         title_label.pack(pady=(0, 20))
         
+        # Bina (çok binalı kurulumda; kullanıcılar her binanın kendi veritabanındadır)
+        bina_combo = None
+        if self.binalar:
+            ttk.Label(login_frame, text="Bina:").pack(anchor="w", pady=(10, 5))
+            bina_combo = ttk.Combobox(login_frame, state="readonly", width=28,
+                                      values=[f"{b.kod} - {b.adi}" for b in self.binalar])
+            kodlar = [b.kod for b in self.binalar]
+            bina_combo.current(kodlar.index(current_tenant()) if current_tenant() in kodlar else 0)
+            bina_combo.pack(fill="x", pady=(0, 10))
+        
+        def selected_tenant():
+            return self.binalar[bina_combo.current()].kod if bina_combo else None
+        
         # Kullanıcı adı
         ttk.Label(login_frame, text="Kullanıcı Adı:").pack(anchor="w", pady=(10, 5))
         username_entry = ttk.Entry(login_frame, width=30)
@@ -81,47 +140,65 @@ class ApartmanYonetimSistemi:
         
         # Giriş butonu
         login_button = ttk.Button(login_frame, text="Giriş", 
-                                 command=lambda: self.login(username_entry.get(), password_entry.get()))
+                                 command=lambda: self.login(username_entry.get(), password_entry.get(),
+                                                            selected_tenant()))
         login_button.pack(pady=20)
+        self.login_button = login_button
         
         # ENTER tuşuna basıldığında giriş yap
-        password_entry.bind("<Return>", lambda event: self.login(username_entry.get(), password_entry.get()))
+        password_entry.bind("<Return>", lambda event: self.login(username_entry.get(), password_entry.get(),
+                                                                  selected_tenant()))
         
         # İlk alana odaklan
         username_entry.focus()
     
-    def login(self, username, password):
+    def login(self, username, password, bina_kodu=None):
         """Kullanıcı girişi için doğrulama"""
-        global current_user, current_role
-        
         if not username or not password:
             messagebox.showerror("Hata", "Kullanıcı adı ve şifre gereklidir!")
             return
         
-        try:
-            conn = create_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT sifre, rol FROM kullanicilar WHERE kullanici_adi=?", (username,))
-            user = cursor.fetchone()
-            
-            if user and bcrypt.checkpw(password.encode('utf-8'), user[0]):
-                current_user = username
-                current_role = user[1]
+        # bcrypt doğrulaması arka planda yapılır; bu sırada tekrar giriş denenemez
+        # (bina da değiştirilemez, doğrulama başka binanın kullanıcılarını okumasın)
+        if str(self.login_button["state"]) == "disabled":
+            return
+        
+        if bina_kodu is not None and bina_kodu != current_tenant():
+            try:
+                activate_tenant(bina_kodu)
+            except Exception as e:
+                messagebox.showerror("Hata", f"Bina veritabanı açılamadı: {str(e)}")
+                return
+            self.finish_migrations()
+        db_path = next((b.db_path for b in self.binalar if b.kod == bina_kodu), None)
+        self.login_button.config(state="disabled", text="Doğrulanıyor...")
+        
+        def on_verified(oturum):
+            global current_user, current_role
+            if oturum is not None:
+                current_user = oturum.kullanici_adi
+                current_role = oturum.rol
                 self.create_main_menu()
             else:
+                self.login_button.config(state="normal", text="Giriş")
                 messagebox.showerror("Hata", "Geçersiz kullanıcı adı veya şifre!")
-                
-        except Exception as e:
+        
+        def on_error(e):
+            self.login_button.config(state="normal", text="Giriş")
             messagebox.showerror("Hata", f"Giriş hatası: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+        
+        # auth (ve bcrypt) ilk giriş denemesinde yüklenir
+        from auth import verify_user
+        run_in_background(self.login_button, verify_user, username, password, db_path,
+                          on_success=on_verified, on_error=on_error, key="login")
     
     def logout(self):
         """Kullanıcı çıkışı yapar"""
         global current_user, current_role
         current_user = None
         current_role = None
+        # Bellekteki oturum SESSION_TTL boyunca korunur; aynı kullanıcının
+        # bu süre içinde yeniden girişi bcrypt maliyetini tekrar ödemez
         self.show_login_form()
     
     def create_main_menu(self):
@@ -140,8 +217,10 @@ class ApartmanYonetimSistemi:
         top_panel = ttk.Frame(main_frame, style="TopPanel.TFrame")
         top_panel.pack(fill="x", side="top")
         
-        # Başlık
-        title_label = ttk.Label(top_panel, text="Apartman Yönetim Sistemi", 
+        # Başlık (çok binalı kurulumda etkin bina)
+        bina = next((b for b in self.binalar if b.kod == current_tenant()), None)
+        title_label = ttk.Label(top_panel, text=f"Apartman Yönetim Sistemi - {bina.adi}" if bina
+                               else "Apartman Yönetim Sistemi", 
                                font=("Arial", 16, "bold"), style="TopPanel.TLabel")
         title_label.pack(side="left", padx=10, pady=10)
         
@@ -151,29 +230,39 @@ class ApartmanYonetimSistemi:
                               style="TopPanel.TLabel")
         user_label.pack(side="right", padx=10, pady=10)
         
+        # Genel arama (Ctrl+F): üyeler, giderler, banka hareketleri, aidat ödemeleri
+        search_entry = ttk.Entry(top_panel, width=30)
+        search_entry.pack(side="right", padx=10, pady=10)
+        ttk.Label(top_panel, text="Ara:", style="TopPanel.TLabel").pack(side="right")
+        search_entry.bind("<Return>", lambda event: timed_ui(
+            "Arama", AramaPenceresi, self.root)(self.root, search_entry.get().strip()))
+        self.root.bind("<Control-f>", lambda event: search_entry.focus_set())
+        
         # Menü çubuğu oluştur
         menubar = Menu(self.root)
         self.root.config(menu=menubar)
         
         # Dosya menüsü
-        file_menu = Menu(menubar, tearoff=0)
+        file_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Dosya", menu=file_menu)
+        if self.binalar:
+            file_menu.add_command(label="Bina Değiştir", command=self.logout)
         file_menu.add_command(label="Çıkış", command=self.logout)
         
         # Apartman menüsü
-        apartman_menu = Menu(menubar, tearoff=0)
+        apartman_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Apartman", menu=apartman_menu)
         apartman_menu.add_command(label="Apartman Bilgileri", 
                                  command=lambda: ApartmanBilgileriForm(self.root))
         
         # Üyeler menüsü
-        uyeler_menu = Menu(menubar, tearoff=0)
+        uyeler_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Üyeler", menu=uyeler_menu)
         uyeler_menu.add_command(label="Üye Ekle/Düzenle", 
                                command=lambda: UyeForm(self.root))
         
         # Aidat menüsü
-        aidat_menu = Menu(menubar, tearoff=0)
+        aidat_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Aidatlar", menu=aidat_menu)
         aidat_menu.add_command(label="Aidat Belirle", 
                               command=lambda: AidatForm(self.root))
@@ -181,9 +270,15 @@ class ApartmanYonetimSistemi:
                               command=lambda: AidatOdemeForm(self.root))
         aidat_menu.add_command(label="Aidat Raporu", 
                               command=lambda: AidatRaporu(self.root))
+        aidat_menu.add_command(label="Borç Durumu", 
+                              command=lambda: BorcRaporu(self.root))
+        aidat_menu.add_command(label="Aidat Ekstreleri (PDF)", 
+                              command=lambda: EkstreForm(self.root))
+        aidat_menu.add_command(label="Ödemeleri İçe Aktar", 
+                              command=lambda: import_data_from_csv(self.root, "aidat"))
         
         # Giderler menüsü
-        gider_menu = Menu(menubar, tearoff=0)
+        gider_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Giderler", menu=gider_menu)
         gider_menu.add_command(label="Gider Ekle", 
                               command=lambda: GiderForm(self.root))
@@ -191,7 +286,7 @@ class ApartmanYonetimSistemi:
                               command=lambda: GiderRaporu(self.root))
         
         # Banka menüsü
-        banka_menu = Menu(menubar, tearoff=0)
+        banka_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Banka", menu=banka_menu)
         banka_menu.add_command(label="Banka Hesapları", 
                               command=lambda: BankaHesapForm(self.root))
@@ -199,24 +294,35 @@ class ApartmanYonetimSistemi:
                               command=lambda: BankaHareketForm(self.root))
         banka_menu.add_command(label="Banka Raporu", 
                               command=lambda: BankaRaporuForm(self.root))
+        banka_menu.add_command(label="Ekstre İçe Aktar", 
+                              command=lambda: import_data_from_csv(self.root, "banka"))
+        banka_menu.add_command(label="Aidat Mutabakatı", 
+                              command=lambda: MutabakatRaporu(self.root))
         
         # Raporlar menüsü
-        rapor_menu = Menu(menubar, tearoff=0)
+        rapor_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Raporlar", menu=rapor_menu)
         rapor_menu.add_command(label="Genel Rapor", 
                               command=lambda: GenelRaporForm(self.root))
         rapor_menu.add_command(label="Veri Dışa Aktar", 
                               command=lambda: self.show_export_options())
+        if self.binalar and current_role == "yönetici":
+            rapor_menu.add_command(label="Konsolide Bina Raporu", 
+                                  command=lambda: KonsolideRapor(self.root))
         
         # Sadece yönetici için olan menüler
         if current_role == "yönetici":
-            admin_menu = Menu(menubar, tearoff=0)
+            admin_menu = TimedMenu(menubar, tearoff=0)
             menubar.add_cascade(label="Yönetim", menu=admin_menu)
             admin_menu.add_command(label="Kullanıcı Yönetimi", 
                                   command=lambda: KullaniciForm(self.root))
+            admin_menu.add_command(label="Performans", 
+                                  command=lambda: PerformansRaporu(self.root))
+            admin_menu.add_command(label="Şifre Güvenliği", 
+                                  command=self.set_password_cost)
         
         # Yardım menüsü
-        help_menu = Menu(menubar, tearoff=0)
+        help_menu = TimedMenu(menubar, tearoff=0)
         menubar.add_cascade(label="Yardım", menu=help_menu)
         help_menu.add_command(label="Hakkında", command=self.show_about)
         
@@ -243,87 +349,78 @@ class ApartmanYonetimSistemi:
     
     def show_apartment_summary(self, parent_frame):
         """Ana sayfada apartman özet bilgilerini gösterir"""
-        try:
-            conn = create_connection()
-            cursor = conn.cursor()
-            
-            # Apartman bilgilerini al
-            cursor.execute("SELECT adi, yonetici FROM apartman WHERE id=1")
-            apartman_data = cursor.fetchone()
-            
-            # Üye sayısını al
-            cursor.execute("SELECT COUNT(*) FROM uyeler")
-            uye_sayisi = cursor.fetchone()[0]
-            
-            # Güncel ay aidat bilgilerini al
-            current_year = datetime.now().year
-            current_month = datetime.now().month
-            ay_isimleri = ["ocak", "subat", "mart", "nisan", "mayis", "haziran", 
-                          "temmuz", "agustos", "eylul", "ekim", "kasim", "aralik"]
-            current_month_name = ay_isimleri[current_month - 1]
-            
-            cursor.execute(f"SELECT {current_month_name} FROM aidatlar WHERE yil=?", (current_year,))
-            aidat_tutari_result = cursor.fetchone()
-            aidat_tutari = aidat_tutari_result[0] if aidat_tutari_result else 0
-            
-            # Toplam borç
-            cursor.execute("""
-                SELECT SUM(a.tutar) 
-                FROM aidat_odemeleri AS a
-                WHERE a.yil = ? AND a.ay = ?
-            """, (current_year, current_month_name))
-            odenen_toplam = cursor.fetchone()[0] or 0
-            toplam_borc = (aidat_tutari * uye_sayisi) - odenen_toplam
-            
-            # Özet frame
-            summary_frame = ttk.LabelFrame(parent_frame, text="Apartman Özeti", padding=10)
-            summary_frame.pack(fill="both", expand=True, padx=20, pady=20)
-            
-            # Bilgileri göster
-            if apartman_data:
-                ttk.Label(summary_frame, 
-                         text=f"Apartman: {apartman_data[0]}", 
-                         font=("Arial", 12)).pack(anchor="w", pady=5)
-                ttk.Label(summary_frame, 
-                         text=f"Yönetici: {apartman_data[1]}", 
-                         font=("Arial", 12)).pack(anchor="w", pady=5)
-            else:
-                ttk.Label(summary_frame, 
-                         text="Apartman bilgileri henüz girilmemiş.", 
-                         font=("Arial", 12)).pack(anchor="w", pady=5)
-            
+        # Özet frame
+        summary_frame = ttk.LabelFrame(parent_frame, text="Apartman Özeti", padding=10)
+        summary_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        loading_label = ttk.Label(summary_frame, text="Yükleniyor...", font=("Arial", 12))
+        loading_label.pack(anchor="w", pady=5)
+        loading_bar = ttk.Progressbar(summary_frame, mode="indeterminate", length=200)
+        loading_bar.pack(anchor="w", pady=5)
+        loading_bar.start(10)
+        
+        # Güncel ay özetini arka planda tek sorguda al
+        current_year = datetime.now().year
+        current_month = datetime.now().month
+        
+        def on_loaded(ozet):
+            loading_bar.stop()
+            loading_label.destroy()
+            loading_bar.destroy()
+            if ozet is None:
+                on_error(RuntimeError("Özet sorgusu başarısız oldu"))
+                return
+            self.render_apartment_summary(summary_frame, ozet, current_year, current_month)
+        
+        def on_error(e):
+            messagebox.showerror("Hata", f"Özet bilgileri yüklenirken hata: {str(e)}")
+        
+        run_in_background(summary_frame, get_dashboard_ozeti, current_year, current_month,
+                          on_success=on_loaded, on_error=on_error, key="dashboard")
+        
+        # Kısa yollar
+        shortcuts_frame = ttk.Frame(parent_frame)
+        shortcuts_frame.pack(fill="x", pady=20)
+        
+        ttk.Button(shortcuts_frame, 
+                  text="Üye Ekle", 
+                  command=lambda: UyeForm(self.root)).pack(side="left", padx=10)
+        ttk.Button(shortcuts_frame, 
+                  text="Aidat Ödeme Kaydet", 
+                  command=lambda: AidatOdemeForm(self.root)).pack(side="left", padx=10)
+        ttk.Button(shortcuts_frame, 
+                  text="Gider Ekle", 
+                  command=lambda: GiderForm(self.root)).pack(side="left", padx=10)
+        ttk.Button(shortcuts_frame, 
+                  text="Genel Rapor", 
+                  command=lambda: GenelRaporForm(self.root)).pack(side="left", padx=10)
+    
+    def render_apartment_summary(self, summary_frame, ozet, current_year, current_month):
+        """Yüklenen özet satırını özet çerçevesine yazar"""
+        if ozet["apartman_kayitli"]:
             ttk.Label(summary_frame, 
-                     text=f"Toplam Daire Sayısı: {uye_sayisi}", 
+                     text=f"Apartman: {ozet['apartman_adi']}", 
                      font=("Arial", 12)).pack(anchor="w", pady=5)
             ttk.Label(summary_frame, 
-                     text=f"Güncel Aidat ({calendar.month_name[current_month]} {current_year}): {format_currency(aidat_tutari)} TL", 
+                     text=f"Yönetici: {ozet['yonetici']}", 
                      font=("Arial", 12)).pack(anchor="w", pady=5)
+        else:
             ttk.Label(summary_frame, 
-                     text=f"Toplam Tahsil Edilecek: {format_currency(toplam_borc)} TL", 
+                     text="Apartman bilgileri henüz girilmemiş.", 
                      font=("Arial", 12)).pack(anchor="w", pady=5)
-            
-            # Kısa yollar
-            shortcuts_frame = ttk.Frame(parent_frame)
-            shortcuts_frame.pack(fill="x", pady=20)
-            
-            ttk.Button(shortcuts_frame, 
-                      text="Üye Ekle", 
-                      command=lambda: UyeForm(self.root)).pack(side="left", padx=10)
-            ttk.Button(shortcuts_frame, 
-                      text="Aidat Ödeme Kaydet", 
-                      command=lambda: AidatOdemeForm(self.root)).pack(side="left", padx=10)
-            ttk.Button(shortcuts_frame, 
-                      text="Gider Ekle", 
-                      command=lambda: GiderForm(self.root)).pack(side="left", padx=10)
-            ttk.Button(shortcuts_frame, 
-                      text="Genel Rapor", 
-                      command=lambda: GenelRaporForm(self.root)).pack(side="left", padx=10)
-                
-        except Exception as e:
-            messagebox.showerror("Hata", f"Özet bilgileri yüklenirken hata: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+        
+        ttk.Label(summary_frame, 
+                 text=f"Toplam Daire Sayısı: {ozet['uye_sayisi']}", 
+                 font=("Arial", 12)).pack(anchor="w", pady=5)
+        ttk.Label(summary_frame, 
+                 text=f"Güncel Aidat ({calendar.month_name[current_month]} {current_year}): {format_currency(ozet['aidat_tutari'])} TL", 
+                 font=("Arial", 12)).pack(anchor="w", pady=5)
+        ttk.Label(summary_frame, 
+                 text=f"Toplam Tahsil Edilecek: {format_currency(ozet['toplam_borc'])} TL", 
+                 font=("Arial", 12)).pack(anchor="w", pady=5)
+        ttk.Label(summary_frame, 
+                 text=f"Borçlu Daire Sayısı: {ozet['borclu_daire_sayisi']}", 
+                 font=("Arial", 12)).pack(anchor="w", pady=5)
     
     def show_export_options(self):
         """Veri dışa aktarma seçeneklerini gösterir"""
@@ -353,6 +450,27 @@ class ApartmanYonetimSistemi:
                   text="Kapat", 
                   command=export_window.destroy).pack(pady=20)
     
+    def set_password_cost(self):
+        """Şifre özetleme maliyetini (bcrypt iş faktörü) ayarlar"""
+        import auth
+        cost = simpledialog.askinteger(
+            "Şifre Güvenliği",
+            "bcrypt maliyeti (her artış girişi yaklaşık iki kat yavaşlatır).\n"
+            "Mevcut şifreler sahiplerinin bir sonraki girişinde yeni maliyetle özetlenir.",
+            parent=self.root, initialvalue=auth.BCRYPT_COST,
+            minvalue=auth.MIN_BCRYPT_COST, maxvalue=auth.MAX_BCRYPT_COST)
+        if cost is None or cost == auth.BCRYPT_COST:
+            return
+        
+        def on_saved(_):
+            messagebox.showinfo("Bilgi", f"bcrypt maliyeti {cost} olarak kaydedildi.")
+        
+        def on_error(e):
+            messagebox.showerror("Hata", f"Şifre maliyeti kaydedilemedi: {str(e)}")
+        
+        run_in_background(self.root, auth.save_bcrypt_cost, cost,
+                          on_success=on_saved, on_error=on_error)
+    
     def show_about(self):
         """Hakkında penceresini gösterir"""
         about_window = tk.Toplevel(self.root)
@@ -379,3 +497,8 @@ if __name__ == "__main__":
     root = tk.Tk()
     app = ApartmanYonetimSistemi(root)
     root.mainloop()
+    shutdown_executor()
+    shutdown_pool()
+    # PDF süreç havuzu yalnızca reports yüklendiyse açılmış olabilir
+    if "pdf" in sys.modules:
+        sys.modules["pdf"].shutdown_render_pool()
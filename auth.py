@@ -0,0 +1,174 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+import bcrypt
+
+from connection import get_connection
+from database import read_setting, write_setting
+
+# bcrypt iş faktörü (2^cost tur). Her veritabanında sistem_ayarlari'ndaki
+# "bcrypt_cost" ayarından okunur, yoksa varsayılan kullanılır. Değiştirildiğinde
+# eski maliyetle saklanan şifreler bir sonraki başarılı girişte yeni maliyetle
+# yeniden özetlenir.
+DEFAULT_BCRYPT_COST = 12
+MIN_BCRYPT_COST = 4
+MAX_BCRYPT_COST = 31
+BCRYPT_COST_AYARI = "bcrypt_cost"
+BCRYPT_COST = DEFAULT_BCRYPT_COST
+
+# Oturum belirtecinin geçerlilik süresi (saniye)
+SESSION_TTL = 300
+
+# Yalnızca bellekte tutulan oturumlar; süreç kapanınca kaybolur
+_lock = threading.Lock()
+_oturumlar = {}           # belirteç -> Oturum
+_son_oturum = {}          # kullanıcı adı -> belirteç
+# Oturumdaki şifre özeti bu süreçe özgü rastgele anahtarla HMAC'lenir
+_hmac_key = secrets.token_bytes(32)
+
+class Oturum:
+    """Doğrulanmış bir girişin bellek içi kaydı"""
+    def __init__(self, kullanici_adi, rol, sifre_ozeti, sifre_hash):
+        self.token = secrets.token_urlsafe(32)
+        self.kullanici_adi = kullanici_adi
+        self.rol = rol
+        self.bitis = time.monotonic() + SESSION_TTL
+        self._sifre_ozeti = sifre_ozeti
+        self._sifre_hash = sifre_hash  # şifre değişince oturum geçersiz sayılır
+
+    def gecerli(self):
+        return time.monotonic() < self.bitis
+
+def _check_cost(cost):
+    cost = int(cost)
+    if not MIN_BCRYPT_COST <= cost <= MAX_BCRYPT_COST:
+        raise ValueError(f"bcrypt maliyeti {MIN_BCRYPT_COST} ile {MAX_BCRYPT_COST} arasında olmalıdır")
+    return cost
+
+def set_bcrypt_cost(cost):
+    """Yeni şifreler ve yeniden özetleme için bcrypt maliyetini ayarlar (kaydetmez)"""
+    global BCRYPT_COST
+    BCRYPT_COST = _check_cost(cost)
+
+def load_bcrypt_cost(cursor):
+    """Veritabanındaki maliyeti (kayıt yoksa varsayılanı) geçerli maliyet yapar ve döndürür"""
+    deger = read_setting(cursor, BCRYPT_COST_AYARI)
+    try:
+        set_bcrypt_cost(DEFAULT_BCRYPT_COST if deger is None else deger)
+    except ValueError as e:
+        print(f"bcrypt maliyeti okuma hatası: {str(e)}")
+        set_bcrypt_cost(DEFAULT_BCRYPT_COST)
+    return BCRYPT_COST
+
+def save_bcrypt_cost(cost, path=None):
+    """Maliyeti path veritabanına (verilmezse varsayılana) kaydeder ve geçerli maliyet yapar"""
+    cost = _check_cost(cost)
+    with get_connection(path) as conn:
+        write_setting(conn.cursor(), BCRYPT_COST_AYARI, cost)
+    set_bcrypt_cost(cost)
+
+def hash_password(password, cost=None):
+    """Şifreyi geçerli maliyetle bcrypt ile özetler"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=cost or BCRYPT_COST))
+
+def hash_cost(hashed):
+    """Saklanan bcrypt özetinin maliyetini döndürür ("$2b$12$..." -> 12)"""
+    try:
+        return int(_as_bytes(hashed).split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed, cost=None):
+    return hash_cost(hashed) != (cost or BCRYPT_COST)
+
+def _as_bytes(hashed):
+    # sifre sütunu TEXT olarak tanımlı, ancak bcrypt bytes döndürdüğü için BLOB olarak saklanır
+    return hashed.encode('utf-8') if isinstance(hashed, str) else bytes(hashed)
+
+def _ozet(password):
+    return hmac.new(_hmac_key, password.encode('utf-8'), hashlib.sha256).digest()
+
+def verify_user(username, password, path=None):
+    """Kullanıcıyı path veritabanında (verilmezse varsayılanda) doğrular
+
+    Başarılıysa Oturum, değilse None döndürür.
+
+    bcrypt bilerek yavaştır; bu fonksiyon Tk iş parçacığında değil
+    run_in_background ile çağrılmalıdır. Aynı kullanıcı SESSION_TTL içinde
+    aynı şifreyle yeniden doğrulanırsa bcrypt çalıştırılmadan mevcut oturum
+    döndürülür. Maliyeti veritabanında ayarlı maliyetten farklı olan şifre
+    başarılı girişte yeniden özetlenir.
+    """
+    with get_connection(path) as conn:
+        cursor = conn.cursor()
+        cost = load_bcrypt_cost(cursor)
+        cursor.execute("SELECT sifre, rol FROM kullanicilar WHERE kullanici_adi=?", (username,))
+        user = cursor.fetchone()
+    if not user or not user[0]:
+        return None
+
+    sifre_hash = _as_bytes(user[0])
+    ozet = _ozet(password)
+    oturum = _cached_session(username, ozet, sifre_hash)
+    if oturum is not None:
+        return oturum
+
+    if not bcrypt.checkpw(password.encode('utf-8'), sifre_hash):
+        return None
+
+    if needs_rehash(sifre_hash, cost):
+        try:
+            yeni_hash = hash_password(password, cost)
+            with get_connection(path) as conn:
+                # Bu arada şifre değiştirildiyse yeni şifrenin üzerine yazılmaz
+                conn.execute("UPDATE kullanicilar SET sifre=? WHERE kullanici_adi=? AND sifre=?",
+                             (yeni_hash, username, user[0]))
+            sifre_hash = yeni_hash
+        except Exception as e:
+            print(f"Şifre yeniden özetleme hatası: {str(e)}")
+
+    oturum = Oturum(username, user[1], ozet, sifre_hash)
+    with _lock:
+        eski = _son_oturum.get(username)
+        _oturumlar.pop(eski, None)
+        _oturumlar[oturum.token] = oturum
+        _son_oturum[username] = oturum.token
+    return oturum
+
+def _cached_session(username, ozet, sifre_hash):
+    with _lock:
+        oturum = _oturumlar.get(_son_oturum.get(username))
+    if oturum is None or not oturum.gecerli():
+        return None
+    # Şifre veritabanında değişmişse (ya da yeniden özetlendiyse) önbellek kullanılmaz
+    if not hmac.compare_digest(oturum._sifre_hash, sifre_hash):
+        return None
+    if not hmac.compare_digest(oturum._sifre_ozeti, ozet):
+        return None
+    return oturum
+
+def get_session(token):
+    """Geçerli oturumu döndürür; süresi dolmuşsa None"""
+    with _lock:
+        oturum = _oturumlar.get(token)
+        if oturum is not None and not oturum.gecerli():
+            del _oturumlar[token]
+            if _son_oturum.get(oturum.kullanici_adi) == token:
+                del _son_oturum[oturum.kullanici_adi]
+            return None
+    return oturum
+
+def end_session(token):
+    """Oturumu sonlandırır; sonraki girişte şifre bcrypt ile doğrulanır"""
+    with _lock:
+        oturum = _oturumlar.pop(token, None)
+        if oturum is not None and _son_oturum.get(oturum.kullanici_adi) == token:
+            del _son_oturum[oturum.kullanici_adi]
+
+def clear_sessions():
+    with _lock:
+        _oturumlar.clear()
+        _son_oturum.clear()
@@ -0,0 +1,9 @@
+"""Apartman Yönetim Sistemi performans ölçümleri
+
+Depo kökünden modül olarak çalıştırılır, örn.:
+    python -m benchmarks.bench_connection
+
+Sürümler arası takip için tüm takım ve veri üretici:
+    python -m benchmarks.suite orta --karsilastir onceki.json
+    python -m benchmarks.seed apartman_deneme.db buyuk
+"""
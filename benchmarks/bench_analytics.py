@@ -0,0 +1,101 @@
+"""Genel rapor: satır satır okuma ve sütunlu analiz görüntüsü
+
+Eski yol yılın gider, banka ve aidat satırlarını sqlite3.Row olarak okuyup
+Python'da aylara toplar. Görüntü bir kez yüklenir; sonraki raporlar yalnızca
+yeni satırları okur ve toplamları NumPy ile hesaplar.
+
+    python -m benchmarks.bench_analytics [odeme_sayisi] [hareket_sayisi] [gider_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import database
+import migrations
+from analytics import AnalizGoruntusu, get_snapshot
+from benchmarks.seed import seed_database, seed_banka_hareketleri, seed_giderler
+from query import where
+from records import ROW
+
+YIL = 2024
+
+def _satir_satir(yil):
+    # Eski yol: yılın satırları tek tek okunur, aylar Python'da toplanır
+    bas, son = f"{yil}-01-01", f"{yil}-12-31"
+    aylik = {ay: dict.fromkeys(("tahsil_edilen", "gider_banka", "gider_nakit", "banka_gelir", "banka_gider"), 0)
+             for ay in range(1, 13)}
+    for row in database.get_table_data("aidat_odemeleri", where(yil=yil), row_format=ROW):
+        if row["ay"] in database.AY_ISIMLERI:
+            aylik[database.AY_ISIMLERI.index(row["ay"]) + 1]["tahsil_edilen"] += row["tutar"] or 0
+    for row in database.get_giderler(bas, son, row_format=ROW):
+        key = "gider_banka" if row["odeme_sekli"] == "Banka" else "gider_nakit"
+        aylik[int(row["odeme_tarihi"][5:7])][key] += row["tutar"] or 0
+    for row in database.get_banka_hareketleri(None, bas, son, row_format=ROW):
+        key = "banka_gelir" if row["hareket_tipi"] == "Gelir" else "banka_gider"
+        aylik[int(row["tarih"][5:7])][key] += row["tutar"] or 0
+    return aylik
+
+def _goruntu_ile(yil):
+    goruntu = get_snapshot()
+    return goruntu.aylik(yil), goruntu.gider_kategorileri(yil), goruntu.yil_karsilastirma(yil)
+
+def _olc(fn, *args, tekrar=5):
+    sureler = []
+    for _ in range(tekrar):
+        start = time.perf_counter()
+        fn(*args)
+        sureler.append(time.perf_counter() - start)
+    return min(sureler) * 1000
+
+def main(odeme_sayisi=500000, hareket_sayisi=500000, gider_sayisi=50000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed_database(path, 1000, odeme_sayisi)
+        seed_banka_hareketleri(hareket_sayisi)
+        seed_giderler(gider_sayisi)
+        migrations.migrate(path, backup=False)
+
+        eski = _olc(_satir_satir, YIL)
+        start = time.perf_counter()
+        goruntu = AnalizGoruntusu()
+        satir = goruntu.refresh()
+        yukleme = (time.perf_counter() - start) * 1000
+        get_snapshot()  # süreç görüntüsü bir kez yüklenir
+        yeni = _olc(_goruntu_ile, YIL)
+
+        # Yeni satırlar eklenince yalnızca onlar okunur
+        with connection.get_connection() as conn:
+            conn.executemany("INSERT INTO giderler (odeme_tarihi, tutar, aciklama, odeme_sekli) "
+                             "VALUES (?, ?, ?, 'Nakit')",
+                             [(f"{YIL}-06-{i % 28 + 1:02d}", 100 + i, f"Temizlik 06/{YIL}") for i in range(100)])
+        start = time.perf_counter()
+        artimli = get_snapshot()
+        artimli_sure = (time.perf_counter() - start) * 1000
+        artimli_satir = artimli.yenilenen_satir
+
+        # Güncelleme yalnızca o tabloyu baştan yükletir
+        with connection.get_connection() as conn:
+            conn.execute("UPDATE giderler SET tutar = tutar + 1 WHERE id = 1")
+        start = time.perf_counter()
+        guncel = get_snapshot()
+        guncel_sure = (time.perf_counter() - start) * 1000
+        guncel_satir = guncel.yenilenen_satir
+
+        # Sonuçlar aylık özet tablosuyla aynı mı
+        aylik = guncel.aylik(YIL)
+        ayni = all(row[olcu] == aylik[olcu][row["ay_no"] - 1]
+                   for row in database.get_aylik_ozet(YIL) for olcu in aylik)
+        connection.close_connections()
+
+    print(f"{odeme_sayisi} ödeme, {hareket_sayisi} banka hareketi, {gider_sayisi} gider; {YIL} raporu")
+    print(f"Satır satır (sqlite3.Row)      : {eski:8.1f} ms")
+    print(f"Görüntü ilk yükleme            : {yukleme:8.1f} ms ({satir} satır, {goruntu.nbytes() / 1e6:.1f} MB)")
+    print(f"Görüntüden rapor (aylık+kat.+yıl): {yeni:6.1f} ms")
+    print(f"100 yeni satır sonrası yenileme : {artimli_sure:7.1f} ms ({artimli_satir} satır okundu)")
+    print(f"Güncelleme sonrası yenileme     : {guncel_sure:7.1f} ms ({guncel_satir} satır okundu)")
+    print(f"Aylık özetle aynı: {'evet' if ayni else 'HAYIR'}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
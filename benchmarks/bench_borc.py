@@ -0,0 +1,61 @@
+"""Daire x ay borç matrisi: satır satır Python hesabı ve NumPy motoru
+
+    python -m benchmarks.bench_borc [daire_sayisi] [yil_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+import borc
+import connection
+from benchmarks.seed import seed_database
+
+def _satir_satir(start_year, end_year, as_of, gecikme_orani):
+    # Karşılaştırma: her daire ve ay için sözlüklerle aynı hesap
+    with connection.get_connection() as conn:
+        uyeler = [row[0] for row in conn.execute("SELECT id FROM uyeler")]
+        tarifeler = {(row[0], row[1]): row[2] for row in conn.execute(
+            "SELECT yil, ay_no, tutar FROM aidat_tarifeleri WHERE yil BETWEEN ? AND ?",
+            (start_year, end_year))}
+        odenen = {}
+        for uye_id, yil, ay, tutar in conn.execute(
+                "SELECT uye_id, yil, ay, tutar FROM aidat_odemeleri WHERE yil BETWEEN ? AND ?",
+                (start_year, end_year)):
+            key = (uye_id, yil, borc._ay_no(ay))
+            odenen[key] = odenen.get(key, 0) + tutar
+    anapara = gecikme = 0
+    for uye_id in uyeler:
+        for (yil, ay_no), tarife in tarifeler.items():
+            if date(yil, ay_no, 1) > as_of:
+                continue
+            kalan = max(tarife - odenen.get((uye_id, yil, ay_no), 0), 0)
+            anapara += kalan
+            gecikme += round(kalan * gecikme_orani * ((as_of.year - yil) * 12 + as_of.month - ay_no))
+    return anapara, gecikme
+
+def main(daire_sayisi=5000, yil_sayisi=30):
+    son_yil = 2024
+    ilk_yil = son_yil - yil_sayisi + 1
+    as_of = date(son_yil, 12, 31)
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, daire_sayisi * yil_sayisi * 10,
+                      ilk_yil=ilk_yil, son_yil=son_yil)
+
+        start = time.perf_counter()
+        python_toplam = _satir_satir(ilk_yil, son_yil, as_of, 0.05)
+        python_sure = time.perf_counter() - start
+
+        borc.compute_borclar(ilk_yil, son_yil, as_of=as_of, gecikme_orani=0.05)  # ısınma
+        sonuc = borc.compute_borclar(ilk_yil, son_yil, as_of=as_of, gecikme_orani=0.05)
+        numpy_toplam = sonuc.genel_toplam()[:2]
+        connection.close_connections()
+
+    print(f"{daire_sayisi} daire x {yil_sayisi * 12} ay, {daire_sayisi * yil_sayisi * 10} ödeme")
+    print(f"Satır satır Python : {python_sure * 1000:9.0f} ms")
+    print(f"NumPy motoru       : {sonuc.sure * 1000:9.0f} ms")
+    print(f"Toplamlar aynı     : {'evet' if tuple(python_toplam) == numpy_toplam else 'HAYIR'}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,52 @@
+"""Sorgu önbelleği: bir formun tekrar tekrar açılması
+
+Her "form açılışı" formların kullandığı dört erişimciyi çağırır. Arada
+belirli aralıklarla bir aidat ödemesi eklenir; bu yazma, erişimcilerin
+okuduğu tablolara dokunmadığı için önbelleği geçersiz kılmamalıdır.
+
+    python -m benchmarks.bench_cache [acilis_sayisi] [daire_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import database
+from cache import query_cache
+from benchmarks.seed import seed_database
+
+_ERISIMCILER = (database.get_all_uyeler, database.get_all_banka_hesaplari,
+                database.get_apartman_bilgileri, lambda: database.get_aidat_for_year(2024))
+
+def _ac(acilis_sayisi, onbellekli):
+    start = time.perf_counter()
+    for i in range(acilis_sayisi):
+        for erisimci in _ERISIMCILER:
+            erisimci() if onbellekli else getattr(erisimci, "uncached", erisimci)()
+        if i % 10 == 0:
+            with connection.get_connection() as conn:
+                conn.execute("INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar) "
+                             "VALUES (1, 2024, 'ocak', '2024-01-05', 100)")
+    return time.perf_counter() - start
+
+def main(acilis_sayisi=200, daire_sayisi=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, 10000)
+        with connection.get_connection() as conn:
+            conn.execute("INSERT INTO banka_hesaplari (banka_adi) VALUES ('Deneme Bankası')")
+
+        onbelleksiz = _ac(acilis_sayisi, False)
+        query_cache.clear()
+        query_cache.reset_stats()
+        onbellekli = _ac(acilis_sayisi, True)
+        stats = query_cache.stats()
+        connection.close_connections()
+
+    print(f"Önbelleksiz ({acilis_sayisi} açılış) : {onbelleksiz / acilis_sayisi * 1000:8.2f} ms/açılış")
+    print(f"Önbellekli                 : {onbellekli / acilis_sayisi * 1000:8.2f} ms/açılış")
+    print(f"İsabet {stats['hits']}, ıskalama {stats['misses']}, "
+          f"geçersiz kılma {stats['invalidations']}, {stats['rows']} satır saklanıyor")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
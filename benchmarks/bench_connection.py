@@ -0,0 +1,45 @@
+"""Sorgu başına bağlantı maliyeti: her çağrıda yeni bağlantı ve havuzlanmış bağlantı"""
+import os
+import sqlite3
+import tempfile
+import time
+
+import connection
+import database
+
+def _per_call_query(path):
+    # Eski davranış: her sorguda bağlan, şemayı ayrıştır, kapat
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return conn.execute("SELECT * FROM uyeler ORDER BY daire_no").fetchall()
+    finally:
+        conn.close()
+
+def _measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main(repeat=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        connection.set_db_path(path)
+        database.create_tables()
+        with connection.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (?, ?)",
+                [(i, f"Üye {i}") for i in range(1, 41)]
+            )
+
+        eski = _measure(lambda: _per_call_query(path), repeat)
+        yeni = _measure(database.get_all_uyeler, repeat)
+        connection.close_connections()
+
+    print(f"Her çağrıda yeni bağlantı : {eski:8.1f} µs/sorgu")
+    print(f"Havuzlanmış bağlantı      : {yeni:8.1f} µs/sorgu")
+    print(f"Hızlanma                  : {eski / yeni:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Ana sayfa özeti: dört ayrı sorgu ve tek toplama sorgusu
+
+Varsayılan ölçek 10.000 daire ve 1.000.000 ödemedir:
+    python -m benchmarks.bench_dashboard [daire_sayisi] [odeme_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import database
+from benchmarks.seed import seed_database
+
+def _eski_ozet(year, month):
+    # Önceki show_apartment_summary sorguları
+    with connection.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT adi, yonetici FROM apartman WHERE id=1")
+        cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM uyeler")
+        uye_sayisi = cursor.fetchone()[0]
+        cursor.execute("SELECT tutar FROM aidat_tarifeleri WHERE yil=? AND ay_no=?", (year, month))
+        row = cursor.fetchone()
+        aidat_tutari = row[0] if row else 0
+        cursor.execute("SELECT SUM(tutar) FROM aidat_odemeleri WHERE yil=? AND ay=?",
+                       (year, database.AY_ISIMLERI[month - 1]))
+        odenen = cursor.fetchone()[0] or 0
+        return aidat_tutari * uye_sayisi - odenen
+
+def _measure(fn, repeat):
+    fn()  # ısınma
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main(daire_sayisi=10000, odeme_sayisi=1000000, repeat=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, odeme_sayisi)
+        print(f"Veri üretimi: {time.perf_counter() - start:.1f} sn "
+              f"({daire_sayisi} daire, {odeme_sayisi} ödeme)")
+
+        eski = _measure(lambda: _eski_ozet(2024, 6), repeat)
+        yeni = _measure(lambda: database.get_dashboard_ozeti(2024, 6), repeat)
+        ozet = database.get_dashboard_ozeti(2024, 6)
+        connection.close_connections()
+
+    print(f"Dört sorgu (yaklaşık borç)   : {eski:8.2f} ms")
+    print(f"Tek sorgu (daire bazında borç): {yeni:8.2f} ms")
+    print(f"Borç: {ozet['toplam_borc']} TL, borçlu daire: {ozet['borclu_daire_sayisi']}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
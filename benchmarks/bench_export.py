@@ -0,0 +1,40 @@
+"""Akış halinde dışa aktarma: bellek tepe değeri ve hız
+
+    python -m benchmarks.bench_export [hareket_sayisi]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import connection
+import database
+from benchmarks.seed import seed_banka_hareketleri
+from export import available_formats, export_table
+
+SUFFIXES = {"csv": ".csv", "csv.gz": ".csv.gz", "xlsx": ".xlsx"}
+
+def main(hareket_sayisi=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.set_db_path(os.path.join(tmp, "bench.db"))
+        database.create_tables()
+        database.create_indexes()
+        seed_banka_hareketleri(hareket_sayisi)
+
+        for fmt in available_formats():
+            path = os.path.join(tmp, "banka_hareketleri" + SUFFIXES[fmt])
+            rows, seconds = export_table("banka_hareketleri", path, fmt)
+
+            # Bellek ölçümü ayrı çalıştırmada (tracemalloc hızı düşürür)
+            tracemalloc.start()
+            export_table("banka_hareketleri", path, fmt)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"{fmt:7s}: {rows} satır, {seconds:6.2f} sn, {rows / seconds:10,.0f} satır/sn, "
+                  f"tepe bellek {peak / 1024 / 1024:6.2f} MB, dosya {size:7.1f} MB")
+        connection.close_connections()
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
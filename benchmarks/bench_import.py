@@ -0,0 +1,75 @@
+"""Banka ekstresi içe aktarma: satır satır ekleme ve toplu içe aktarıcı
+
+Ekstreler bankalardan genellikle yeniden eskiye sıralı gelir; bu en kötü
+durumdur, çünkü her satır sonraki tüm günlerin bakiyesini günceller.
+
+    python -m benchmarks.bench_import [satir_sayisi] [mevcut_hareket]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import connection
+import database
+import importer
+from benchmarks.seed import seed_database, seed_banka_hareketleri
+
+def _write_ekstre(path, satir_sayisi, seed=7):
+    rng = random.Random(seed)
+    son = date(2024, 12, 31)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Hesap Hareketleri"])
+        writer.writerow(["İşlem Tarihi", "Açıklama", "Tutar", "Bakiye"])
+        for i in range(satir_sayisi):
+            gun = son - timedelta(days=i * 3650 // satir_sayisi)
+            tutar = rng.randint(-500000, 500000) / 100 or 1
+            writer.writerow([gun.strftime("%d.%m.%Y"), f"Ekstre işlemi {i}",
+                             f"{tutar:.2f}".replace(".", ","), ""])
+
+def _satir_satir(path, hesap_id):
+    # Karşılaştırma: her satır tetikleyicilerle tek tek eklenir
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as f, connection.get_connection() as conn:
+        reader = csv.reader(f, delimiter=";")
+        next(reader)
+        next(reader)
+        for tarih, aciklama, tutar, _ in reader:
+            tutar = importer.parse_tutar(tutar)
+            conn.execute(
+                "INSERT INTO banka_hareketleri (hesap_id, tarih, tutar, hareket_tipi, aciklama) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (hesap_id, importer.parse_tarih(tarih), abs(tutar),
+                 "Gelir" if tutar >= 0 else "Gider", aciklama)
+            )
+    return time.perf_counter() - start
+
+def main(satir_sayisi=100000, mevcut_hareket=200000):
+    with tempfile.TemporaryDirectory() as tmp:
+        ekstre = os.path.join(tmp, "ekstre.csv")
+        _write_ekstre(ekstre, satir_sayisi)
+
+        seed_database(os.path.join(tmp, "bench.db"), 100, 1000)
+        seed_banka_hareketleri(mevcut_hareket)
+
+        # Satır satır yol çok yavaş olduğundan dosyanın yalnızca bir kısmıyla ölçülür
+        ornek_sayisi = min(satir_sayisi, 5000)
+        ornek = os.path.join(tmp, "ornek.csv")
+        _write_ekstre(ornek, ornek_sayisi)
+        tek_tek = _satir_satir(ornek, 1)
+
+        report = importer.import_banka_ekstresi(ekstre, 2)
+        tutarli = not database.check_bakiye_defteri() and not database.check_aylik_ozet()
+        connection.close_connections()
+
+    print(f"Satır satır ekleme ({ornek_sayisi} satır) : {ornek_sayisi / tek_tek:10,.0f} satır/sn")
+    print(f"İçe aktarıcı ({report.okunan} satır)      : {report.okunan / report.sure:10,.0f} satır/sn "
+          f"({report.sure:.1f} sn, {report.eklenen} eklendi, {len(report.reddedilen)} reddedildi)")
+    print(f"Bakiye defteri ve aylık özet tutarlı : {'evet' if tutarli else 'HAYIR'}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,82 @@
+"""Bir yıllık banka gelirlerinin aidat borçlarıyla eşleştirilmesi
+
+    python -m benchmarks.bench_mutabakat [daire_sayisi]
+"""
+import os
+import random
+import sys
+import tempfile
+
+import connection
+import database
+import mutabakat
+from benchmarks.seed import seed_database
+
+ADLAR = ("Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Zeynep", "Emine", "Ali", "Hüseyin", "Elif",
+         "Hasan", "İbrahim", "Murat", "Özge", "Çağlar", "Gülşen", "Serkan", "Derya", "Burak", "Şule")
+SOYADLAR = ("Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Özdemir",
+            "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek",
+            "Polat", "Korkmaz", "Erdoğan", "Güneş", "Aksoy", "Tekin", "Karaca", "Uçar", "Bulut")
+
+def _seed_gelirler(daire_sayisi, yil, seed=11):
+    """Her dairenin her ay için (kimi eksik, kimi birleşik) ödemesini banka geliri olarak ekler"""
+    rng = random.Random(seed)
+    with connection.get_connection() as conn:
+        conn.execute("INSERT INTO banka_hesaplari (banka_adi, hesap_no) VALUES ('Banka', '1')")
+        isimler = {}
+        for no in range(1, daire_sayisi + 1):
+            ad, ikinci_ad = rng.sample(ADLAR, 2)
+            isim = f"{ad} {ikinci_ad} {rng.choice(SOYADLAR)}"
+            isimler[no] = isim
+        conn.executemany("UPDATE uyeler SET adi_soyadi = ? WHERE daire_no = ?",
+                         ((isim, no) for no, isim in isimler.items()))
+        tarife = conn.execute("SELECT tutar FROM aidat_tarifeleri WHERE yil = ? AND ay_no = 1",
+                              (yil,)).fetchone()[0]
+        # Önceki yıl ödemelerinin çoğu yapılmış, birkaç dairenin birikmiş borcu var
+        onceki = conn.execute("SELECT tutar FROM aidat_tarifeleri WHERE yil = ? AND ay_no = 1",
+                              (yil - 1,)).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar) VALUES (?, ?, ?, ?, ?)",
+            ((no, yil - 1, database.AY_ISIMLERI[ay - 1], f"{yil - 1}-{ay:02d}-05", onceki)
+             for ay in range(1, 13) for no in range(1, daire_sayisi + 1) if rng.random() < 0.95)
+        )
+
+    def gelirler():
+        for ay in range(1, 13):
+            for no in range(1, daire_sayisi + 1):
+                r = rng.random()
+                if r < 0.1:
+                    continue
+                gun = f"{yil}-{ay:02d}-{rng.randint(1, 28):02d}"
+                if r < 0.5:
+                    aciklama = f"EFT {isimler[no].upper()} D:{no} {database.AY_ISIMLERI[ay - 1].upper()} AIDAT"
+                elif r < 0.8:
+                    aciklama = f"HAVALE {isimler[no]}"
+                elif r < 0.95:
+                    aciklama = f"{no} nolu daire aidat"
+                else:
+                    aciklama = "FAST ODEME"
+                yield (1, gun, tarife, "Gelir", aciklama)
+
+    with database.bulk_write() as conn:
+        conn.executemany(
+            "INSERT INTO banka_hareketleri (hesap_id, tarih, tutar, hareket_tipi, aciklama) "
+            "VALUES (?, ?, ?, ?, ?)",
+            gelirler()
+        )
+
+def main(daire_sayisi=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, 0)
+        _seed_gelirler(daire_sayisi, 2024)
+        sonuc = mutabakat.reconcile("2024-01-01", "2024-12-31")
+        connection.close_connections()
+
+    toplam = len(sonuc.eslesen) + len(sonuc.belirsiz) + len(sonuc.eslesmeyen)
+    print(f"{toplam} banka geliri, {daire_sayisi} daire: {sonuc.sure * 1000:.0f} ms")
+    print(f"  eşleşen    : {len(sonuc.eslesen)}")
+    print(f"  belirsiz   : {len(sonuc.belirsiz)}")
+    print(f"  eşleşmeyen : {len(sonuc.eslesmeyen)}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,61 @@
+"""Toplu aidat ekstresi PDF'i: bağlam, sayfa üretimi ve diske yazma
+
+Tüm dairelerin ay ekstresi tek PDF'e yazılır. Şablonun ayrıştırılmış hali
+ile her sayfada yeniden ayrıştırma, tek süreç ile süreç havuzu karşılaştırılır.
+
+    python -m benchmarks.bench_pdf [daire_sayisi] [odeme_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import pdf
+from benchmarks.seed import seed_database
+
+YIL, AY = 2024, 6
+
+def _olc(fn, *args, tekrar=3):
+    sureler = []
+    for _ in range(tekrar):
+        start = time.perf_counter()
+        fn(*args)
+        sureler.append(time.perf_counter() - start)
+    return min(sureler) * 1000
+
+def _her_sayfada_ayristir(baglamlar):
+    # Önbelleksiz yol: şablon her sayfa için yeniden ayrıştırılır
+    for baglam in baglamlar:
+        pdf.render_page(pdf.parse_template(pdf.SABLONLAR["aidat_ekstresi"]), baglam)
+
+def _onbellekli(baglamlar):
+    sablon = pdf.load_template("aidat_ekstresi")
+    for baglam in baglamlar:
+        pdf.render_page(sablon, baglam)
+
+def main(daire_sayisi=500, odeme_sayisi=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, odeme_sayisi)
+        path = os.path.join(tmp, "ekstre.pdf")
+
+        baglam = _olc(pdf.statement_contexts, YIL, AY)
+        baglamlar = pdf.statement_contexts(YIL, AY)
+        ayristirarak = _olc(_her_sayfada_ayristir, baglamlar)
+        onbellekli = _olc(_onbellekli, baglamlar)
+        tek = _olc(pdf.write_statements, path, YIL, AY, 0.0, None, None, False)
+        pdf.write_statements(path, YIL, AY)  # süreç havuzunun açılışı ölçüme girmesin
+        havuz = _olc(pdf.write_statements, path, YIL, AY)
+        boyut = os.path.getsize(path)
+        pdf.shutdown_render_pool()
+        connection.close_connections()
+
+    print(f"{daire_sayisi} daire, {AY:02d}/{YIL} ekstresi ({os.cpu_count()} çekirdek)")
+    print(f"Bağlamlar (borç hesabı dahil)       : {baglam:8.1f} ms")
+    print(f"Sayfalar, her sayfada ayrıştırma    : {ayristirarak:8.1f} ms")
+    print(f"Sayfalar, önbellekli şablon         : {onbellekli:8.1f} ms")
+    print(f"PDF dosyası, tek süreç              : {tek:8.1f} ms")
+    print(f"PDF dosyası, süreç havuzu           : {havuz:8.1f} ms ({boyut / 1e3:.0f} KB)")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,60 @@
+"""Metin birleştirilmiş koşullar ve derlenmiş sorgular (query.where)
+
+Eski get_table_data koşulu SQL metnine gömüyordu; her değer yeni bir metin
+olduğundan sqlite3'ün deyim önbelleği hiç isabet etmez ve her çağrı sorguyu
+yeniden hazırlar. where() ile metin sabit kalır, yalnızca parametre değişir.
+
+    python -m benchmarks.bench_query [cagri_sayisi] [hareket_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+from benchmarks.seed import seed_database, seed_banka_hareketleri
+from database import get_table_data
+from query import where
+
+def _eski(conn, hesap_id, tarih):
+    # Eski yol: değerler SQL metninde
+    return conn.execute(f"SELECT * FROM banka_hareketleri WHERE hesap_id={hesap_id} "
+                        f"AND tarih>='{tarih}' ORDER BY tarih DESC LIMIT 20").fetchall()
+
+def _yeni(hesap_id, tarih):
+    return get_table_data("banka_hareketleri", where(hesap_id=hesap_id, tarih__gte=tarih),
+                          order_by="-tarih", limit=20)
+
+def _olc(fn, cagri_sayisi):
+    start = time.perf_counter()
+    for i in range(cagri_sayisi):
+        fn(i % 3 + 1, f"20{15 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+    return (time.perf_counter() - start) / cagri_sayisi * 1e6
+
+def main(cagri_sayisi=20000, hareket_sayisi=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), 200, 1000)
+        seed_banka_hareketleri(hareket_sayisi)
+
+        with connection.get_connection() as conn:
+            # Isınma: deyim önbelleği ve sayfa önbelleği dolsun
+            _olc(lambda h, t: _eski(conn, h, t), 200)
+            _olc(_yeni, 200)
+            eski = _olc(lambda h, t: _eski(conn, h, t), cagri_sayisi)
+            yeni = _olc(_yeni, cagri_sayisi)
+            # Hazırlama maliyeti: sonucu boş dönen aynı sorgu, metin ve parametre ile
+            bos_eski = _olc(lambda h, t: conn.execute(
+                f"SELECT * FROM banka_hareketleri WHERE hesap_id={-h} AND tarih>='{t}'").fetchall(), cagri_sayisi)
+            bos_yeni = _olc(lambda h, t: conn.execute(
+                "SELECT * FROM banka_hareketleri WHERE hesap_id = ? AND tarih >= ?", (-h, t)).fetchall(), cagri_sayisi)
+        connection.close_connections()
+
+    print(f"{cagri_sayisi} çağrı, {hareket_sayisi} banka hareketi")
+    print(f"Metin koşul (her çağrıda hazırlama) : {eski:8.1f} µs/çağrı")
+    print(f"get_table_data + where              : {yeni:8.1f} µs/çağrı")
+    print(f"Boş sonuç, metin koşul              : {bos_eski:8.1f} µs/çağrı")
+    print(f"Boş sonuç, bağlı parametre          : {bos_yeni:8.1f} µs/çağrı")
+    print(f"Hazırlama maliyeti                  : {bos_eski - bos_yeni:8.1f} µs/çağrı")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,46 @@
+"""Çok yıllık rapor toplamları: ham tablolar ve aylık özet tablosu
+
+    python -m benchmarks.bench_rollup [daire_sayisi] [odeme_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import database
+from benchmarks.seed import seed_database, seed_banka_hareketleri
+
+def _ham_toplamlar(start_year, end_year):
+    # Özet tablosu olmadan aynı yıllık toplamlar
+    with connection.get_connection() as conn:
+        aidat = conn.execute(
+            "SELECT yil, SUM(tutar) FROM aidat_odemeleri WHERE yil BETWEEN ? AND ? GROUP BY yil",
+            (start_year, end_year)).fetchall()
+        banka = conn.execute(
+            "SELECT substr(tarih, 1, 4), hareket_tipi, SUM(tutar) FROM banka_hareketleri "
+            "WHERE tarih BETWEEN ? AND ? GROUP BY 1, 2",
+            (f"{start_year}-01-01", f"{end_year}-12-31")).fetchall()
+        return aidat, banka
+
+def _measure(fn, repeat=5):
+    fn()  # ısınma
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main(daire_sayisi=10000, odeme_sayisi=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), daire_sayisi, odeme_sayisi)
+        seed_banka_hareketleri(odeme_sayisi)
+
+        ham = _measure(lambda: _ham_toplamlar(2015, 2024))
+        ozet = _measure(lambda: database.get_yillik_ozet(2015, 2024))
+        connection.close_connections()
+
+    print(f"Ham tablolardan 10 yıllık toplam : {ham:9.2f} ms")
+    print(f"Aylık özet tablosundan          : {ozet:9.2f} ms")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,55 @@
+"""Büyük sonuç kümelerinde satır biçimleri: bellek ve süre
+
+Aynı sorgu (tüm banka hareketleri) sqlite3.Row, düz demet, tabloya özel
+kayıt sınıfı ve sütun sütun okunur; tracemalloc ile sonucun bellekte
+kapladığı yer ölçülür.
+
+    python -m benchmarks.bench_rows [hareket_sayisi]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import connection
+from benchmarks.seed import seed_database, seed_banka_hareketleri
+from database import get_table_data
+from records import ROW, ROW_FORMATS
+
+def _bellek(bicim):
+    gc.collect()
+    tracemalloc.start()
+    rows = get_table_data("banka_hareketleri", row_format=bicim)
+    kalan, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows), kalan, tepe
+
+def _sure(bicim, tekrar=3):
+    sureler = []
+    for _ in range(tekrar):
+        start = time.perf_counter()
+        rows = get_table_data("banka_hareketleri", row_format=bicim)
+        sureler.append(time.perf_counter() - start)
+        del rows
+    return min(sureler) * 1000
+
+def main(hareket_sayisi=500000):
+    sonuclar = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), 100, 1000)
+        seed_banka_hareketleri(hareket_sayisi)
+        get_table_data("banka_hareketleri", limit=1)  # ısınma
+        for bicim in ROW_FORMATS:
+            sonuclar[bicim] = _bellek(bicim) + (_sure(bicim),)
+        connection.close_connections()
+
+    print(f"{hareket_sayisi} banka hareketi, get_table_data(row_format=...)")
+    temel = sonuclar[ROW][1]
+    for bicim, (satir, kalan, tepe, sure) in sonuclar.items():
+        print(f"{bicim:8s}: {kalan / 1e6:7.1f} MB ({kalan / satir:5.0f} B/satır, "
+              f"%{100 * (1 - kalan / temel):3.0f} tasarruf), tepe {tepe / 1e6:7.1f} MB, {sure:7.1f} ms")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
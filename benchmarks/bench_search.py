@@ -0,0 +1,61 @@
+"""Genel arama: LIKE '%...%' taraması ve FTS5 arama dizini
+
+Dizin, var olan bir veritabanında olduğu gibi geçiş adımıyla (parça parça)
+kurulur; kurulum süresi de raporlanır.
+
+    python -m benchmarks.bench_search [hareket_sayisi] [odeme_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import migrations
+from benchmarks.seed import seed_database, seed_banka_hareketleri, seed_giderler
+from search import search
+from utils import fold_tr
+
+ARAMALAR = ("Sakin 4217", "açıklaması 31337", "elektrik 03/2019", "asansör bakımı", "GİDER 9999")
+
+def _like_arama(text, limit=50):
+    # Eski yol: her tabloda her kelime için LIKE, sonuçlar en yeniden
+    kosullar = " AND ".join("lower({col}) LIKE ?" for _ in text.split())
+    params = [f"%{kelime.lower()}%" for kelime in text.split()]
+    sonuc = []
+    with connection.get_connection() as conn:
+        for table, col in (("uyeler", "adi_soyadi"), ("giderler", "aciklama"),
+                           ("banka_hareketleri", "aciklama"), ("aidat_odemeleri", "aciklama")):
+            sonuc += conn.execute(f"SELECT id FROM {table} WHERE {kosullar.format(col=col)} "
+                                  f"ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+    return sonuc
+
+def _measure(fn, repeat=5):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main(hareket_sayisi=2000000, odeme_sayisi=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, "bench.db"), 5000, odeme_sayisi)
+        seed_banka_hareketleri(hareket_sayisi)
+        seed_giderler(hareket_sayisi // 10)
+        connection.close_connections()
+
+        start = time.perf_counter()
+        rapor = migrations.migrate(backup=False)
+        print(f"Dizin kurulumu: {time.perf_counter() - start:.1f} sn "
+              f"({sum(adim[2] for adim in rapor.adimlar):,} satır)")
+
+        print(f"{'Arama':<22} {'LIKE':>10} {'FTS5':>10}  sonuç")
+        for text in ARAMALAR:
+            like = _measure(lambda: _like_arama(text), repeat=1)
+            fts = _measure(lambda: search(text))
+            print(f"{text:<22} {like:8.1f}ms {fts:8.2f}ms  {len(search(text))} "
+                  f"(LIKE {len(_like_arama(text))}, katlanmış '{fold_tr(text)}')")
+        connection.close_connections()
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,64 @@
+"""Açılıştan giriş ekranına kadar geçen süre
+
+Her ölçüm temiz modül önbelleğiyle ayrı bir Python sürecinde yapılır.
+"Eski düzen", reports / bcrypt modüllerinin açılışta yüklendiği ve tablo
+oluşturma deyimlerinin her açılışta çalıştığı durumu taklit eder. DISPLAY
+yoksa Tk penceresi kurulamaz; bu durumda giriş formu hariç ölçülür.
+
+    python -m benchmarks.bench_startup [tekrar]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_COCUK = r'''
+import json, os, sys, time
+t0 = time.perf_counter()
+import connection
+connection.set_db_path(sys.argv[1])
+eski_duzen = sys.argv[2] == "1"
+if eski_duzen:
+    import bcrypt, reports, database
+    database.create_tables()
+    database.create_user_table()
+    database.create_indexes()
+import apartman_yonetim
+if os.environ.get("DISPLAY"):
+    root = apartman_yonetim.tk.Tk()
+    apartman_yonetim.ApartmanYonetimSistemi(root)
+    root.update()
+else:
+    apartman_yonetim.init_database()
+sure = time.perf_counter() - t0
+print(json.dumps({"sure": sure, "moduller": len(sys.modules),
+                  "bcrypt": "bcrypt" in sys.modules, "numpy": "numpy" in sys.modules}))
+'''
+
+def _olc(db_path, eski_duzen):
+    kok = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cikti = subprocess.run([sys.executable, "-c", _COCUK, db_path, "1" if eski_duzen else "0"],
+                           cwd=kok, capture_output=True, text=True, check=True).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+def main(tekrar=7):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        # İlk açılış şemayı ve yönetici hesabını oluşturur; ölçüme dahil edilmez
+        ilk = _olc(db_path, False)
+        print(f"İlk açılış (şema oluşturma)   : {ilk['sure'] * 1000:8.1f} ms")
+
+        for ad, eski_duzen in (("Eski düzen", True), ("Tembel yükleme", False)):
+            olcumler = [_olc(db_path, eski_duzen) for _ in range(tekrar)]
+            sure = statistics.median(o["sure"] for o in olcumler)
+            son = olcumler[-1]
+            print(f"{ad:<30}: {sure * 1000:8.1f} ms  ({son['moduller']} modül, "
+                  f"bcrypt {'yüklü' if son['bcrypt'] else 'yok'}, "
+                  f"numpy {'yüklü' if son['numpy'] else 'yok'})")
+    if not os.environ.get("DISPLAY"):
+        print("DISPLAY yok: giriş penceresi kurulmadan ölçüldü")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
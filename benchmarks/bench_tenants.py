@@ -0,0 +1,52 @@
+"""Konsolide bina raporu: tek süreç ve süreç havuzu
+
+Her bina kendi dosyasına sahiptir; raporda her binanın yıllık toplamları,
+banka bakiyesi ve borç motoru ayrı süreçte hesaplanır. Hızlanma çekirdek
+sayısıyla sınırlıdır; tek çekirdekli makinede iki süre aynı çıkar.
+
+    python -m benchmarks.bench_tenants [bina_sayisi] [daire_sayisi] [odeme_sayisi]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import connection
+import tenants
+from benchmarks.seed import seed_database, seed_banka_hareketleri
+
+def main(bina_sayisi=8, daire_sayisi=1000, odeme_sayisi=200000):
+    with tempfile.TemporaryDirectory() as tmp:
+        tenants.REGISTRY_PATH = os.path.join(tmp, "binalar.db")
+        for i in range(1, bina_sayisi + 1):
+            db_path = os.path.join(tmp, f"bina{i}.db")
+            seed_database(db_path, daire_sayisi, odeme_sayisi, seed=i)
+            seed_banka_hareketleri(20000, seed=i)
+            tenants.add_tenant(f"B{i:02d}", f"Bina {i}", db_path)
+        connection.close_connections()
+
+        # Karşılaştırma: binalar bu süreçte sırayla (süreç başlatma maliyeti olmadan)
+        start = time.perf_counter()
+        sirali_toplam = dict.fromkeys(("borc", "tahsil_edilen"), 0)
+        for bina in tenants.list_tenants():
+            ozet = tenants._bina_ozeti(bina.kod, bina.adi, bina.db_path, 2015, 2024, None)
+            for key in sirali_toplam:
+                sirali_toplam[key] += ozet[key]
+        sirali = time.perf_counter() - start
+
+        # İlk çağrı süreçleri başlatır; ölçüm ısınmış havuzla yapılır
+        tenants.consolidated_report(2015, 2024)
+        start = time.perf_counter()
+        _, paralel_toplam = tenants.consolidated_report(2015, 2024)
+        paralel = time.perf_counter() - start
+        tenants.shutdown_pool()
+
+    print(f"{bina_sayisi} bina x {daire_sayisi} daire, {os.cpu_count()} çekirdek")
+    print(f"Tek süreç     : {sirali * 1000:8.0f} ms")
+    print(f"Süreç havuzu  : {paralel * 1000:8.0f} ms")
+    ayni = all(sirali_toplam[key] == paralel_toplam[key] for key in sirali_toplam)
+    print(f"Toplamlar aynı: {'evet' if ayni else 'HAYIR'} "
+          f"(borç {sirali_toplam['borc']:,}, tahsil {sirali_toplam['tahsil_edilen']:,})")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,176 @@
+"""Ölçümler için sentetik veritabanı üretici
+
+    python -m benchmarks.seed apartman_deneme.db orta
+"""
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+import connection
+import database
+import migrations
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def seed_database(path, daire_sayisi=10000, odeme_sayisi=1000000,
+                  ilk_yil=2015, son_yil=2024, seed=42, batch_size=50000):
+    """path üzerinde şemayı kurar ve rastgele ama tekrarlanabilir veri ekler"""
+    rng = random.Random(seed)
+    connection.set_db_path(path)
+    database.create_tables()
+    database.create_user_table()
+    database.create_indexes()
+
+    with connection.get_connection() as conn:
+        # Temel şema; sonraki adımlar (arama dizini vb.) generate() içinde migrate ile
+        conn.execute(f"PRAGMA user_version = {migrations.BASE_VERSION}")
+        conn.execute("INSERT OR REPLACE INTO apartman (id, adi, yonetici) VALUES (1, 'Deneme Sitesi', 'Yönetici')")
+        conn.executemany(
+            "INSERT INTO uyeler (daire_no, adi_soyadi, telefon) VALUES (?, ?, ?)",
+            ((no, f"Sakin {no}", f"05{no:09d}") for no in range(1, daire_sayisi + 1))
+        )
+        conn.executemany(
+            "INSERT INTO aidat_tarifeleri (yil, ay_no, tutar) VALUES (?, ?, ?)",
+            ((yil, ay, 500 + (yil - ilk_yil) * 100) for yil in range(ilk_yil, son_yil + 1)
+             for ay in range(1, 13))
+        )
+
+    def odemeler():
+        for _ in range(odeme_sayisi):
+            yil = rng.randint(ilk_yil, son_yil)
+            ay = rng.randint(1, 12)
+            gun = date(yil, ay, 1) + timedelta(days=rng.randint(0, 27))
+            yield (rng.randint(1, daire_sayisi), yil, database.AY_ISIMLERI[ay - 1],
+                   gun.isoformat(), 500 + (yil - ilk_yil) * 100, "Aidat")
+
+    with database.bulk_write() as conn:
+        for batch in _batched(odemeler(), batch_size):
+            conn.executemany(
+                "INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar, aciklama) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                batch
+            )
+
+    with connection.get_connection() as conn:
+        conn.execute("ANALYZE")
+
+def seed_banka_hareketleri(hareket_sayisi=1000000, hesap_sayisi=3, ilk_yil=2015, son_yil=2024,
+                           seed=42, batch_size=50000):
+    """Mevcut veritabanına banka hesapları ve rastgele hareketler ekler"""
+    rng = random.Random(seed)
+    with connection.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO banka_hesaplari (banka_adi, sube_adi, hesap_no) VALUES (?, ?, ?)",
+            ((f"Banka {i}", "Merkez", f"{i:010d}") for i in range(1, hesap_sayisi + 1))
+        )
+        hesap_idleri = [row[0] for row in conn.execute("SELECT id FROM banka_hesaplari")]
+
+    gun_sayisi = (date(son_yil, 12, 31) - date(ilk_yil, 1, 1)).days
+
+    def hareketler():
+        for _ in range(hareket_sayisi):
+            gun = date(ilk_yil, 1, 1) + timedelta(days=rng.randint(0, gun_sayisi))
+            tip = "Gelir" if rng.random() < 0.6 else "Gider"
+            yield (rng.choice(hesap_idleri), gun.isoformat(), rng.randint(50, 5000), tip,
+                   f"{tip} açıklaması {rng.randint(1, 99999)}")
+
+    # Rastgele tarihli satırlar için bakiye defteri tetikleyicileri yerine sonda tek hesaplama
+    with database.bulk_write() as conn:
+        for batch in _batched(hareketler(), batch_size):
+            conn.executemany(
+                "INSERT INTO banka_hareketleri (hesap_id, tarih, tutar, hareket_tipi, aciklama) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+
+_GIDER_KALEMLERI = ("Elektrik", "Su", "Doğalgaz", "Asansör bakımı", "Temizlik", "Bahçe bakımı",
+                    "Kapıcı maaşı", "Sigorta", "Boya badana", "Çatı tamiri")
+
+def seed_giderler(gider_sayisi=100000, ilk_yil=2015, son_yil=2024, seed=42, batch_size=50000):
+    """Mevcut veritabanına rastgele giderler ekler; banka giderleri var olan hesaplara dağıtılır"""
+    rng = random.Random(seed)
+    with connection.get_connection() as conn:
+        hesap_idleri = [row[0] for row in conn.execute("SELECT id FROM banka_hesaplari")]
+
+    gun_sayisi = (date(son_yil, 12, 31) - date(ilk_yil, 1, 1)).days
+
+    def giderler():
+        for _ in range(gider_sayisi):
+            gun = date(ilk_yil, 1, 1) + timedelta(days=rng.randint(0, gun_sayisi))
+            banka = hesap_idleri and rng.random() < 0.7
+            yield (gun.isoformat(), rng.randint(100, 20000),
+                   f"{rng.choice(_GIDER_KALEMLERI)} {gun.month:02d}/{gun.year}",
+                   "Banka" if banka else "Nakit", rng.choice(hesap_idleri) if banka else None)
+
+    with database.bulk_write() as conn:
+        for batch in _batched(giderler(), batch_size):
+            conn.executemany(
+                "INSERT INTO giderler (odeme_tarihi, tutar, aciklama, odeme_sekli, banka_hesap_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+
+# Hazır ölçekler: daire, aidat ödemesi, banka hareketi, gider sayıları ve yıl aralığı
+SCALES = {
+    "kucuk": {"daire": 200, "odeme": 20000, "hareket": 20000, "gider": 2000, "hesap": 2,
+              "ilk_yil": 2020, "son_yil": 2024},
+    "orta": {"daire": 2000, "odeme": 250000, "hareket": 250000, "gider": 25000, "hesap": 3,
+             "ilk_yil": 2015, "son_yil": 2024},
+    "buyuk": {"daire": 10000, "odeme": 2000000, "hareket": 2000000, "gider": 200000, "hesap": 5,
+              "ilk_yil": 2010, "son_yil": 2024},
+}
+
+GENERATOR_SETTING = "sentetik_veri"
+
+def generate(path, scale="orta", seed=42, **overrides):
+    """path'e ölçeğe göre tam bir sentetik veritabanı üretir, kullanılan parametreleri döndürür
+
+    overrides ile ölçeğin tek tek değerleri değiştirilebilir (örn. odeme=5000000).
+    Aynı parametreler ve seed her zaman aynı veriyi üretir.
+    """
+    params = dict(SCALES[scale], **overrides)
+    ilk_yil, son_yil = params["ilk_yil"], params["son_yil"]
+    seed_database(path, params["daire"], params["odeme"], ilk_yil, son_yil, seed=seed)
+    seed_banka_hareketleri(params["hareket"], params["hesap"], ilk_yil, son_yil, seed=seed)
+    seed_giderler(params["gider"], ilk_yil, son_yil, seed=seed)
+    # Geçiş adımları (arama dizini dahil) var olan bir veritabanındaki gibi parça parça
+    migrations.migrate(path, backup=False)
+    params = dict(params, scale=scale, seed=seed)
+    with connection.get_connection() as conn:
+        # Ölçüm takımı dosyayı yeniden kullanırken hangi veriyle çalıştığını buradan okur
+        database.write_setting(conn.cursor(), GENERATOR_SETTING, json.dumps(params, sort_keys=True))
+        conn.execute("ANALYZE")
+    return params
+
+def main(argv):
+    """Komut satırı: python -m benchmarks.seed DOSYA [kucuk|orta|buyuk] [--seed N]"""
+    seed = 42
+    if "--seed" in argv:
+        seed = int(argv[argv.index("--seed") + 1])
+    args = [a for i, a in enumerate(argv) if not a.startswith("--") and (i == 0 or argv[i - 1] != "--seed")]
+    if not args:
+        print(main.__doc__)
+        return
+    path, scale = args[0], args[1] if len(args) > 1 else "orta"
+    if os.path.exists(path):
+        print(f"{path} zaten var; üzerine yazılmaz")
+        return
+    start = time.perf_counter()
+    params = generate(path, scale, seed)
+    connection.close_connections()
+    print(f"{path}: {params['daire']} daire, {params['odeme']} ödeme, {params['hareket']} banka hareketi, "
+          f"{params['gider']} gider ({time.perf_counter() - start:.1f} sn)")
+
+if __name__ == "__main__":
+    import sys
+    main(sys.argv[1:])
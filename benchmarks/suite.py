@@ -0,0 +1,255 @@
+"""Sürümler arası karşılaştırma için tüm ölçüm takımı
+
+Sentetik veritabanı üzerinde database.py erişimcilerini, ana sayfa özetini,
+rapor toplamalarını ve CSV dışa aktarmayı pencere açmadan ölçer; sonuçları
+JSON olarak yazar. Önceki bir sonuç dosyası verilirse gerilemeleri listeler
+ve sıfırdan farklı çıkış koduyla biter.
+
+    python -m benchmarks.suite [kucuk|orta|buyuk] [--veri DOSYA] [--cikti DOSYA]
+                               [--karsilastir ESKI.json] [--esik 0.2] [--filtre METIN]
+
+--veri verilen dosya varsa yeniden kullanılır, yoksa oraya üretilir; verilmezse
+veri geçici klasörde üretilip silinir.
+"""
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+import connection
+import database
+from benchmarks.seed import GENERATOR_SETTING, generate
+from records import ROW_FORMATS, Sutunlar
+from search import search
+
+RESULT_VERSION = 1
+# Her ölçüm en az MIN_REPEAT kez ve toplam MIN_SECONDS boyunca (en fazla MAX_REPEAT kez) tekrarlanır
+MIN_REPEAT = 3
+MAX_REPEAT = 50
+MIN_SECONDS = 0.5
+# Bundan kısa farklar gerileme sayılmaz (zamanlayıcı gürültüsü)
+NOISE_MS = 1.0
+
+class _Adet(int):
+    """Sonucu yerine okuduğu satır sayısını döndüren ölçümler (akış, dışa aktarma) için"""
+
+def _count(result):
+    # Erişimcilerin dönüş biçimleri: liste, (sayfa, imleç), sözlük ya da tek değer
+    if isinstance(result, _Adet):
+        return int(result)
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], list):
+        return len(result[0])
+    if isinstance(result, (list, Sutunlar)):
+        return len(result)
+    return 1
+
+def _cases(params, tmp):
+    """(ad, ölçülecek fonksiyon) listesi; fonksiyon işlenen satır sayısını döndürür"""
+    ilk_yil, son_yil = params["ilk_yil"], params["son_yil"]
+    orta_uye = max(params["daire"] // 2, 1)
+    bas, son = f"{son_yil}-01-01", f"{son_yil}-12-31"
+
+    def gruplar(iterator_fn, *args):
+        return lambda: _Adet(sum(len(rows) for rows in iterator_fn(*args)))
+
+    def disa_aktar(table):
+        def run():
+            from export import export_table
+            rows, _ = export_table(table, os.path.join(tmp, f"{table}.csv"), "csv")
+            return _Adet(rows)
+        return run
+
+    def borclar():
+        from borc import compute_borclar
+        return _Adet(len(compute_borclar(ilk_yil, son_yil, as_of=date(son_yil, 12, 31)).uye_idleri))
+
+    def mutabakat():
+        from mutabakat import reconcile
+        sonuc = reconcile(bas, son)
+        return _Adet(len(sonuc.eslesen) + len(sonuc.belirsiz) + len(sonuc.eslesmeyen))
+
+    def analiz_yukleme():
+        from analytics import AnalizGoruntusu
+        return _Adet(AnalizGoruntusu().refresh())
+
+    def genel_rapor():
+        from analytics import get_snapshot
+        goruntu = get_snapshot()
+        goruntu.aylik(ilk_yil, son_yil)
+        goruntu.gider_kategorileri(son_yil)
+        goruntu.yil_karsilastirma(son_yil)
+        return _Adet(sum(len(tablo) for tablo in goruntu.tablolar.values()))
+
+    def bakiye_denetimi():
+        database.check_bakiye_defteri()
+        with connection.get_connection() as conn:
+            return _Adet(conn.execute("SELECT COUNT(*) FROM banka_bakiye_gunluk").fetchone()[0])
+
+    def pdf_ekstre():
+        from pdf import write_statements
+        sayfa, _ = write_statements(os.path.join(tmp, "ekstre.pdf"), son_yil, 12)
+        return _Adet(sayfa)
+
+    # Önbellekli erişimciler önbelleksiz sürümleriyle ölçülür
+    return [
+        ("erisimci.get_table_data.uyeler", lambda: database.get_table_data("uyeler")),
+        ("erisimci.get_table_data.giderler", lambda: database.get_table_data("giderler")),
+        ("erisimci.get_all_uyeler", database.get_all_uyeler.uncached),
+        ("erisimci.get_all_banka_hesaplari", database.get_all_banka_hesaplari.uncached),
+        ("erisimci.get_aidat_for_year", lambda: database.get_aidat_for_year.uncached(son_yil)),
+        ("erisimci.get_aidat_tarifeleri", lambda: database.get_aidat_tarifeleri(ilk_yil, 1, son_yil, 12)),
+        ("erisimci.get_aidat_tutari", lambda: database.get_aidat_tutari(son_yil, 6)),
+        ("erisimci.get_apartman_bilgileri", database.get_apartman_bilgileri.uncached),
+        ("erisimci.get_aidat_odemeler_by_uye", lambda: database.get_aidat_odemeler_by_uye(orta_uye)),
+        ("erisimci.get_aidat_odemeler_by_uye.yil",
+         lambda: database.get_aidat_odemeler_by_uye(orta_uye, son_yil)),
+        ("erisimci.get_banka_hareketleri.yil", lambda: database.get_banka_hareketleri(1, bas, son)),
+        ("erisimci.get_giderler.yil", lambda: database.get_giderler(bas, son)),
+        *((f"satir_bicimi.{bicim}.get_table_data.banka_hareketleri",
+           lambda bicim=bicim: database.get_table_data("banka_hareketleri", row_format=bicim))
+          for bicim in ROW_FORMATS),
+        ("erisimci.get_banka_hareketleri_page", lambda: database.get_banka_hareketleri_page(1)),
+        ("erisimci.get_giderler_page", lambda: database.get_giderler_page()),
+        ("erisimci.get_table_data_page.aidat_odemeleri",
+         lambda: database.get_table_data_page("aidat_odemeleri")),
+        ("erisimci.iter_banka_hareketleri", gruplar(database.iter_banka_hareketleri)),
+        ("erisimci.iter_giderler", gruplar(database.iter_giderler)),
+        ("erisimci.iter_aidat_odemeler_by_uye",
+         gruplar(database.iter_aidat_odemeler_by_uye, orta_uye)),
+        ("erisimci.get_banka_bakiye", lambda: database.get_banka_bakiye(1)),
+        ("erisimci.get_banka_bakiyeleri", database.get_banka_bakiyeleri),
+        ("ozet.get_dashboard_ozeti", lambda: database.get_dashboard_ozeti(son_yil, 6)),
+        ("rapor.get_aylik_ozet", lambda: database.get_aylik_ozet(ilk_yil, son_yil)),
+        ("rapor.get_yillik_ozet", lambda: database.get_yillik_ozet(ilk_yil, son_yil)),
+        ("rapor.compute_borclar", borclar),
+        ("denetim.check_bakiye_defteri", bakiye_denetimi),
+        ("rapor.reconcile.yil", mutabakat),
+        ("analiz.yukleme", analiz_yukleme),
+        ("analiz.genel_rapor", genel_rapor),
+        ("pdf.aidat_ekstresi", pdf_ekstre),
+        ("arama.seyrek", lambda: search(f"Sakin {orta_uye}")),
+        ("arama.sik_terim", lambda: search("gider açıklaması")),
+        ("disa_aktarma.csv.aidat_odemeleri", disa_aktar("aidat_odemeleri")),
+        ("disa_aktarma.csv.banka_hareketleri", disa_aktar("banka_hareketleri")),
+    ]
+
+def measure(fn):
+    """Isınmadan sonra tekrarlı ölçüm: ms cinsinden süreler ve satır sayısı"""
+    rows = _count(fn())
+    sureler = []
+    toplam = time.perf_counter()
+    while len(sureler) < MAX_REPEAT and (len(sureler) < MIN_REPEAT
+                                          or time.perf_counter() - toplam < MIN_SECONDS):
+        start = time.perf_counter()
+        fn()
+        sureler.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": len(sureler),
+        "rows": rows,
+        "min_ms": round(min(sureler), 3),
+        "median_ms": round(statistics.median(sureler), 3),
+        "max_ms": round(max(sureler), 3),
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def _environment():
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def _open_data(path, scale, seed):
+    """Veri dosyasını açar ya da üretir; üretim parametrelerini döndürür"""
+    if path and os.path.exists(path):
+        connection.set_db_path(path)
+        with connection.get_connection() as conn:
+            params = database.read_setting(conn.cursor(), GENERATOR_SETTING)
+        if params is None:
+            raise ValueError(f"{path} benchmarks.seed ile üretilmemiş")
+        return json.loads(params), 0.0
+    start = time.perf_counter()
+    params = generate(path, scale, seed)
+    return params, time.perf_counter() - start
+
+def run_suite(scale="orta", data_path=None, seed=42, filtre=None):
+    """Tüm ölçümleri çalıştırır, JSON'a yazılabilir sonuç sözlüğünü döndürür"""
+    with tempfile.TemporaryDirectory() as tmp:
+        params, uretim = _open_data(data_path or os.path.join(tmp, "bench.db"), scale, seed)
+        print(f"Veri: {params['daire']} daire, {params['odeme']} ödeme, {params['hareket']} banka hareketi, "
+              f"{params['gider']} gider" + (f" (üretim {uretim:.1f} sn)" if uretim else " (mevcut dosya)"))
+
+        sonuclar = {}
+        for ad, fn in _cases(params, tmp):
+            if filtre and filtre not in ad:
+                continue
+            sonuc = sonuclar[ad] = measure(fn)
+            print(f"  {ad:<48} {sonuc['median_ms']:10.2f} ms  {sonuc['rows']:9,d} satır  "
+                  f"(x{sonuc['repeat']})")
+        connection.close_connections()
+
+    return {
+        "version": RESULT_VERSION,
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "environment": _environment(),
+        "data": params,
+        "results": sonuclar,
+    }
+
+def compare(eski, yeni, esik=0.2):
+    """Ortanca süresi esik oranından fazla artan ölçümler: [(ad, eski ms, yeni ms)]"""
+    gerileyenler = []
+    for ad, sonuc in yeni["results"].items():
+        onceki = eski["results"].get(ad)
+        if onceki is None:
+            continue
+        eski_ms, yeni_ms = onceki["median_ms"], sonuc["median_ms"]
+        if yeni_ms > eski_ms * (1 + esik) and yeni_ms - eski_ms > NOISE_MS:
+            gerileyenler.append((ad, eski_ms, yeni_ms))
+    return gerileyenler
+
+def main(argv):
+    def option(name, default=None):
+        return argv[argv.index(name) + 1] if name in argv else default
+
+    secenekler = ("--veri", "--cikti", "--karsilastir", "--esik", "--filtre", "--seed")
+    args = [a for i, a in enumerate(argv) if not a.startswith("--") and (i == 0 or argv[i - 1] not in secenekler)]
+    scale = args[0] if args else "orta"
+    cikti = option("--cikti", f"benchmark_{scale}_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    sonuc = run_suite(scale, option("--veri"), int(option("--seed", 42)), option("--filtre"))
+    with open(cikti, "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar: {cikti}")
+
+    eski_dosya = option("--karsilastir")
+    if eski_dosya:
+        with open(eski_dosya, encoding="utf-8") as f:
+            eski = json.load(f)
+        if eski.get("data") != sonuc["data"]:
+            print("Uyarı: karşılaştırılan sonuç farklı veriyle alınmış")
+        gerileyenler = compare(eski, sonuc, float(option("--esik", 0.2)))
+        for ad, eski_ms, yeni_ms in gerileyenler:
+            print(f"GERİLEME {ad:<48} {eski_ms:10.2f} -> {yeni_ms:10.2f} ms (x{yeni_ms / eski_ms:.2f})")
+        if gerileyenler:
+            return 1
+        print(f"Gerileme yok ({eski.get('commit')} ile karşılaştırıldı)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
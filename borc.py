@@ -0,0 +1,148 @@
+import calendar
+import time
+from datetime import date
+
+import numpy as np
+
+from connection import get_connection
+from database import AY_ISIMLERI
+from utils import fold_tr
+
+class BorcSonucu:
+    """Daire x ay borç matrisi ve toplamları
+
+    Diziler (daire_sayisi, ay_sayisi) boyutundadır; satırlar uye_idleri,
+    sütunlar aylar sırasındadır. Tutarlar tam TL'dir.
+    """
+    def __init__(self, uye_idleri, daire_nolari, adlar, aylar, tarife, odenen, gecikme_carpani):
+        self.uye_idleri = uye_idleri    # (F,)
+        self.daire_nolari = daire_nolari
+        self.adlar = adlar
+        self.aylar = aylar              # [(yil, ay_no)] vadesi gelmiş aylar
+        self.tarife = tarife            # (M,)
+        self.odenen = odenen            # (F, M)
+        # Fazla ödeme başka ayın borcunu kapatmaz, ayrıca alacak olarak tutulur
+        fark = tarife[np.newaxis, :] - odenen
+        self.kalan = np.maximum(fark, 0)
+        self.fazla = np.maximum(-fark, 0)
+        # Ay başına gecikme çarpanı (oran x geçen ay) tüm dairelere yayınlanır
+        self.gecikme = np.rint(self.kalan * gecikme_carpani[np.newaxis, :]).astype(np.int64)
+        self.sure = 0.0
+
+    @property
+    def toplam_borc(self):
+        return self.kalan + self.gecikme
+
+    def daire_toplamlari(self):
+        """Daire başına (anapara, gecikme, borçlu ay sayısı, fazla ödeme)"""
+        return (self.kalan.sum(axis=1), self.gecikme.sum(axis=1),
+                np.count_nonzero(self.kalan, axis=1), self.fazla.sum(axis=1))
+
+    def aylik_toplamlar(self):
+        """Ay başına (anapara, gecikme, borçlu daire sayısı)"""
+        return (self.kalan.sum(axis=0), self.gecikme.sum(axis=0),
+                np.count_nonzero(self.kalan, axis=0))
+
+    def genel_toplam(self):
+        """(anapara, gecikme, borçlu daire sayısı)"""
+        return (int(self.kalan.sum()), int(self.gecikme.sum()),
+                int(np.count_nonzero(self.kalan.any(axis=1))))
+
+    def daire(self, uye_id):
+        """Bir dairenin [(yil, ay_no, tarife, ödenen, kalan, gecikme)] dökümü"""
+        i = int(np.searchsorted(self.uye_idleri, uye_id))
+        if i >= len(self.uye_idleri) or self.uye_idleri[i] != uye_id:
+            return []
+        return [(yil, ay_no, int(self.tarife[j]), int(self.odenen[i, j]),
+                 int(self.kalan[i, j]), int(self.gecikme[i, j]))
+                for j, (yil, ay_no) in enumerate(self.aylar)]
+
+def parse_group_concat(metin, dtype=np.int64):
+    """group_concat(sütun) çıktısını ("12,7,-3") NumPy dizisine çevirir"""
+    if not metin:
+        return np.zeros(0, dtype=dtype)
+    return np.array(metin.split(","), dtype=dtype)
+
+def _ay_no(ay):
+    # aidat_odemeleri.ay ay adı ("Şubat", "subat") ya da numarası olabilir
+    ay = fold_tr(str(ay), normalize_space=True)
+    if ay.isdigit():
+        return int(ay)
+    return AY_ISIMLERI.index(ay) + 1 if ay in AY_ISIMLERI else 0
+
+def _vade(yil, ay_no, vade_gunu):
+    # Ayda olmayan gün (örn. 31, Şubat'ta) ayın son gününe çekilir
+    return date(yil, ay_no, min(vade_gunu, calendar.monthrange(yil, ay_no)[1]))
+
+def compute_borclar(start_year, end_year=None, as_of=None, gecikme_orani=0.0, vade_gunu=1):
+    """start_year..end_year arasındaki vadesi gelmiş aidatlar için borç matrisini hesaplar
+
+    Tarifeler ve ödemeler (daire x ay) dizilerine tek geçişte yüklenir;
+    kalan, gecikme ve toplamlar vektörel hesaplanır. Her ayın vadesi o ayın
+    vade_gunu'dür (kısa aylarda ayın son günü); as_of (varsayılan bugün)
+    tarihinde vadesi gelmemiş aylar dahil edilmez. gecikme_orani aylık basit orandır (örn. 0.05): kalan
+    tutar vadeden sonra geçen her tam ay için bu oranla artar.
+    """
+    start = time.perf_counter()
+    end_year = end_year or start_year
+    as_of = as_of or date.today()
+
+    aylar = [(yil, ay_no) for yil in range(start_year, end_year + 1) for ay_no in range(1, 13)
+             if _vade(yil, ay_no, vade_gunu) <= as_of]
+    ay_sayisi = len(aylar)
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("SELECT id, daire_no, adi_soyadi FROM uyeler ORDER BY id")
+        uyeler = cursor.fetchall()
+        cursor.execute("SELECT yil, ay_no, tutar FROM aidat_tarifeleri WHERE yil BETWEEN ? AND ?",
+                       (start_year, end_year))
+        tarifeler = cursor.fetchall()
+        # Ödemeler (yıl, ay) başına tek satırda, virgülle birleştirilmiş listeler olarak
+        # okunur: kapsayan indeks sırasıyla akış halinde gruplanır ve satır başına Python
+        # nesnesi oluşmaz. Aynı dairenin bir aydaki ödemeleri aşağıda bincount ile toplanır.
+        cursor.execute('''SELECT yil, ay, group_concat(uye_id), group_concat(tutar)
+                          FROM aidat_odemeleri
+                          WHERE yil BETWEEN ? AND ? AND uye_id IS NOT NULL AND tutar IS NOT NULL
+                          GROUP BY yil, ay''', (start_year, end_year))
+        odemeler = cursor.fetchall()
+
+    uye_idleri = np.array([row[0] for row in uyeler], dtype=np.int64)
+    daire_sayisi = len(uye_idleri)
+
+    # Ay sütunu: (yil - start_year) * 12 + ay_no - 1 ile doğrudan adreslenen tam yıl ızgarası
+    tarife = np.zeros((end_year - start_year + 1) * 12, dtype=np.int64)
+    for yil, ay_no, tutar in tarifeler:
+        if 1 <= ay_no <= 12:
+            tarife[(yil - start_year) * 12 + ay_no - 1] = tutar or 0
+
+    odenen = np.zeros(daire_sayisi * len(tarife), dtype=np.int64)
+    hucreler, tutarlar = [], []
+    for yil, ay, uye_listesi, tutar_listesi in odemeler:
+        ay_no = _ay_no(ay)
+        if not 1 <= ay_no <= 12 or not daire_sayisi:
+            continue  # tanınmayan ay yazımı
+        odeme_uye = parse_group_concat(uye_listesi)
+        satir = np.minimum(np.searchsorted(uye_idleri, odeme_uye), daire_sayisi - 1)
+        # Silinmiş üyelere ait ödemeler atlanır
+        gecerli = uye_idleri[satir] == odeme_uye
+        hucreler.append(satir[gecerli] * len(tarife) + (yil - start_year) * 12 + ay_no - 1)
+        tutarlar.append(parse_group_concat(tutar_listesi, np.float64)[gecerli])
+    if hucreler:
+        # Aynı hücreye düşen ödemeler (aynı ayda birden çok ödeme, "Şubat"/"subat") toplanır
+        odenen = np.rint(np.bincount(np.concatenate(hucreler), weights=np.concatenate(tutarlar),
+                                     minlength=len(odenen))).astype(np.int64)
+    odenen = odenen.reshape(daire_sayisi, len(tarife))[:, :ay_sayisi]
+    tarife = tarife[:ay_sayisi]
+
+    # Vadeden as_of'a kadar geçen tam ay sayısı
+    vade_oncesi = as_of < _vade(as_of.year, as_of.month, vade_gunu)
+    gecen_ay = np.array([(as_of.year - yil) * 12 + as_of.month - ay_no - vade_oncesi
+                         for yil, ay_no in aylar], dtype=np.int64)
+    gecikme_carpani = gecikme_orani * np.maximum(gecen_ay, 0)
+
+    sonuc = BorcSonucu(uye_idleri, [row[1] for row in uyeler], [row[2] for row in uyeler],
+                       aylar, tarife, odenen, gecikme_carpani)
+    sonuc.sure = time.perf_counter() - start
+    return sonuc
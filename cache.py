@@ -0,0 +1,255 @@
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Varsayılan sınırlar: en fazla bu kadar sonuç ve toplamda bu kadar satır tutulur
+MAX_ENTRIES = 256
+MAX_ROWS = 50000
+
+# Yazma deyimlerinin hedef tablosu. WITH ... INSERT ve CREATE TRIGGER gövdelerinde
+# eşleşme deyimin her yerinde aranır
+_YAZMA = (r"(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM"
+          r"|DROP\s+(?:TABLE|VIEW)(?:\s+IF\s+EXISTS)?|ALTER\s+TABLE"
+          r"|CREATE\s+(?:TEMP\w*\s+)?(?:TABLE|VIEW)(?:\s+IF\s+NOT\s+EXISTS)?)"
+          r"\s+(?:(\w+)\.)?[\"`\[]?(\w+)")
+_YAZMA_RE = re.compile(r"\b" + _YAZMA, re.IGNORECASE)
+# Tek yazma deyimi: hedef tablo deyimin başındadır
+_BAS_RE = re.compile(r"\s*" + _YAZMA, re.IGNORECASE)
+# Bu sözcüklerle başlayan deyimler hiçbir tabloyu değiştirmez
+_OKUMA = ("SELECT", "PRAGMA", "SAVEPOINT", "RELEASE", "EXPLAIN", "ANALYZE", "VACUUM")
+
+class QueryCache:
+    """Erişimci sonuçları için LRU önbellek
+
+    Anahtar (veritabanı yolu, erişimci adı, argümanlar) üçlüsüdür; her kayıt
+    okuduğu tablolara bağlanır. Bir bağlantı bu tablolardan birine yazdığında
+    ilgili kayıtlar düşürülür. Yazma, bağlantının izleme (trace) geri
+    çağrısından yakalanır; böylece database.py dışındaki yazmalar (formlar,
+    içe aktarıcı, mutabakat) da önbelleği geçersiz kılar. Başka süreçlerin
+    yazmaları izlenemez; bunlar her aramada PRAGMA data_version ile
+    yakalanır ve o veritabanının tüm kayıtları düşürülür (bkz. cached).
+    """
+    def __init__(self, max_entries=MAX_ENTRIES, max_rows=MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # anahtar -> (sonuç, satır sayısı)
+        self._by_table = {}             # (yol, tablo) -> {anahtar}
+        self._rows = 0
+        # Her geçersiz kılmada artar; sorgu sürerken yazma olduysa sonuç saklanmaz
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, tables, loader):
+        """Önbellekteki sonucu döndürür, yoksa loader() ile yükleyip saklar"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[0])
+            self.misses += 1
+            generation = self._generation
+
+        result = loader()
+
+        # Boş sonuçlar (hata ya da henüz veri yok) saklanmaz; tekrar sorgulanmaları ucuzdur
+        if not result:
+            return result
+        rows = len(result) if isinstance(result, list) else 1
+        if rows > self.max_rows:
+            return result
+        with self._lock:
+            if generation == self._generation and key not in self._entries:
+                self._entries[key] = (result, rows)
+                self._rows += rows
+                for table in tables:
+                    self._by_table.setdefault((key[0], table), set()).add(key)
+                self._evict()
+        return _copy(result)
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._rows > self.max_rows):
+            key, _ = next(iter(self._entries.items()))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, rows = self._entries.pop(key)
+        self._rows -= rows
+        for keys in self._by_table.values():
+            keys.discard(key)
+
+    def invalidate(self, path, *tables):
+        """path veritabanındaki tablolara bağlı kayıtları düşürür"""
+        with self._lock:
+            self._generation += 1
+            for table in tables:
+                for key in self._by_table.pop((path, table.lower()), ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def invalidate_path(self, path):
+        """path veritabanına ait tüm kayıtları düşürür"""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[0] == path]:
+                self._remove(key)
+                self.invalidations += 1
+            for by_table in [k for k in self._by_table if k[0] == path]:
+                del self._by_table[by_table]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_table.clear()
+            self._rows = 0
+
+    def stats(self):
+        """Ayar için sayaçlar: isabet, ıskalama, çıkarma, geçersiz kılma, doluluk"""
+        with self._lock:
+            toplam = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / toplam if toplam else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "rows": self._rows,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+def _copy(result):
+    # Çağıran listeyi değiştirse (sıralama, ekleme) önbellekteki kopya bozulmasın
+    return list(result) if isinstance(result, list) else result
+
+query_cache = QueryCache()
+
+_OKUMA_DEYIMI, _BASLAT, _BITIR, _GERI_AL = "okuma", "baslat", "bitir", "geri_al"
+
+def _deyim_turu(sql):
+    """(tür, önek uzunluğu): okuma, BEGIN, COMMIT/ROLLBACK, ROLLBACK TO ya da yazılan tablolar
+
+    Önek uzunluğu sıfırdan büyükse tür yalnızca deyimin o kadarlık başına
+    bağlıdır; aynı önekle başlayan sonraki deyimler için yeniden
+    ayrıştırma gerekmez.
+    """
+    kelime = sql[:40].lstrip()[:9].upper()
+    if kelime.startswith("BEGIN"):
+        return _BASLAT, 0
+    if kelime.startswith("ROLLBACK") and re.match(r"\s*ROLLBACK\s+(?:TRANSACTION\s+)?TO\b", sql, re.IGNORECASE):
+        # Kayıt noktasına dönüş işlemi bitirmez
+        return _GERI_AL, 0
+    if kelime.startswith(("COMMIT", "END", "ROLLBACK")):
+        return _BITIR, 0
+    if kelime.startswith(_OKUMA):
+        return _OKUMA_DEYIMI, 0
+    if kelime.startswith(("WITH", "CREATE")):
+        # Yazmalar gövdenin herhangi bir yerinde olabilir
+        return frozenset(t.lower() for sema, t in _YAZMA_RE.findall(sql) if sema.lower() != "temp"), 0
+    # INSERT/UPDATE/DELETE'te hedef tablo baştadır. Önek, tablo adından sonraki
+    # karakteri de içerir ki "t" ile "t2" karışmasın.
+    eslesme = _BAS_RE.match(sql)
+    if eslesme is None:
+        return frozenset(), 0
+    if (eslesme.group(1) or "").lower() == "temp":
+        return frozenset(), eslesme.end() + 1
+    return frozenset((eslesme.group(2).lower(),)), eslesme.end() + 1
+
+def watch_connection(conn, path):
+    """Bağlantının yazdığı tabloları izleyip önbelleği geçersiz kılar
+
+    Yazma deyimi çalışırken ve işlem commit/rollback edilirken olmak üzere
+    iki kez geçersiz kılınır: ilki diğer iş parçacıklarının eski sonucu
+    saklamasını önler, ikincisi işlem sürerken okunup saklanan (henüz
+    commit edilmemiş veriyi görmeyen) sonuçları temizler.
+    """
+    bekleyen = set()      # açık işlemde yazılan tablolar
+    islem = [False]
+    # executemany her satır için izleme çağrısı yapar ve parametreler metne
+    # gömülüdür; son yazma deyiminin öneki saklanır, aynı deyimin sonraki
+    # satırları yalnızca bir startswith ile sınıflanır
+    son = ["\0", None]
+
+    def trace(sql):
+        if sql.startswith(son[0]):
+            tur = son[1]
+        else:
+            tur, onek = _deyim_turu(sql)
+            if onek:
+                son[0], son[1] = sql[:onek], tur
+        if tur is _OKUMA_DEYIMI:
+            return
+        if tur is _BASLAT:
+            islem[0] = True
+            return
+        if tur is _GERI_AL:
+            # İşlem içinde okunup saklanan, geri alınan yazmaları gören sonuçlar
+            if bekleyen:
+                query_cache.invalidate(path, *bekleyen)
+            return
+        if tur is _BITIR:
+            islem[0] = False
+            if bekleyen:
+                query_cache.invalidate(path, *bekleyen)
+                bekleyen.clear()
+            return
+        if not islem[0]:
+            # İşlem dışındaki deyim kendiliğinden commit edilir
+            if tur:
+                query_cache.invalidate(path, *tur)
+            return
+        # İşlem içinde aynı tabloya yapılan sonraki yazmalar yeniden geçersiz kılmaz;
+        # commit/rollback'te bekleyen tablolar bir kez daha temizlenir
+        yeni = tur - bekleyen
+        if yeni:
+            bekleyen.update(yeni)
+            query_cache.invalidate(path, *yeni)
+
+    conn.set_trace_callback(trace)
+
+def check_data_version(conn, path):
+    """Bağlantının son kontrolünden beri başka bir bağlantı commit ettiyse path'in kayıtlarını düşürür
+
+    data_version bağlantıya özgüdür ve yalnızca başka bağlantıların (başka
+    süreçler dahil) commit'lerinde artar; bu yüzden her bağlantının gördüğü
+    son değer ayrı saklanır. Bağlantının ilk kontrolünde karşılaştırılacak
+    değer olmadığından kayıtlar yine düşürülür.
+    """
+    # TimedConnection.execute'u atlar: her önbellek araması sorgu ölçümlerine girmesin
+    surum = sqlite3.Connection.execute(conn, "PRAGMA data_version").fetchone()[0]
+    if getattr(conn, "veri_surumu", None) != surum:
+        query_cache.invalidate_path(path)
+        conn.veri_surumu = surum
+
+def cached(*tables):
+    """Erişimci sonucunu tables'a bağlı olarak önbelleğe alır
+
+    Anahtara veritabanı yolu da girer; connection.set_db_path ile başka bir
+    dosyaya geçildiğinde eski sonuçlar kullanılmaz. Her çağrıda başka
+    süreçlerin yazmaları check_data_version ile denetlenir.
+    """
+    tables = tuple(t.lower() for t in tables)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            import connection
+            path = connection.DB_PATH
+            check_data_version(connection.acquire(path), path)
+            key = (path, fn.__name__, args, tuple(sorted(kwargs.items())))
+            return query_cache.get_or_load(key, tables, lambda: fn(*args, **kwargs))
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
@@ -0,0 +1,16 @@
+import pytest
+
+import connection
+from cache import query_cache
+from database import init_database
+
+@pytest.fixture
+def db(tmp_path):
+    """Boş (yalnızca şema ve varsayılan yönetici içeren) geçici veritabanı"""
+    path = str(tmp_path / "apartman.db")
+    connection.set_db_path(path)
+    query_cache.clear()
+    init_database()
+    yield path
+    connection.close_connections()
+    query_cache.clear()
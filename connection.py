@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from cache import watch_connection
+from metrics import TimedConnection
+
+# Varsayılan veritabanı dosyası
+DB_PATH = "apartman.db"
+
+# Bağlantı açılırken bir kez uygulanan ayarlar
+PRAGMAS = (
+    ("journal_mode", "WAL"),       # Okuyucular yazıcıyı beklemesin
+    ("synchronous", "NORMAL"),     # WAL ile güvenli ve daha hızlı
+    ("cache_size", -20000),        # ~20 MB sayfa önbelleği
+    ("mmap_size", 268435456),      # 256 MB bellek eşlemeli okuma
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+# Her iş parçacığının kendi uzun ömürlü bağlantıları (yol -> bağlantı)
+_local = threading.local()
+_registry_lock = threading.Lock()
+_all_connections = []
+_generation = 0
+
+def set_db_path(path, close_existing=True):
+    """Varsayılan veritabanı dosyasını değiştirir, açık bağlantıları kapatır
+
+    close_existing=False ise diğer dosyaların havuzlanmış bağlantıları açık
+    kalır (bina değiştirirken önceki binaya dönüş ucuz olsun diye).
+    """
+    global DB_PATH
+    if close_existing:
+        close_connections()
+    DB_PATH = path
+
+def open_connection(path=None, check_same_thread=True):
+    """Yeni bir bağlantı açar ve ayarlarını uygular"""
+    path = path or DB_PATH
+    # Her sorgu metrics modülünde süre, satır sayısı ve şekliyle kaydedilir
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread, factory=TimedConnection)
+    conn.row_factory = sqlite3.Row  # Sonuçları sözlük olarak almak için
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+    # Yazılan tablolar sorgu önbelleğinden düşürülür
+    watch_connection(conn, path)
+    return conn
+
+def _thread_connections():
+    # close_connections() sonrası eski (kapatılmış) bağlantılar atılır
+    if getattr(_local, "generation", None) != _generation:
+        _local.connections = {}
+        _local.generation = _generation
+    return _local.connections
+
+def acquire(path=None):
+    """Bu iş parçacığına ait havuzlanmış bağlantıyı döndürür"""
+    path = path or DB_PATH
+    conns = _thread_connections()
+    conn = conns.get(path)
+    if conn is None:
+        # Bağlantı yalnızca bu iş parçacığında kullanılır; kapatma her yerden yapılabilir
+        conn = open_connection(path, check_same_thread=False)
+        conns[path] = conn
+        with _registry_lock:
+            _all_connections.append(conn)
+    return conn
+
+@contextmanager
+def get_connection(path=None):
+    """Havuzdaki bağlantıyı verir; başarılı çıkışta commit, hatada rollback yapar
+
+    Bağlantı kapatılmaz, aynı iş parçacığındaki sonraki çağrılarda yeniden
+    kullanılır. İç içe kullanımda (ya da bağlantıda açık bir işlem varken)
+    işlemi dıştaki sahibi bitirir; içteki blok bir SAVEPOINT açar, hatada
+    yalnızca kendi yazdıklarını geri alır.
+    """
+    conn = acquire(path)
+    derinlik = getattr(conn, "derinlik", 0)
+    if derinlik == 0 and not conn.in_transaction:
+        conn.derinlik = 1
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
+        finally:
+            conn.derinlik = 0
+        return
+
+    # Dıştaki işlemi commit/rollback etmemek için kayıt noktası
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    kayit = f"baglanti_{derinlik}"
+    conn.execute(f"SAVEPOINT {kayit}")
+    conn.derinlik = derinlik + 1
+    try:
+        yield conn
+    except Exception:
+        # Bazı hatalar (disk dolu, kesinti) işlemin tamamını geri alır
+        if conn.in_transaction:
+            conn.execute(f"ROLLBACK TO {kayit}")
+            conn.execute(f"RELEASE {kayit}")
+        raise
+    else:
+        conn.execute(f"RELEASE {kayit}")
+    finally:
+        conn.derinlik = derinlik
+
+def close_connections():
+    """Tüm iş parçacıklarının havuzlanmış bağlantılarını kapatır"""
+    global _generation
+    with _registry_lock:
+        conns = list(_all_connections)
+        _all_connections.clear()
+        _generation += 1
+    for conn in conns:
+        conn.close()
@@ -1,325 +1,1213 @@
 import sqlite3
 import os
+import json
+import base64
+from contextlib import contextmanager
 from datetime import datetime
-import bcrypt
+from cache import cached
+from connection import get_connection, open_connection
+from search import ARAMA_KAYNAKLARI, deferred_indexing
+from query import Filter, compile_select
+from records import RECORD, fetch_all
+
+# aidatlar görünümündeki ay sütunları (ay_no sırasıyla)
+AY_ISIMLERI = ("ocak", "subat", "mart", "nisan", "mayis", "haziran",
+               "temmuz", "agustos", "eylul", "ekim", "kasim", "aralik")
+
+# aidat_tarifeleri satırlarını eski geniş (yıl başına tek satır) düzene çevirir
+AIDAT_PIVOT_SQL = ("SELECT yil AS id, yil, "
+                   + ", ".join(f"SUM(CASE WHEN ay_no={i} THEN tutar ELSE 0 END) AS {ay}"
+                               for i, ay in enumerate(AY_ISIMLERI, start=1))
+                   + ", SUM(tutar) AS toplam FROM aidat_tarifeleri")
+
+# Veritabanı şema sürümü (PRAGMA user_version); migrations.MIGRATIONS içindeki
+# son adımın numarasıdır. Kayıtlı sürüm aynıysa açılışta şema adımları atlanır.
+SCHEMA_VERSION = 4
+
+# Sürümlü ikincil indeks kümesi; liste değiştiğinde INDEX_VERSION artırılmalı
+INDEX_VERSION = 3
+INDEXES = {
+    "idx_aidat_odemeleri_uye_yil_tarih": "aidat_odemeleri(uye_id, yil, odeme_tarihi)",
+    # Aylık toplamlar için kapsayan indeks (tabloya dönmeden uye_id, tutar okunur)
+    "idx_aidat_odemeleri_yil_ay_uye": "aidat_odemeleri(yil, ay, uye_id, tutar)",
+    "idx_banka_hareketleri_hesap_tarih": "banka_hareketleri(hesap_id, tarih)",
+    "idx_banka_hareketleri_tarih": "banka_hareketleri(tarih)",
+    # Ekstre içe aktarmada mükerrer hareket kontrolü
+    "idx_banka_hareketleri_mukerrer": "banka_hareketleri(hesap_id, tarih, tutar, aciklama)",
+    "idx_giderler_odeme_tarihi": "giderler(odeme_tarihi)",
+}
 
 def create_connection():
-    """SQLite veritabanı bağlantısı oluşturur"""
-    conn = sqlite3.connect("apartman.db")
-    conn.row_factory = sqlite3.Row  # Sonuçları sözlük olarak almak için
-    return conn
+    """SQLite veritabanı bağlantısı oluşturur
+
+    Çağıran tarafından kapatılması gereken ayrı bir bağlantıdır; sık yapılan
+    sorgular için havuzlanmış get_connection() kullanılmalıdır.
+    """
+    return open_connection()
 
 def init_database():
-    """Veritabanını ve tabloları oluşturur, varsayılan veriyi ekler"""
-    create_tables()
-    create_user_table()
+    """Veritabanını ve tabloları oluşturur, varsayılan veriyi ekler
+
+    Kayıtlı şema ve indeks sürümleri güncelse tablo oluşturma adımları
+    atlanır; açılışta yalnızca iki küçük okuma yapılır. Yeni veritabanında
+    temel şema kurulur; ardından engelleyici geçiş adımları uygulanır.
+    Parça parça çalışan (online) adımlar uygulama açıldıktan sonra
+    migrations.migrate() ile arka planda tamamlanır.
+    """
+    if not schema_is_current():
+        with get_connection() as conn:
+            surum = conn.execute("PRAGMA user_version").fetchone()[0]
+            yeni = conn.execute("SELECT 1 FROM sqlite_master WHERE name='uyeler'").fetchone() is None
+        if surum == 0:
+            # Temel şema (sürüm 1); create_tables'daki IF NOT EXISTS eski
+            # sürümsüz veritabanlarını da bozmadan bu sürüme getirir
+            if create_tables():
+                create_user_table()
+                with get_connection() as conn:
+                    conn.execute("PRAGMA user_version = 1")
+        create_indexes()
+        from migrations import migrate
+        # Yeni veritabanında taşınacak veri yok: tüm adımlar hemen, yedeksiz uygulanır
+        migrate(backup=not yeni, online=yeni)
     create_default_admin()
 
+def schema_is_current():
+    """Kayıtlı şema ve indeks sürümleri koddaki sürümlerle aynı mı"""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            return (cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+                    and read_setting(cursor, "index_version") == str(INDEX_VERSION))
+    except sqlite3.OperationalError:
+        # sistem_ayarlari henüz yok: yeni veritabanı
+        return False
+
 def create_tables():
-    """Gerekli veritabanı tablolarını oluşturur"""
-    conn = None
+    """Gerekli veritabanı tablolarını oluşturur; başarılıysa True döndürür"""
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-        # Apartman tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS apartman (
-                        id INTEGER PRIMARY KEY CHECK (id=1),
-                        adi TEXT, 
-                        yonetici TEXT,
-                        Tel TEXT,
-                        yardimci TEXT,
-                        denetci TEXT,
-                        adres TEXT)''')
-
-        # Üyeler tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS uyeler (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        daire_no INTEGER,
-                        adi_soyadi TEXT,
-                        telefon TEXT,
-                        kat_maliki_durumu TEXT,
-                        apartman TEXT,
-                        email TEXT,
-                        UNIQUE(daire_no))''')
-
-        # Aidatlar tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS aidatlar (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        yil INTEGER,
-                        ocak INTEGER DEFAULT 0,
-                        subat INTEGER DEFAULT 0,
-                        mart INTEGER DEFAULT 0,
-                        nisan INTEGER DEFAULT 0,
-                        mayis INTEGER DEFAULT 0,
-                        haziran INTEGER DEFAULT 0,
-                        temmuz INTEGER DEFAULT 0,
-                        agustos INTEGER DEFAULT 0,
-                        eylul INTEGER DEFAULT 0,
-                        ekim INTEGER DEFAULT 0,
-                        kasim INTEGER DEFAULT 0,
-                        aralik INTEGER DEFAULT 0,
-                        toplam INTEGER DEFAULT 0,
-                        UNIQUE(yil))''')
-
-        # Aidat ödemeleri tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS aidat_odemeleri (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        uye_id INTEGER,
-                        yil INTEGER,
-                        ay TEXT,
-                        odeme_tarihi TEXT,
-                        tutar INTEGER,
-                        aciklama TEXT,
-                        FOREIGN KEY (uye_id) REFERENCES uyeler(id))''')
+            # Apartman tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS apartman (
+                            id INTEGER PRIMARY KEY CHECK (id=1),
+                            adi TEXT, 
+                            yonetici TEXT,
+                            Tel TEXT,
+                            yardimci TEXT,
+                            denetci TEXT,
+                            adres TEXT)''')
+
+            # Üyeler tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS uyeler (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            daire_no INTEGER,
+                            adi_soyadi TEXT,
+                            telefon TEXT,
+                            kat_maliki_durumu TEXT,
+                            apartman TEXT,
+                            email TEXT,
+                            UNIQUE(daire_no))''')
+
+            # Aylık aidat tarifesi: her (yıl, ay) için bir satır
+            cursor.execute('''CREATE TABLE IF NOT EXISTS aidat_tarifeleri (
+                            yil INTEGER NOT NULL,
+                            ay_no INTEGER NOT NULL CHECK (ay_no BETWEEN 1 AND 12),
+                            tutar INTEGER NOT NULL DEFAULT 0,
+                            PRIMARY KEY (yil, ay_no)) WITHOUT ROWID''')
+
+            # Eski geniş "aidatlar" tablosu varsa taşı, yerine uyumluluk görünümü koy
+            migrate_aidatlar(cursor)
+
+            # Aidat ödemeleri tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS aidat_odemeleri (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            uye_id INTEGER,
+                            yil INTEGER,
+                            ay TEXT,
+                            odeme_tarihi TEXT,
+                            tutar INTEGER,
+                            aciklama TEXT,
+                            FOREIGN KEY (uye_id) REFERENCES uyeler(id))''')
                         
-        # Giderler tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS giderler (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        odeme_tarihi TEXT,
-                        tutar INTEGER,
-                        aciklama TEXT,
-                        odeme_sekli TEXT CHECK(odeme_sekli IN ('Banka', 'Nakit')),
-                        banka_hesap_id INTEGER,
-                        FOREIGN KEY (banka_hesap_id) REFERENCES banka_hesaplari(id))''')
-
-        # Banka hesapları tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS banka_hesaplari (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        banka_adi TEXT,
-                        sube_adi TEXT,
-                        hesap_no TEXT,
-                        iban TEXT,
-                        aciklama TEXT)''')
-
-        # Banka hareketleri tablosu
-        cursor.execute('''CREATE TABLE IF NOT EXISTS banka_hareketleri (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        hesap_id INTEGER,
-                        tarih TEXT,
-                        tutar INTEGER,
-                        hareket_tipi TEXT CHECK(hareket_tipi IN ('Gelir', 'Gider')),
-                        aciklama TEXT,
-                        FOREIGN KEY (hesap_id) REFERENCES banka_hesaplari(id))''')
-
-        conn.commit()
+            # Giderler tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS giderler (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            odeme_tarihi TEXT,
+                            tutar INTEGER,
+                            aciklama TEXT,
+                            odeme_sekli TEXT CHECK(odeme_sekli IN ('Banka', 'Nakit')),
+                            banka_hesap_id INTEGER,
+                            FOREIGN KEY (banka_hesap_id) REFERENCES banka_hesaplari(id))''')
+
+            # Banka hesapları tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS banka_hesaplari (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            banka_adi TEXT,
+                            sube_adi TEXT,
+                            hesap_no TEXT,
+                            iban TEXT,
+                            aciklama TEXT)''')
+
+            # Banka hareketleri tablosu
+            cursor.execute('''CREATE TABLE IF NOT EXISTS banka_hareketleri (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            hesap_id INTEGER,
+                            tarih TEXT,
+                            tutar INTEGER,
+                            hareket_tipi TEXT CHECK(hareket_tipi IN ('Gelir', 'Gider')),
+                            aciklama TEXT,
+                            FOREIGN KEY (hesap_id) REFERENCES banka_hesaplari(id))''')
+
+            # Banka gelirinden oluşturulan aidat ödemeleri (mutabakat)
+            cursor.execute('''CREATE TABLE IF NOT EXISTS mutabakat_eslesmeleri (
+                            hareket_id INTEGER NOT NULL,
+                            odeme_id INTEGER NOT NULL,
+                            PRIMARY KEY (hareket_id, odeme_id)) WITHOUT ROWID''')
+
+            # Hesap bazında günlük bakiye defteri
+            create_bakiye_defteri(cursor)
+
+            # Raporlar için aylık özet tablosu
+            create_aylik_ozet(cursor)
+        return True
     except Exception as e:
         print(f"Veritabanı tabloları oluşturma hatası: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+        return False
+
+def migrate_aidatlar(cursor):
+    """Ay başına sütunlu aidatlar tablosunu aidat_tarifeleri tablosuna taşır
+
+    Eski kodun okuyup yazabilmesi için aynı adla bir görünüm ve INSTEAD OF
+    tetikleyicileri oluşturulur.
+    """
+    cursor.execute("SELECT type FROM sqlite_master WHERE name='aidatlar'")
+    row = cursor.fetchone()
+
+    if row and row[0] == "table":
+        cursor.execute(
+            "INSERT OR REPLACE INTO aidat_tarifeleri (yil, ay_no, tutar) "
+            + " UNION ALL ".join(
+                f"SELECT yil, {i}, COALESCE({ay}, 0) FROM aidatlar WHERE yil IS NOT NULL"
+                for i, ay in enumerate(AY_ISIMLERI, start=1)
+            )
+        )
+        cursor.execute("DROP TABLE aidatlar")
+
+    cursor.execute(f"CREATE VIEW IF NOT EXISTS aidatlar AS {AIDAT_PIVOT_SQL} GROUP BY yil")
+
+    new_rows = " UNION ALL ".join(
+        f"SELECT NEW.yil, {i}, COALESCE(NEW.{ay}, 0)" for i, ay in enumerate(AY_ISIMLERI, start=1)
+    )
+    cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS aidatlar_insert
+                      INSTEAD OF INSERT ON aidatlar
+                      BEGIN
+                          INSERT INTO aidat_tarifeleri (yil, ay_no, tutar) {new_rows};
+                      END''')
+    cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS aidatlar_update
+                      INSTEAD OF UPDATE ON aidatlar
+                      BEGIN
+                          DELETE FROM aidat_tarifeleri WHERE yil = OLD.yil;
+                          INSERT INTO aidat_tarifeleri (yil, ay_no, tutar) {new_rows};
+                      END''')
+    cursor.execute('''CREATE TRIGGER IF NOT EXISTS aidatlar_delete
+                      INSTEAD OF DELETE ON aidatlar
+                      BEGIN
+                          DELETE FROM aidat_tarifeleri WHERE yil = OLD.yil;
+                      END''')
+
+def _bakiye_sql(ref, sign):
+    """Bir hareketin (NEW/OLD) bakiye defterine etkisini uygulayan SQL"""
+    hesap = f"COALESCE({ref}.hesap_id, 0)"
+    gun = f"COALESCE(substr({ref}.tarih, 1, 10), '')"
+    tutar = f"{sign}COALESCE({ref}.tutar, 0)"
+    return f'''
+        INSERT OR IGNORE INTO banka_bakiye_gunluk (hesap_id, tarih, bakiye)
+        VALUES ({hesap}, {gun}, COALESCE((SELECT bakiye FROM banka_bakiye_gunluk
+                                          WHERE hesap_id = {hesap} AND tarih < {gun}
+                                          ORDER BY tarih DESC LIMIT 1), 0));
+        UPDATE banka_bakiye_gunluk SET
+            gelir = gelir + CASE WHEN tarih = {gun} AND {ref}.hareket_tipi = 'Gelir' THEN {tutar} ELSE 0 END,
+            gider = gider + CASE WHEN tarih = {gun} AND {ref}.hareket_tipi = 'Gider' THEN {tutar} ELSE 0 END,
+            bakiye = bakiye + CASE {ref}.hareket_tipi WHEN 'Gelir' THEN {tutar}
+                                                      WHEN 'Gider' THEN -({tutar}) ELSE 0 END
+        WHERE hesap_id = {hesap} AND tarih >= {gun};'''
+
+def create_bakiye_defteri(cursor):
+    """Banka hareketlerinden beslenen günlük bakiye defterini oluşturur
+
+    Her (hesap, gün) satırı o günün gelir/gider toplamını ve gün sonu
+    bakiyesini tutar. Tetikleyiciler her yazmada ilgili günü ve sonraki
+    günlerin bakiyesini günceller; böylece herhangi bir tarihteki bakiye tek
+    satırlık bir indeks aramasıdır.
+    """
+    cursor.execute('''CREATE TABLE IF NOT EXISTS banka_bakiye_gunluk (
+                    hesap_id INTEGER NOT NULL,
+                    tarih TEXT NOT NULL,
+                    gelir INTEGER NOT NULL DEFAULT 0,
+                    gider INTEGER NOT NULL DEFAULT 0,
+                    bakiye INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (hesap_id, tarih)) WITHOUT ROWID''')
+
+    cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS banka_hareketleri_bakiye_ekle
+                      AFTER INSERT ON banka_hareketleri
+                      BEGIN {_bakiye_sql("NEW", "")}
+                      END''')
+    cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS banka_hareketleri_bakiye_sil
+                      AFTER DELETE ON banka_hareketleri
+                      BEGIN {_bakiye_sql("OLD", "-")}
+                      END''')
+    cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS banka_hareketleri_bakiye_guncelle
+                      AFTER UPDATE OF hesap_id, tarih, tutar, hareket_tipi ON banka_hareketleri
+                      BEGIN {_bakiye_sql("OLD", "-")} {_bakiye_sql("NEW", "")}
+                      END''')
+
+    # Defter yeni oluşturulduysa mevcut hareketlerden doldur
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM banka_bakiye_gunluk), "
+                   "EXISTS (SELECT 1 FROM banka_hareketleri)")
+    defter_dolu, hareket_var = cursor.fetchone()
+    if hareket_var and not defter_dolu:
+        _rebuild_bakiye_defteri(cursor)
+
+# Ham hareketlerden beklenen günlük defter
+_BEKLENEN_BAKIYE_SQL = '''
+    WITH gunluk AS (
+        SELECT COALESCE(hesap_id, 0) AS hesap_id,
+               COALESCE(substr(tarih, 1, 10), '') AS tarih,
+               SUM(CASE WHEN hareket_tipi = 'Gelir' THEN COALESCE(tutar, 0) ELSE 0 END) AS gelir,
+               SUM(CASE WHEN hareket_tipi = 'Gider' THEN COALESCE(tutar, 0) ELSE 0 END) AS gider
+        FROM banka_hareketleri
+        GROUP BY 1, 2
+    )
+    SELECT hesap_id, tarih, gelir, gider,
+           SUM(gelir - gider) OVER (PARTITION BY hesap_id ORDER BY tarih) AS bakiye
+    FROM gunluk
+'''
+
+def _rebuild_bakiye_defteri(cursor):
+    cursor.execute("DELETE FROM banka_bakiye_gunluk")
+    cursor.execute("INSERT INTO banka_bakiye_gunluk (hesap_id, tarih, gelir, gider, bakiye) "
+                   + _BEKLENEN_BAKIYE_SQL)
+
+def _ay_no_sql(expr):
+    """aidat_odemeleri.ay değerini (ay adı ya da numarası) 1-12 arası sayıya çevirir"""
+    cases = " ".join(f"WHEN '{ay}' THEN {i}" for i, ay in enumerate(AY_ISIMLERI, start=1))
+    return f"(CASE lower({expr}) {cases} ELSE COALESCE(CAST({expr} AS INTEGER), 0) END)"
+
+def _tarih_yil_sql(expr):
+    return f"COALESCE(CAST(substr({expr}, 1, 4) AS INTEGER), 0)"
+
+def _tarih_ay_sql(expr):
+    return f"COALESCE(CAST(substr({expr}, 6, 2) AS INTEGER), 0)"
+
+# Kaynak tablo -> (yıl ifadesi, ay ifadesi, {özet sütunu: tutar ifadesi}); "{r}" NEW/OLD olur
+AYLIK_OZET_KAYNAKLARI = {
+    "aidat_odemeleri": (
+        "COALESCE({r}.yil, 0)", _ay_no_sql("{r}.ay"),
+        {"tahsil_edilen": "COALESCE({r}.tutar, 0)"},
+    ),
+    "giderler": (
+        _tarih_yil_sql("{r}.odeme_tarihi"), _tarih_ay_sql("{r}.odeme_tarihi"),
+        {"gider_banka": "CASE WHEN {r}.odeme_sekli = 'Banka' THEN COALESCE({r}.tutar, 0) ELSE 0 END",
+         "gider_nakit": "CASE WHEN {r}.odeme_sekli = 'Nakit' THEN COALESCE({r}.tutar, 0) ELSE 0 END"},
+    ),
+    "banka_hareketleri": (
+        _tarih_yil_sql("{r}.tarih"), _tarih_ay_sql("{r}.tarih"),
+        {"banka_gelir": "CASE WHEN {r}.hareket_tipi = 'Gelir' THEN COALESCE({r}.tutar, 0) ELSE 0 END",
+         "banka_gider": "CASE WHEN {r}.hareket_tipi = 'Gider' THEN COALESCE({r}.tutar, 0) ELSE 0 END"},
+    ),
+}
+
+def _aylik_ozet_sql(table, ref, sign):
+    """Bir satırın (NEW/OLD) aylık özete etkisini uygulayan UPSERT"""
+    yil, ay, columns = AYLIK_OZET_KAYNAKLARI[table]
+    names = ", ".join(columns)
+    values = ", ".join(f"{sign}({expr.format(r=ref)})" for expr in columns.values())
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in columns)
+    return (f"INSERT INTO aylik_ozet (yil, ay_no, {names}) "
+            f"VALUES ({yil.format(r=ref)}, {ay.format(r=ref)}, {values}) "
+            f"ON CONFLICT (yil, ay_no) DO UPDATE SET {updates};")
+
+OZET_TETIKLEYICILERI = tuple(
+    f"{table}_ozet_{event}" for table in AYLIK_OZET_KAYNAKLARI for event in ("ekle", "sil", "guncelle")
+)
+
+def create_aylik_ozet(cursor):
+    """Aylık toplamları tutan özet tablosunu ve tetikleyicilerini oluşturur
+
+    Aidat, gider ve banka raporları ham satırları taramak yerine bu tablodan
+    okur. Tutarlar aidat_odemeleri, giderler ve banka_hareketleri üzerindeki
+    tetikleyicilerle eklenip çıkarılır.
+    """
+    cursor.execute('''CREATE TABLE IF NOT EXISTS aylik_ozet (
+                    yil INTEGER NOT NULL,
+                    ay_no INTEGER NOT NULL,
+                    tahsil_edilen INTEGER NOT NULL DEFAULT 0,
+                    gider_banka INTEGER NOT NULL DEFAULT 0,
+                    gider_nakit INTEGER NOT NULL DEFAULT 0,
+                    banka_gelir INTEGER NOT NULL DEFAULT 0,
+                    banka_gider INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (yil, ay_no)) WITHOUT ROWID''')
+
+    for table in AYLIK_OZET_KAYNAKLARI:
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_ozet_ekle
+                          AFTER INSERT ON {table}
+                          BEGIN {_aylik_ozet_sql(table, "NEW", "")} END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_ozet_sil
+                          AFTER DELETE ON {table}
+                          BEGIN {_aylik_ozet_sql(table, "OLD", "-")} END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_ozet_guncelle
+                          AFTER UPDATE ON {table}
+                          BEGIN {_aylik_ozet_sql(table, "OLD", "-")} {_aylik_ozet_sql(table, "NEW", "")} END''')
+
+    # Özet yeni oluşturulduysa mevcut verilerden doldur
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM aylik_ozet)")
+    if not cursor.fetchone()[0]:
+        _rebuild_aylik_ozet(cursor)
+
+def _beklenen_aylik_ozet_sql():
+    columns = ("tahsil_edilen", "gider_banka", "gider_nakit", "banka_gelir", "banka_gider")
+    parts = []
+    for table, (yil, ay, sources) in AYLIK_OZET_KAYNAKLARI.items():
+        values = ", ".join(
+            f"{sources[col].format(r=table)} AS {col}" if col in sources else f"0 AS {col}"
+            for col in columns
+        )
+        parts.append(f"SELECT {yil.format(r=table)} AS yil, {ay.format(r=table)} AS ay_no, "
+                     f"{values} FROM {table}")
+    sums = ", ".join(f"SUM({col}) AS {col}" for col in columns)
+    return (f"SELECT yil, ay_no, {sums} FROM ({' UNION ALL '.join(parts)}) "
+            f"GROUP BY yil, ay_no")
+
+def _rebuild_aylik_ozet(cursor):
+    cursor.execute("DELETE FROM aylik_ozet")
+    cursor.execute("INSERT INTO aylik_ozet (yil, ay_no, tahsil_edilen, gider_banka, gider_nakit, "
+                   "banka_gelir, banka_gider) " + _beklenen_aylik_ozet_sql())
+
+# Toplu yazmada geçici olarak kaldırılan türetilmiş veri tetikleyicileri
+BAKIYE_TETIKLEYICILERI = (
+    "banka_hareketleri_bakiye_ekle",
+    "banka_hareketleri_bakiye_sil",
+    "banka_hareketleri_bakiye_guncelle",
+)
+
+# (tetikleyiciler, oluşturma, yeniden hesaplama)
+TURETILMIS_TABLOLAR = (
+    (BAKIYE_TETIKLEYICILERI, lambda cursor: create_bakiye_defteri(cursor),
+     lambda cursor: _rebuild_bakiye_defteri(cursor)),
+    (OZET_TETIKLEYICILERI, lambda cursor: create_aylik_ozet(cursor),
+     lambda cursor: _rebuild_aylik_ozet(cursor)),
+)
+
+# Güncelleme ve silmelerde sayacı artan tablolar. Eklemeler sayılmaz: artan
+# id'den (rowid) izlenir. Okuma tarafında önbellekler (analytics) sayaç
+# değişmediyse yalnızca son görülen id'den sonraki satırları yükler.
+DEGISIKLIK_KAYNAKLARI = ("aidat_odemeleri", "giderler", "banka_hareketleri")
+
+def create_degisiklik_sayaclari(cursor):
+    """Tablo başına değişiklik sayacını ve güncelle/sil tetikleyicilerini oluşturur"""
+    cursor.execute('''CREATE TABLE IF NOT EXISTS degisiklik_sayaclari (
+                    tablo TEXT PRIMARY KEY,
+                    sayac INTEGER NOT NULL) WITHOUT ROWID''')
+    for table in DEGISIKLIK_KAYNAKLARI:
+        for event in ("UPDATE", "DELETE"):
+            cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_degisiklik_{event.lower()}
+                              AFTER {event} ON {table}
+                              BEGIN
+                                  INSERT INTO degisiklik_sayaclari (tablo, sayac) VALUES ('{table}', 1)
+                                  ON CONFLICT (tablo) DO UPDATE SET sayac = sayac + 1;
+                              END''')
+
+def read_degisiklik_sayaclari(cursor):
+    """{tablo: sayaç}; hiç güncelleme/silme görmemiş tablolar 0"""
+    sayaclar = dict.fromkeys(DEGISIKLIK_KAYNAKLARI, 0)
+    sayaclar.update((row[0], row[1]) for row in cursor.execute("SELECT tablo, sayac FROM degisiklik_sayaclari"))
+    return sayaclar
+
+@contextmanager
+def bulk_write():
+    """Toplu yazma için bağlantı verir
+
+    Türetilmiş tabloları (bakiye defteri, aylık özet) satır satır güncelleyen
+    tetikleyiciler kaldırılır, yazma bitince tablolar tek seferde yeniden
+    hesaplanır ve tetikleyiciler geri eklenir. Her şey tek bir işlem
+    içindedir; içeride commit yapılmamalıdır. Eklenen satırlar arama
+    dizinine sonda alınır (bkz. search.deferred_indexing). Hata olursa
+    tetikleyiciler dahil her şey geri alınır.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if not conn.in_transaction:
+            cursor.execute("BEGIN")
+        for triggers, _, _ in TURETILMIS_TABLOLAR:
+            for name in triggers:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+        # Arama dizini yeniden oluşturulmaz; yalnızca eklenen satırlar sonda dizine alınır
+        with deferred_indexing(cursor, *ARAMA_KAYNAKLARI):
+            yield conn
+
+        for _, create, rebuild in TURETILMIS_TABLOLAR:
+            rebuild(cursor)
+            create(cursor)
+
+def insert_banka_hareketleri_batch(cursor, source_table):
+    """source_table'daki hareketleri ekler, türetilmiş tabloları küme halinde günceller
+
+    source_table (hesap_id, tarih, tutar, hareket_tipi, aciklama) sütunlarına
+    sahip olmalıdır. Satır başına çalışan bakiye ve özet tetikleyicileri bu
+    işlem süresince kaldırılır; bunun yerine gün ve ay bazında toplanmış
+    farklar tek seferde uygulanır. Geçmiş tarihli büyük ekstrelerde satır
+    başına sonraki tüm günleri güncelleme maliyeti böylece ortadan kalkar.
+    Çağıran açık bir işlem içinde olmalıdır. Eklenen satır sayısını döndürür.
+    """
+    triggers = BAKIYE_TETIKLEYICILERI + tuple(
+        name for name in OZET_TETIKLEYICILERI if name.startswith("banka_hareketleri_")
+    )
+    for name in triggers:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    with deferred_indexing(cursor, "banka_hareketleri"):
+        cursor.execute(f"INSERT INTO banka_hareketleri (hesap_id, tarih, tutar, hareket_tipi, aciklama) "
+                       f"SELECT hesap_id, tarih, tutar, hareket_tipi, aciklama FROM {source_table} "
+                       f"ORDER BY rowid")
+        inserted = cursor.rowcount
+
+    # Gün bazında farklar
+    cursor.execute("DROP TABLE IF EXISTS temp.gun_farki")
+    cursor.execute(f'''CREATE TEMP TABLE gun_farki AS
+                      SELECT COALESCE(hesap_id, 0) AS hesap_id,
+                             COALESCE(substr(tarih, 1, 10), '') AS tarih,
+                             SUM(CASE WHEN hareket_tipi = 'Gelir' THEN COALESCE(tutar, 0) ELSE 0 END) AS gelir,
+                             SUM(CASE WHEN hareket_tipi = 'Gider' THEN COALESCE(tutar, 0) ELSE 0 END) AS gider
+                      FROM {source_table}
+                      GROUP BY 1, 2''')
+    cursor.execute("CREATE UNIQUE INDEX temp.gun_farki_idx ON gun_farki(hesap_id, tarih)")
+
+    # Defterde olmayan günler, önceki günün (değişmeden önceki) bakiyesiyle açılır
+    cursor.execute('''INSERT OR IGNORE INTO banka_bakiye_gunluk (hesap_id, tarih, bakiye)
+                      SELECT f.hesap_id, f.tarih,
+                             COALESCE((SELECT d.bakiye FROM banka_bakiye_gunluk d
+                                       WHERE d.hesap_id = f.hesap_id AND d.tarih < f.tarih
+                                       ORDER BY d.tarih DESC LIMIT 1), 0)
+                      FROM gun_farki f''')
+
+    # Etkilenen her güne kendi farkı, bakiyeye o güne kadarki toplam fark eklenir
+    cursor.execute('''UPDATE banka_bakiye_gunluk AS d SET
+                          gelir = d.gelir + COALESCE((SELECT f.gelir FROM gun_farki f
+                                                      WHERE f.hesap_id = d.hesap_id AND f.tarih = d.tarih), 0),
+                          gider = d.gider + COALESCE((SELECT f.gider FROM gun_farki f
+                                                      WHERE f.hesap_id = d.hesap_id AND f.tarih = d.tarih), 0),
+                          bakiye = d.bakiye + (SELECT COALESCE(SUM(f.gelir - f.gider), 0) FROM gun_farki f
+                                               WHERE f.hesap_id = d.hesap_id AND f.tarih <= d.tarih)
+                      WHERE d.hesap_id IN (SELECT hesap_id FROM gun_farki)
+                        AND d.tarih >= (SELECT MIN(f.tarih) FROM gun_farki f WHERE f.hesap_id = d.hesap_id)''')
+    cursor.execute("DROP TABLE temp.gun_farki")
+
+    # Ay bazında özet farkları
+    yil, ay, columns = AYLIK_OZET_KAYNAKLARI["banka_hareketleri"]
+    names = ", ".join(columns)
+    sums = ", ".join(f"SUM({expr.format(r='k')}) AS {name}" for name, expr in columns.items())
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in columns)
+    cursor.execute(f"INSERT INTO aylik_ozet (yil, ay_no, {names}) "
+                   f"SELECT * FROM (SELECT {yil.format(r='k')}, {ay.format(r='k')}, {sums} "
+                   f"FROM {source_table} AS k GROUP BY 1, 2) WHERE true "
+                   f"ON CONFLICT (yil, ay_no) DO UPDATE SET {updates}")
+
+    create_bakiye_defteri(cursor)
+    create_aylik_ozet(cursor)
+    return inserted
+
+def read_setting(cursor, anahtar, varsayilan=None):
+    """sistem_ayarlari tablosundan bir değer okur"""
+    cursor.execute("SELECT deger FROM sistem_ayarlari WHERE anahtar=?", (anahtar,))
+    row = cursor.fetchone()
+    return row[0] if row else varsayilan
+
+def write_setting(cursor, anahtar, deger):
+    """sistem_ayarlari tablosuna bir değer yazar"""
+    cursor.execute(
+        "INSERT OR REPLACE INTO sistem_ayarlari (anahtar, deger) VALUES (?, ?)",
+        (anahtar, str(deger))
+    )
+
+def create_indexes():
+    """İkincil indeksleri sürümlerine göre oluşturur
+
+    Kayıtlı indeks sürümü INDEX_VERSION ile aynıysa hiçbir şey yapılmaz; aksi
+    halde artık listede olmayan idx_* indeksleri silinir, eksikler oluşturulur.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''CREATE TABLE IF NOT EXISTS sistem_ayarlari (
+                            anahtar TEXT PRIMARY KEY,
+                            deger TEXT)''')
+
+            if read_setting(cursor, "index_version") == str(INDEX_VERSION):
+                return
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx\\_%' ESCAPE '\\'")
+            for (name,) in cursor.fetchall():
+                if name not in INDEXES:
+                    cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+            for name, definition in INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+            # Sorgu planlayıcısı için istatistikleri güncelle
+            cursor.execute("ANALYZE")
+            write_setting(cursor, "index_version", INDEX_VERSION)
+    except Exception as e:
+        print(f"İndeks oluşturma hatası: {str(e)}")
 
 def create_user_table():
     """Kullanıcılar tablosunu oluşturur"""
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS kullanicilar (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    kullanici_adi TEXT UNIQUE,
-                    sifre TEXT,
-                    rol TEXT CHECK(rol IN ('yönetici', 'sakin')),
-                    uye_id INTEGER,
-                    FOREIGN KEY (uye_id) REFERENCES uyeler(id)
-                )''')
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''CREATE TABLE IF NOT EXISTS kullanicilar (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kullanici_adi TEXT UNIQUE,
+                        sifre TEXT,
+                        rol TEXT CHECK(rol IN ('yönetici', 'sakin')),
+                        uye_id INTEGER,
+                        FOREIGN KEY (uye_id) REFERENCES uyeler(id)
+                    )''')
 
 def create_default_admin():
     """Varsayılan yönetici hesabını oluşturur"""
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM kullanicilar WHERE rol='yönetici'")
-        admin = cursor.fetchone()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM kullanicilar WHERE rol='yönetici'")
+            admin = cursor.fetchone()
 
-        if not admin:
-            # Varsayılan yönetici hesabı
-            hashed_password = bcrypt.hashpw("admin123".encode('utf-8'), bcrypt.gensalt())
-            cursor.execute(
-                "INSERT INTO kullanicilar (kullanici_adi, sifre, rol) VALUES (?, ?, ?)",
-                ("admin", hashed_password, "yönetici")
-            )
-            conn.commit()
-            print("Varsayılan yönetici hesabı oluşturuldu!")
+            if not admin:
+                # Varsayılan yönetici hesabı; bcrypt yalnızca burada ve girişte yüklenir
+                from auth import hash_password, load_bcrypt_cost
+                hashed_password = hash_password("admin123", load_bcrypt_cost(cursor))
+                cursor.execute(
+                    "INSERT INTO kullanicilar (kullanici_adi, sifre, rol) VALUES (?, ?, ?)",
+                    ("admin", hashed_password, "yönetici")
+                )
+                print("Varsayılan yönetici hesabı oluşturuldu!")
     except Exception as e:
         print(f"Yönetici hesabı oluşturma hatası: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
-def get_table_data(table_name, conditions=None):
-    """Belirtilen tablodan veri alır"""
-    conn = None
+# get_table_data ile okunabilen tablolar ve filtrelenebilir sütunları (tipleriyle).
+# kullanicilar (şifre özetleri) bilerek yoktur.
+TABLO_SUTUNLARI = {
+    "apartman": {"id": int, "adi": str, "yonetici": str, "Tel": str, "yardimci": str,
+                 "denetci": str, "adres": str},
+    "uyeler": {"id": int, "daire_no": int, "adi_soyadi": str, "telefon": str,
+               "kat_maliki_durumu": str, "apartman": str, "email": str},
+    "aidat_tarifeleri": {"yil": int, "ay_no": int, "tutar": int},
+    "aidatlar": dict({"id": int, "yil": int, "toplam": int}, **dict.fromkeys(AY_ISIMLERI, int)),
+    "aidat_odemeleri": {"id": int, "uye_id": int, "yil": int, "ay": str, "odeme_tarihi": str,
+                        "tutar": int, "aciklama": str},
+    "giderler": {"id": int, "odeme_tarihi": str, "tutar": int, "aciklama": str, "odeme_sekli": str,
+                 "banka_hesap_id": int},
+    "banka_hesaplari": {"id": int, "banka_adi": str, "sube_adi": str, "hesap_no": str, "iban": str,
+                        "aciklama": str},
+    "banka_hareketleri": {"id": int, "hesap_id": int, "tarih": str, "tutar": int, "hareket_tipi": str,
+                          "aciklama": str},
+    "mutabakat_eslesmeleri": {"hareket_id": int, "odeme_id": int},
+}
+
+def get_table_data(table_name, conditions=None, order_by=(), limit=None, row_format=RECORD):
+    """Belirtilen tablodan veri alır
+
+    conditions query.where(...) ile oluşturulan bir Filter'dır, örn.
+    get_table_data("uyeler", where(daire_no=12)). Tablo ve sütun adları
+    TABLO_SUTUNLARI ile sınırlıdır; değerler parametre olarak bağlanır.
+    row_format records.ROW_FORMATS'tan biridir (bkz. records.py).
+    """
+    columns = TABLO_SUTUNLARI.get(table_name)
+    if columns is None:
+        raise ValueError(f"Geçersiz tablo adı: {table_name}")
+    if conditions is not None and not isinstance(conditions, Filter):
+        raise TypeError("conditions query.where(...) ile oluşturulmalı; ham SQL koşulu kabul edilmez")
+    query, params = compile_select(table_name, columns, conditions, order_by, limit)
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        if conditions:
-            query = f"SELECT * FROM {table_name} WHERE {conditions}"
-        else:
-            query = f"SELECT * FROM {table_name}"
-            
-        cursor.execute(query)
-        return cursor.fetchall()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return fetch_all(cursor, row_format, table_name)
     except Exception as e:
         print(f"Veri alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
+@cached("uyeler")
 def get_all_uyeler():
     """Tüm üyeleri alır"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM uyeler ORDER BY daire_no")
-        return cursor.fetchall()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM uyeler ORDER BY daire_no")
+            return cursor.fetchall()
     except Exception as e:
         print(f"Üye verileri alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
+@cached("banka_hesaplari")
 def get_all_banka_hesaplari():
     """Tüm banka hesaplarını alır"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM banka_hesaplari")
-        return cursor.fetchall()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM banka_hesaplari")
+            return cursor.fetchall()
     except Exception as e:
         print(f"Banka hesapları alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
+@cached("aidat_tarifeleri", "aidatlar")
 def get_aidat_for_year(year):
     """Belirli yıl için aidat tutarlarını alır"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM aidatlar WHERE yil=?", (year,))
-        return cursor.fetchone()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"{AIDAT_PIVOT_SQL} WHERE yil=? GROUP BY yil", (year,))
+            return cursor.fetchone()
     except Exception as e:
         print(f"Aidat verileri alma hatası: {str(e)}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
-def get_aidat_odemeler_by_uye(uye_id, year=None):
-    """Bir üyenin aidat ödemelerini alır"""
-    conn = None
+def get_aidat_tarifeleri(start_year, start_month=1, end_year=None, end_month=12):
+    """Verilen ay aralığındaki aylık aidat tutarlarını (yil, ay_no, tutar) alır
+
+    Aralık yıllar arasında olabilir; tek bir indeksli sorgu ile okunur.
+    """
+    if end_year is None:
+        end_year = start_year
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        if year:
+        with get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM aidat_odemeleri WHERE uye_id=? AND yil=? ORDER BY odeme_tarihi DESC", 
-                (uye_id, year)
+                "SELECT yil, ay_no, tutar FROM aidat_tarifeleri "
+                "WHERE (yil, ay_no) >= (?, ?) AND (yil, ay_no) <= (?, ?) "
+                "ORDER BY yil, ay_no",
+                (start_year, start_month, end_year, end_month)
             )
-        else:
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Aidat tarifesi alma hatası: {str(e)}")
+        return []
+
+def get_aidat_tutari(year, month):
+    """Belirli yıl ve ay için aidat tutarını döndürür (tanımlı değilse 0)"""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM aidat_odemeleri WHERE uye_id=? ORDER BY odeme_tarihi DESC", 
-                (uye_id,)
+                "SELECT tutar FROM aidat_tarifeleri WHERE yil=? AND ay_no=?",
+                (year, month)
             )
+            row = cursor.fetchone()
+            return row[0] if row else 0
+    except Exception as e:
+        print(f"Aidat tutarı alma hatası: {str(e)}")
+        return 0
+
+def get_aidat_odemeler_by_uye(uye_id, year=None, row_format=RECORD):
+    """Bir üyenin aidat ödemelerini alır"""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+        
+            if year:
+                cursor.execute(
+                    "SELECT * FROM aidat_odemeleri WHERE uye_id=? AND yil=? ORDER BY odeme_tarihi DESC", 
+                    (uye_id, year)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM aidat_odemeleri WHERE uye_id=? ORDER BY odeme_tarihi DESC", 
+                    (uye_id,)
+                )
             
-        return cursor.fetchall()
+            return fetch_all(cursor, row_format, "aidat_odemeleri")
     except Exception as e:
         print(f"Aidat ödemeleri alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
-def get_banka_hareketleri(hesap_id=None, start_date=None, end_date=None):
+def get_banka_hareketleri(hesap_id=None, start_date=None, end_date=None, row_format=RECORD):
     """Banka hareketlerini alır, isteğe bağlı filtrelerle"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        query = "SELECT * FROM banka_hareketleri"
-        params = []
+            query = "SELECT * FROM banka_hareketleri"
+            params = []
         
-        conditions = []
-        if hesap_id:
-            conditions.append("hesap_id=?")
-            params.append(hesap_id)
+            conditions = []
+            if hesap_id:
+                conditions.append("hesap_id=?")
+                params.append(hesap_id)
         
-        if start_date:
-            conditions.append("tarih>=?")
-            params.append(start_date)
+            if start_date:
+                conditions.append("tarih>=?")
+                params.append(start_date)
         
-        if end_date:
-            conditions.append("tarih<=?")
-            params.append(end_date)
+            if end_date:
+                conditions.append("tarih<=?")
+                params.append(end_date)
         
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY tarih DESC"
+            query += " ORDER BY tarih DESC"
         
-        cursor.execute(query, params)
-        return cursor.fetchall()
+            cursor.execute(query, params)
+            return fetch_all(cursor, row_format, "banka_hareketleri")
     except Exception as e:
         print(f"Banka hareketleri alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
-def get_giderler(start_date=None, end_date=None):
+def get_giderler(start_date=None, end_date=None, row_format=RECORD):
     """Giderleri alır, isteğe bağlı tarih filtresi ile"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        query = "SELECT g.*, b.banka_adi FROM giderler g LEFT JOIN banka_hesaplari b ON g.banka_hesap_id = b.id"
-        params = []
+            query = "SELECT g.*, b.banka_adi FROM giderler g LEFT JOIN banka_hesaplari b ON g.banka_hesap_id = b.id"
+            params = []
         
-        conditions = []
-        if start_date:
-            conditions.append("g.odeme_tarihi>=?")
-            params.append(start_date)
+            conditions = []
+            if start_date:
+                conditions.append("g.odeme_tarihi>=?")
+                params.append(start_date)
         
-        if end_date:
-            conditions.append("g.odeme_tarihi<=?")
-            params.append(end_date)
+            if end_date:
+                conditions.append("g.odeme_tarihi<=?")
+                params.append(end_date)
         
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY g.odeme_tarihi DESC"
+            query += " ORDER BY g.odeme_tarihi DESC"
         
-        cursor.execute(query, params)
-        return cursor.fetchall()
+            cursor.execute(query, params)
+            return fetch_all(cursor, row_format, "giderler")
     except Exception as e:
         print(f"Gider verileri alma hatası: {str(e)}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
+@cached("apartman")
 def get_apartman_bilgileri():
     """Apartman bilgilerini alır"""
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM apartman WHERE id=1")
-        return cursor.fetchone()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM apartman WHERE id=1")
+            return cursor.fetchone()
     except Exception as e:
         print(f"Apartman bilgileri alma hatası: {str(e)}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+def get_dashboard_ozeti(year, month):
+    """Ana sayfa özetini tek sorguda alır
+
+    Toplam borç daire bazında hesaplanır: her dairenin o ayki eksik ödemesi
+    toplanır, fazla ödeme başka dairenin borcunu kapatmaz.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                WITH tarife AS MATERIALIZED (
+                    SELECT COALESCE((SELECT tutar FROM aidat_tarifeleri
+                                     WHERE yil = :yil AND ay_no = :ay_no), 0) AS aidat_tutari
+                ),
+                odenen AS MATERIALIZED (
+                    SELECT uye_id, SUM(tutar) AS tutar
+                    FROM aidat_odemeleri
+                    WHERE yil = :yil AND ay = :ay
+                    GROUP BY uye_id
+                ),
+                odeyen AS (
+                    -- Yalnızca ödeme yapan daireler; geri kalanların borcu tam aidattır
+                    SELECT COUNT(*) AS sayi,
+                           COALESCE(SUM(MIN(odenen.tutar, tarife.aidat_tutari)), 0) AS kapanan,
+                           COALESCE(SUM(odenen.tutar >= tarife.aidat_tutari), 0) AS tam_odeyen
+                    FROM odenen
+                    JOIN uyeler ON uyeler.id = odenen.uye_id
+                    CROSS JOIN tarife
+                ),
+                daire AS (
+                    SELECT COUNT(*) AS uye_sayisi FROM uyeler
+                )
+                SELECT
+                    EXISTS (SELECT 1 FROM apartman WHERE id = 1) AS apartman_kayitli,
+                    (SELECT adi FROM apartman WHERE id = 1) AS apartman_adi,
+                    (SELECT yonetici FROM apartman WHERE id = 1) AS yonetici,
+                    daire.uye_sayisi,
+                    tarife.aidat_tutari,
+                    (SELECT COALESCE(SUM(tutar), 0) FROM odenen) AS odenen_toplam,
+                    tarife.aidat_tutari * daire.uye_sayisi - odeyen.kapanan AS toplam_borc,
+                    CASE WHEN tarife.aidat_tutari > 0
+                         THEN daire.uye_sayisi - odeyen.tam_odeyen ELSE 0 END AS borclu_daire_sayisi
+                FROM tarife, daire, odeyen
+            ''', {"yil": year, "ay_no": month, "ay": AY_ISIMLERI[month - 1]})
+            return cursor.fetchone()
+    except Exception as e:
+        print(f"Özet bilgileri alma hatası: {str(e)}")
+        return None
+
+# --- Sayfalı (keyset) erişim ---
+# Sayfalar OFFSET yerine son satırın sıralama anahtarından devam eder; büyük
+# tablolarda her sayfa aynı maliyettedir ve bellek kullanımı sabit kalır.
+
+DEFAULT_PAGE_SIZE = 500
+
+def encode_page_cursor(values):
+    """Sıralama anahtarını opak bir sayfa imlecine çevirir"""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode("utf-8")).decode("ascii")
+
+def decode_page_cursor(page_cursor):
+    """encode_page_cursor ile üretilmiş imleci çözer"""
+    return json.loads(base64.urlsafe_b64decode(page_cursor.encode("ascii")))
+
+def _keyset_page(cursor, select_sql, conditions, params, order_column, id_column,
+                 limit, page_cursor, descending=True, row_format=RECORD, name="Kayit"):
+    """(order_column, id_column) anahtarına göre bir sayfa okur
+
+    (satırlar, sonraki_imleç) döndürür; son sayfada imleç None olur.
+    order_column boş (NULL) olabilir: NULL'lar azalan sırada en sonda, artan
+    sırada en başta gelir.
+    Satırlar row_format biçimindedir (bkz. records.py).
+    """
+    conditions = list(conditions)
+    params = list(params)
+    direction = "DESC" if descending else "ASC"
+    op = "<" if descending else ">"
+
+    if page_cursor:
+        last_order, last_id = decode_page_cursor(page_cursor)
+        if order_column == id_column:
+            conditions.append(f"{id_column} {op} ?")
+            params.append(last_id)
+        elif last_order is None and descending:
+            conditions.append(f"{order_column} IS NULL AND {id_column} < ?")
+            params.append(last_id)
+        elif last_order is None:
+            # Artan sırada NULL'lardan sonra tüm dolu değerler gelir
+            conditions.append(f"(({order_column} IS NULL AND {id_column} > ?) OR {order_column} IS NOT NULL)")
+            params.append(last_id)
+        elif descending:
+            conditions.append(f"(({order_column}, {id_column}) < (?, ?) OR {order_column} IS NULL)")
+            params.extend((last_order, last_id))
+        else:
+            conditions.append(f"({order_column}, {id_column}) > (?, ?)")
+            params.extend((last_order, last_id))
+
+    query = select_sql
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if order_column == id_column:
+        query += f" ORDER BY {id_column} {direction} LIMIT ?"
+    else:
+        query += f" ORDER BY {order_column} {direction}, {id_column} {direction} LIMIT ?"
+    params.append(limit)
+
+    cursor.execute(query, params)
+    rows = fetch_all(cursor, row_format, name)
+    if len(rows) < limit:
+        return rows, None
+
+    # Son satır her biçimde sıra ile okunabilir; sütun adı imleçten alınır
+    names = [d[0] for d in cursor.description]
+    last = rows[-1]
+    return rows, encode_page_cursor((last[names.index(order_column.split(".")[-1])],
+                                     last[names.index(id_column.split(".")[-1])]))
+
+def get_table_data_page(table_name, limit=DEFAULT_PAGE_SIZE, cursor=None, row_format=RECORD):
+    """Tablodan id sırasıyla bir sayfa veri alır: (satırlar, sonraki_imleç)"""
+    if "id" not in TABLO_SUTUNLARI.get(table_name, ()):
+        raise ValueError(f"Geçersiz tablo adı: {table_name}")
+    try:
+        with get_connection() as conn:
+            return _keyset_page(conn.cursor(), f"SELECT * FROM {table_name}", [], [],
+                                "id", "id", limit, cursor, descending=False,
+                                row_format=row_format, name=table_name)
+    except Exception as e:
+        print(f"Veri alma hatası: {str(e)}")
+        return [], None
+
+def get_banka_hareketleri_page(hesap_id=None, start_date=None, end_date=None,
+                               limit=DEFAULT_PAGE_SIZE, cursor=None, row_format=RECORD):
+    """Banka hareketlerinden tarihe göre azalan bir sayfa alır"""
+    conditions = []
+    params = []
+    if hesap_id:
+        conditions.append("hesap_id=?")
+        params.append(hesap_id)
+    if start_date:
+        conditions.append("tarih>=?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("tarih<=?")
+        params.append(end_date)
+
+    try:
+        with get_connection() as conn:
+            return _keyset_page(conn.cursor(), "SELECT * FROM banka_hareketleri",
+                                conditions, params, "tarih", "id", limit, cursor,
+                                row_format=row_format, name="banka_hareketleri")
+    except Exception as e:
+        print(f"Banka hareketleri alma hatası: {str(e)}")
+        return [], None
+
+def get_giderler_page(start_date=None, end_date=None, limit=DEFAULT_PAGE_SIZE, cursor=None,
+                      row_format=RECORD):
+    """Giderlerden ödeme tarihine göre azalan bir sayfa alır"""
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append("g.odeme_tarihi>=?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("g.odeme_tarihi<=?")
+        params.append(end_date)
+
+    try:
+        with get_connection() as conn:
+            return _keyset_page(
+                conn.cursor(),
+                "SELECT g.*, b.banka_adi FROM giderler g LEFT JOIN banka_hesaplari b ON g.banka_hesap_id = b.id",
+                conditions, params, "g.odeme_tarihi", "g.id", limit, cursor,
+                row_format=row_format, name="giderler"
+            )
+    except Exception as e:
+        print(f"Gider verileri alma hatası: {str(e)}")
+        return [], None
+
+def get_aidat_odemeler_by_uye_page(uye_id, year=None, limit=DEFAULT_PAGE_SIZE, cursor=None,
+                                   row_format=RECORD):
+    """Bir üyenin aidat ödemelerinden tarihe göre azalan bir sayfa alır"""
+    conditions = ["uye_id=?"]
+    params = [uye_id]
+    if year:
+        conditions.append("yil=?")
+        params.append(year)
+
+    try:
+        with get_connection() as conn:
+            return _keyset_page(conn.cursor(), "SELECT * FROM aidat_odemeleri",
+                                conditions, params, "odeme_tarihi", "id", limit, cursor,
+                                row_format=row_format, name="aidat_odemeleri")
+    except Exception as e:
+        print(f"Aidat ödemeleri alma hatası: {str(e)}")
+        return [], None
+
+def iter_pages(page_fn, *args, batch_size=1000, **kwargs):
+    """Sayfalı bir erişimciyi baştan sona dolaşır, her seferinde bir grup satır verir
+
+    Her grup ayrı bir sorgudur; gruplar arasında okuma işlemi açık kalmaz.
+    """
+    page_cursor = None
+    while True:
+        rows, page_cursor = page_fn(*args, limit=batch_size, cursor=page_cursor, **kwargs)
+        if rows:
+            yield rows
+        if page_cursor is None:
+            break
+
+def iter_table_data(table_name, batch_size=1000, row_format=RECORD):
+    """Tablonun tüm satırlarını batch_size'lık gruplar halinde verir"""
+    return iter_pages(get_table_data_page, table_name, batch_size=batch_size,
+                      row_format=row_format)
+
+def iter_banka_hareketleri(hesap_id=None, start_date=None, end_date=None, batch_size=1000,
+                           row_format=RECORD):
+    """Banka hareketlerini gruplar halinde verir"""
+    return iter_pages(get_banka_hareketleri_page, hesap_id, start_date, end_date,
+                      batch_size=batch_size, row_format=row_format)
+
+def iter_giderler(start_date=None, end_date=None, batch_size=1000, row_format=RECORD):
+    """Giderleri gruplar halinde verir"""
+    return iter_pages(get_giderler_page, start_date, end_date, batch_size=batch_size,
+                      row_format=row_format)
+
+def iter_aidat_odemeler_by_uye(uye_id, year=None, batch_size=1000, row_format=RECORD):
+    """Bir üyenin aidat ödemelerini gruplar halinde verir"""
+    return iter_pages(get_aidat_odemeler_by_uye_page, uye_id, year, batch_size=batch_size,
+                      row_format=row_format)
+
+# --- Banka bakiyeleri ---
+
+def get_banka_bakiye(hesap_id, tarih=None):
+    """Hesabın verilen gün sonundaki (verilmezse güncel) bakiyesini döndürür"""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            if tarih:
+                cursor.execute(
+                    "SELECT bakiye FROM banka_bakiye_gunluk WHERE hesap_id=? AND tarih<=? "
+                    "ORDER BY tarih DESC LIMIT 1",
+                    (hesap_id, tarih)
+                )
+            else:
+                cursor.execute(
+                    "SELECT bakiye FROM banka_bakiye_gunluk WHERE hesap_id=? "
+                    "ORDER BY tarih DESC LIMIT 1",
+                    (hesap_id,)
+                )
+            row = cursor.fetchone()
+            return row[0] if row else 0
+    except Exception as e:
+        print(f"Bakiye alma hatası: {str(e)}")
+        return 0
+
+def get_banka_bakiyeleri(tarih=None):
+    """Tüm hesapların verilen gün sonundaki (verilmezse güncel) bakiyelerini alır"""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT h.id, h.banka_adi, h.hesap_no,
+                       COALESCE((SELECT d.bakiye FROM banka_bakiye_gunluk d
+                                 WHERE d.hesap_id = h.id AND d.tarih <= :tarih
+                                 ORDER BY d.tarih DESC LIMIT 1), 0) AS bakiye
+                FROM banka_hesaplari h
+                ORDER BY h.id
+            ''', {"tarih": tarih or "9999-12-31"})
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Bakiye alma hatası: {str(e)}")
+        return []
+
+def check_bakiye_defteri(rebuild=False):
+    """Bakiye defterini ham hareketlerden yeniden hesaplayıp karşılaştırır
+
+    Uyuşmayan (hesap_id, tarih, defterdeki, beklenen) satırlarını döndürür.
+    rebuild=True ise uyuşmazlık bulunduğunda defter yeniden oluşturulur.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS temp.beklenen_bakiye")
+            # Defterle aynı tipler ve anahtar: aşağıdaki birleştirmeler anahtar aramasıdır
+            cursor.execute('''CREATE TEMP TABLE beklenen_bakiye (
+                            hesap_id INTEGER NOT NULL,
+                            tarih TEXT NOT NULL,
+                            gelir INTEGER NOT NULL,
+                            gider INTEGER NOT NULL,
+                            bakiye INTEGER NOT NULL,
+                            PRIMARY KEY (hesap_id, tarih)) WITHOUT ROWID''')
+            cursor.execute("INSERT INTO beklenen_bakiye (hesap_id, tarih, gelir, gider, bakiye) "
+                           + _BEKLENEN_BAKIYE_SQL)
+
+            # İki defterde geçen her gün tek satırda karşılaştırılır. Beklenen bakiye
+            # günlük net tutarların yürüyen toplamıdır; beklenen defterde olmayan
+            # günlerde aynı toplam son bakiyeyi ileri taşır. Defterde olmayan gün
+            # (defter NULL) her zaman uyuşmazlıktır.
+            cursor.execute('''
+                WITH gunler AS (
+                    SELECT hesap_id, tarih FROM banka_bakiye_gunluk
+                    UNION
+                    SELECT hesap_id, tarih FROM beklenen_bakiye
+                ),
+                karsilastirma AS (
+                    SELECT g.hesap_id, g.tarih,
+                           d.gelir || '/' || d.gider || '/' || d.bakiye AS defter,
+                           COALESCE(b.gelir, 0) || '/' || COALESCE(b.gider, 0) || '/' ||
+                           SUM(COALESCE(b.gelir - b.gider, 0)) OVER (
+                               PARTITION BY g.hesap_id ORDER BY g.tarih) AS beklenen
+                    FROM gunler g
+                    LEFT JOIN banka_bakiye_gunluk d ON d.hesap_id = g.hesap_id AND d.tarih = g.tarih
+                    LEFT JOIN beklenen_bakiye b ON b.hesap_id = g.hesap_id AND b.tarih = g.tarih
+                )
+                SELECT hesap_id, tarih, defter, beklenen FROM karsilastirma
+                WHERE defter IS NOT beklenen
+            ''')
+            mismatches = cursor.fetchall()
+            cursor.execute("DROP TABLE temp.beklenen_bakiye")
+
+            if mismatches and rebuild:
+                _rebuild_bakiye_defteri(cursor)
+            return mismatches
+    except Exception as e:
+        print(f"Bakiye defteri kontrol hatası: {str(e)}")
+        return []
+
+# --- Aylık özetler ---
+
+def get_aylik_ozet(start_year, end_year=None):
+    """Yıl aralığındaki aylık toplamları aylık özet tablosundan alır
+
+    Beklenen aidat, o ayın tarifesi ile mevcut daire sayısının çarpımıdır.
+    """
+    if end_year is None:
+        end_year = start_year
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                WITH aylar AS (
+                    SELECT yil, ay_no FROM aylik_ozet WHERE yil BETWEEN :bas AND :bit
+                    UNION
+                    SELECT yil, ay_no FROM aidat_tarifeleri WHERE yil BETWEEN :bas AND :bit
+                )
+                SELECT a.yil, a.ay_no,
+                       COALESCE(o.tahsil_edilen, 0) AS tahsil_edilen,
+                       COALESCE(t.tutar, 0) * (SELECT COUNT(*) FROM uyeler) AS beklenen,
+                       COALESCE(o.gider_banka, 0) AS gider_banka,
+                       COALESCE(o.gider_nakit, 0) AS gider_nakit,
+                       COALESCE(o.banka_gelir, 0) AS banka_gelir,
+                       COALESCE(o.banka_gider, 0) AS banka_gider
+                FROM aylar a
+                LEFT JOIN aylik_ozet o ON o.yil = a.yil AND o.ay_no = a.ay_no
+                LEFT JOIN aidat_tarifeleri t ON t.yil = a.yil AND t.ay_no = a.ay_no
+                ORDER BY a.yil, a.ay_no
+            ''', {"bas": start_year, "bit": end_year})
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Aylık özet alma hatası: {str(e)}")
+        return []
+
+def get_yillik_ozet(start_year, end_year=None):
+    """Yıl aralığındaki toplamları yıl bazında alır"""
+    yillar = {}
+    for row in get_aylik_ozet(start_year, end_year):
+        toplam = yillar.setdefault(row["yil"], dict.fromkeys(row.keys()[2:], 0))
+        for key in toplam:
+            toplam[key] += row[key]
+    return [dict(yil=yil, **toplam) for yil, toplam in sorted(yillar.items())]
+
+def check_aylik_ozet(rebuild=False):
+    """Aylık özet tablosunu ham verilerden yeniden hesaplayıp karşılaştırır
+
+    Uyuşmayan (yil, ay_no) satırlarını döndürür; rebuild=True ise
+    uyuşmazlık bulunduğunda tablo yeniden oluşturulur.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            beklenen = _beklenen_aylik_ozet_sql()
+            # Her iki yönde fark: boş (tümü sıfır) özet satırları yok sayılır
+            cursor.execute(f'''
+                SELECT yil, ay_no FROM (
+                    SELECT * FROM ({beklenen})
+                    EXCEPT
+                    SELECT yil, ay_no, tahsil_edilen, gider_banka, gider_nakit,
+                           banka_gelir, banka_gider FROM aylik_ozet
+                    UNION
+                    SELECT * FROM (
+                        SELECT yil, ay_no, tahsil_edilen, gider_banka, gider_nakit,
+                               banka_gelir, banka_gider FROM aylik_ozet
+                        WHERE tahsil_edilen OR gider_banka OR gider_nakit OR banka_gelir OR banka_gider
+                        EXCEPT
+                        SELECT * FROM ({beklenen})
+                    )
+                )
+                GROUP BY yil, ay_no
+                ORDER BY yil, ay_no
+            ''')
+            mismatches = cursor.fetchall()
+            if mismatches and rebuild:
+                _rebuild_aylik_ozet(cursor)
+            return mismatches
+    except Exception as e:
+        print(f"Aylık özet kontrol hatası: {str(e)}")
+        return []
@@ -0,0 +1,172 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox
+
+import connection
+
+class DBExecutor:
+    """Veritabanı işlerini arka plan iş parçacıklarında çalıştırır
+
+    Her iş parçacığı connection modülünden kendi havuzlanmış bağlantısını
+    kullanır. Aynı anahtarla gönderilen yeni bir iş öncekini geçersiz kılar:
+    bekleyen iş iptal edilir, çalışan sorgu sqlite3 interrupt() ile kesilir.
+    """
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._latest = {}    # anahtar -> en son future
+        self._running = {}   # future -> çalıştığı iş parçacığının bağlantısı
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        """fn'i arka planda çalıştırır, bir Future döndürür"""
+        future = None
+
+        def task():
+            conn = connection.acquire()
+            with self._lock:
+                self._running[future] = conn
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running.pop(future, None)
+
+        with self._lock:
+            future = self._pool.submit(task)
+            previous = self._latest.get(key) if key is not None else None
+            if key is not None:
+                self._latest[key] = future
+
+        if previous is not None:
+            self.cancel(previous)
+        return future
+
+    def cancel(self, future):
+        """Bekleyen işi iptal eder, çalışan sorguyu keser"""
+        if future.cancel():
+            return
+        with self._lock:
+            conn = self._running.get(future)
+        if conn is not None:
+            conn.interrupt()
+
+    def is_current(self, key, future):
+        """future, anahtarı için gönderilen en son iş mi"""
+        with self._lock:
+            return self._latest.get(key) is future
+
+    def release(self, key, future):
+        """Tamamlanan en son işin anahtar kaydını siler"""
+        with self._lock:
+            if self._latest.get(key) is future:
+                del self._latest[key]
+
+    def shutdown(self):
+        """Bekleyen işleri iptal eder ve iş parçacıklarını kapatır"""
+        with self._lock:
+            running = list(self._running.values())
+        for conn in running:
+            conn.interrupt()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        connection.close_connections()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Uygulama genelindeki DBExecutor örneğini döndürür"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DBExecutor()
+        return _executor
+
+def shutdown_executor():
+    """Uygulama kapanırken arka plan işlerini sonlandırır"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
+
+def run_in_background(widget, fn, *args, on_success=None, on_error=None,
+                      key=None, poll_ms=30, **kwargs):
+    """fn'i arka planda çalıştırır, sonucu Tk iş parçacığında geri verir
+
+    Sonuç widget.after ile ana döngüye taşınır; Tk nesnelerine yalnızca
+    on_success / on_error içinden erişilmelidir. Aynı key ile yeni bir çağrı
+    yapılırsa eski çağrının geri çağrıları hiç çalışmaz. Widget kapanmışsa
+    iş iptal edilir.
+    """
+    executor = get_executor()
+    future = executor.submit(fn, *args, key=key, **kwargs)
+
+    def poll():
+        try:
+            alive = widget.winfo_exists()
+        except Exception:
+            alive = False
+        if not alive:
+            executor.cancel(future)
+            return
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        if future.cancelled() or (key is not None and not executor.is_current(key, future)):
+            return
+        if key is not None:
+            executor.release(key, future)
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                messagebox.showerror("Hata", f"Veri yüklenirken hata: {str(error)}", parent=widget)
+        elif on_success:
+            on_success(future.result())
+
+    widget.after(poll_ms, poll)
+    return future
+
+class BackgroundLoader:
+    """Bir pencerenin arka plan yüklemelerini ve yükleniyor göstergesini yönetir"""
+    def __init__(self, window, indicator_parent):
+        self.window = window
+        self.progress = ttk.Progressbar(indicator_parent, mode="indeterminate", length=120)
+        self._pending = set()
+
+    def load(self, fn, *args, on_success=None, key=None, **kwargs):
+        """fn'i arka planda çalıştırır; bitene kadar gösterge döner
+
+        key verilmezse fn kullanılır: aynı sorgu yeniden istendiğinde (örn.
+        tarih filtresi tekrar değiştiğinde) önceki istek iptal edilir.
+        """
+        key = (id(self), key if key is not None else fn)
+        self._set_pending(key, True)
+
+        def done(result):
+            self._set_pending(key, False)
+            if on_success:
+                on_success(result)
+
+        def failed(error):
+            self._set_pending(key, False)
+            messagebox.showerror("Hata", f"Veri yüklenirken hata: {str(error)}", parent=self.window)
+
+        return run_in_background(self.window, fn, *args, on_success=done,
+                                 on_error=failed, key=key, **kwargs)
+
+    def _set_pending(self, key, pending):
+        was_busy = bool(self._pending)
+        if pending:
+            self._pending.add(key)
+        else:
+            self._pending.discard(key)
+
+        if self._pending and not was_busy:
+            self.progress.pack(side="left", padx=5)
+            self.progress.start(10)
+        elif not self._pending and was_busy:
+            self.progress.stop()
+            self.progress.pack_forget()
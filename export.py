@@ -0,0 +1,126 @@
+import csv
+import gzip
+import os
+import time
+
+from connection import get_connection
+from database import TABLO_SUTUNLARI
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX dışa aktarma isteğe bağlıdır
+    Workbook = None
+
+# Dosya uzantısı -> biçim
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".csv.gz": "csv.gz",
+    ".xlsx": "xlsx",
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+class ExportCancelled(Exception):
+    """Dışa aktarma kullanıcı tarafından iptal edildi"""
+
+def available_formats():
+    """Kurulu kütüphanelere göre kullanılabilir biçimleri döndürür"""
+    return [fmt for fmt in EXPORT_FORMATS.values() if fmt != "xlsx" or Workbook is not None]
+
+def format_for_path(path):
+    """Dosya adından dışa aktarma biçimini belirler (varsayılan csv)"""
+    lowered = path.lower()
+    for suffix in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if lowered.endswith(suffix):
+            return EXPORT_FORMATS[suffix]
+    return "csv"
+
+class _CsvWriter:
+    def __init__(self, path, compressed):
+        if compressed:
+            self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            # BOM, Excel'in Türkçe karakterleri doğru açması için
+            self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.writer(self.file)
+
+    def write_header(self, columns):
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class _XlsxWriter:
+    def __init__(self, path, sheet_title):
+        if Workbook is None:
+            raise RuntimeError("XLSX dışa aktarma için openpyxl kurulu olmalıdır")
+        self.path = path
+        # write_only kipinde satırlar belleğe değil geçici dosyaya yazılır
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title=sheet_title[:31])
+
+    def write_header(self, columns):
+        self.sheet.append(list(columns))
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append(list(row))
+
+    def close(self):
+        self.workbook.save(self.path)
+
+def _open_writer(path, fmt, table_name):
+    if fmt == "xlsx":
+        return _XlsxWriter(path, table_name)
+    return _CsvWriter(path, compressed=(fmt == "csv.gz"))
+
+def export_table(table_name, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE,
+                 progress=None, cancel_event=None):
+    """Tabloyu satırları belleğe toplamadan dosyaya aktarır
+
+    Satırlar tek bir imleçten batch_size'lık gruplar halinde okunup hemen
+    yazılır. progress(yazılan, toplam) her gruptan sonra çağrılır (arka plan
+    iş parçacığından). cancel_event ayarlanırsa ExportCancelled fırlatılır.
+    (satır_sayısı, süre_sn) döndürür. Yalnızca database.TABLO_SUTUNLARI'ndaki
+    tablolar aktarılabilir (kullanicilar ve iç tablolar hariç).
+    """
+    if table_name not in TABLO_SUTUNLARI:
+        raise ValueError(f"Geçersiz tablo adı: {table_name}")
+    fmt = fmt or format_for_path(path)
+    start = time.perf_counter()
+    written = 0
+
+    with get_connection() as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        cursor = conn.cursor()
+        # Düz demetler: sqlite3.Row nesnesi oluşturmanın maliyetinden kaçın
+        cursor.row_factory = None
+        cursor.execute(f"SELECT * FROM {table_name} ORDER BY rowid")
+        columns = [description[0] for description in cursor.description]
+
+        writer = _open_writer(path, fmt, table_name)
+        completed = False
+        try:
+            writer.write_header(columns)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.write_rows(rows)
+                written += len(rows)
+                if progress:
+                    progress(written, total)
+            completed = True
+        finally:
+            cursor.close()
+            writer.close()
+            if not completed and os.path.exists(path):
+                # Yarım kalan dosyayı bırakma
+                os.remove(path)
+
+    return written, time.perf_counter() - start
@@ -8,6 +8,7 @@ from utils import (
     create_scrollable_frame, setup_treeview, create_combobox_with_label,
     create_entry_with_label, get_current_date, get_month_name
 )
+from db_executor import BackgroundLoader
 from database import (
     create_connection, get_all_uyeler, get_apartman_bilgileri,
     get_all_banka_hesaplari, get_aidat_for_year
@@ -32,6 +33,13 @@ class FormBase:
         # Başlık
         self.title_label = ttk.Label(self.main_frame, text=title, font=("Arial", 16, "bold"))
         self.title_label.pack(pady=(0, 20))
+        
+        # Arka plan sorguları ve yükleniyor göstergesi
+        self.loader = BackgroundLoader(self.window, self.main_frame)
+    
+    def load_async(self, fn, *args, on_success=None, key=None, **kwargs):
+        """Veritabanı sorgusunu arka planda çalıştırır, sonucu on_success'e verir"""
+        return self.loader.load(fn, *args, on_success=on_success, key=key, **kwargs)
 
 class UyeForm(FormBase):
     """Üye ekleme/düzenleme formu"""
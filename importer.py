@@ -0,0 +1,302 @@
+import csv
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from connection import get_connection
+from database import AY_ISIMLERI, insert_banka_hareketleri_batch
+from search import deferred_indexing
+from utils import fold_tr
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Başlık satırındaki sütun adları (katlanmış biçimde) -> alan
+BANKA_SUTUNLARI = {
+    "tarih": ("tarih", "islem tarihi", "valor", "valor tarihi", "date"),
+    "tutar": ("tutar", "islem tutari", "miktar", "amount"),
+    "alacak": ("alacak", "gelen"),
+    "borc": ("borc", "giden"),
+    "hareket_tipi": ("hareket tipi", "hareket_tipi", "islem tipi", "tip"),
+    "aciklama": ("aciklama", "islem aciklamasi", "description"),
+}
+
+AIDAT_SUTUNLARI = {
+    "daire_no": ("daire no", "daire_no", "daire"),
+    "uye_id": ("uye id", "uye_id"),
+    "yil": ("yil",),
+    "ay": ("ay",),
+    "odeme_tarihi": ("odeme tarihi", "odeme_tarihi", "tarih"),
+    "tutar": ("tutar", "miktar"),
+    "aciklama": ("aciklama",),
+}
+
+TARIH_BICIMLERI = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y",
+                   "%Y-%m-%d %H:%M:%S", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M")
+
+class ImportReport:
+    """İçe aktarma sonucu: okunan, eklenen ve reddedilen satırlar"""
+    def __init__(self):
+        self.okunan = 0
+        self.eklenen = 0
+        self.reddedilen = []  # (satır_no, neden, ham_satır)
+        self.sure = 0.0
+        self.iptal = False
+
+    def reject(self, satir_no, neden, satir):
+        self.reddedilen.append((satir_no, neden, satir))
+
+    def write_rejects(self, path):
+        """Reddedilen satırları nedenleriyle birlikte CSV'ye yazar"""
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(["satir_no", "neden", "satir"])
+            for satir_no, neden, satir in self.reddedilen:
+                writer.writerow([satir_no, neden, ";".join(satir)])
+
+def parse_tutar(text):
+    """'1.234,56', '1234.56', '-250 TL' gibi tutarları tam TL'ye yuvarlar
+
+    Tek nokta ve ardından tam üç hane (örn. '12.500') binlik ayırıcı sayılır.
+    """
+    text = text.strip().replace(" ", "").replace("TL", "").replace("₺", "")
+    if not text:
+        raise ValueError("tutar boş")
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        text = text.replace(",", ".")
+    elif text.count(".") > 1 or (text.count(".") == 1 and len(text.split(".")[1]) == 3):
+        text = text.replace(".", "")
+    try:
+        return int(Decimal(text).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"geçersiz tutar: {text}")
+
+def parse_tarih(text):
+    """Desteklenen biçimlerdeki tarihi YYYY-MM-DD'ye çevirir"""
+    text = text.strip()
+    for fmt in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"geçersiz tarih: {text}")
+
+def _open_text(path):
+    # Banka çıktıları çoğunlukla UTF-8 ya da Windows-1254 olur
+    with open(path, "rb") as f:
+        head = f.read(65536)
+    try:
+        head.decode("utf-8")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "cp1254"
+    return open(path, "r", newline="", encoding=encoding)
+
+def _read_rows(f, columns, required):
+    """Başlık satırını (önündeki bilgi satırlarını atlayarak) bulur, eşlenmiş satırları verir"""
+    sample = f.read(8192)
+    f.seek(0)
+    delimiter = max(";,\t", key=sample.count)
+    reader = csv.reader(f, delimiter=delimiter)
+
+    aliases = {alias: field for field, names in columns.items() for alias in names}
+    mapping = None
+    for row in reader:
+        basliklar = [fold_tr(cell, normalize_space=True) for cell in row]
+        found = {aliases[cell]: i for i, cell in enumerate(basliklar) if cell in aliases}
+        if all(any(field in found for field in group) for group in required):
+            mapping = found
+            break
+        if reader.line_num > 20:
+            break
+    if mapping is None:
+        raise ValueError("Başlık satırı bulunamadı")
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        values = {field: row[i].strip() if i < len(row) else "" for field, i in mapping.items()}
+        yield reader.line_num, row, values
+
+def _chunks(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _banka_satiri(hesap_id, values):
+    tarih = parse_tarih(values.get("tarih", ""))
+    tip = fold_tr(values.get("hareket_tipi", ""), normalize_space=True)
+
+    if values.get("alacak") or values.get("borc"):
+        alacak = parse_tutar(values["alacak"]) if values.get("alacak") else 0
+        borc = parse_tutar(values["borc"]) if values.get("borc") else 0
+        if alacak and borc:
+            raise ValueError("hem alacak hem borç dolu")
+        tutar, hareket_tipi = (abs(alacak), "Gelir") if alacak else (abs(borc), "Gider")
+    else:
+        tutar = parse_tutar(values.get("tutar", ""))
+        if tip in ("gelir", "alacak", "a", "+"):
+            hareket_tipi = "Gelir"
+        elif tip in ("gider", "borc", "b", "-"):
+            hareket_tipi = "Gider"
+        elif not tip:
+            hareket_tipi = "Gelir" if tutar >= 0 else "Gider"
+        else:
+            raise ValueError(f"bilinmeyen hareket tipi: {values['hareket_tipi']}")
+        tutar = abs(tutar)
+
+    if tutar == 0:
+        raise ValueError("tutar sıfır")
+    return (hesap_id, tarih, tutar, hareket_tipi, values.get("aciklama") or None)
+
+def import_banka_ekstresi(path, hesap_id, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+                          cancel_event=None):
+    """CSV ya da CSV biçimli banka ekstresini banka_hareketleri'ne aktarır
+
+    Dosya akış halinde okunur; her chunk_size satır doğrulanır ve tek bir
+    işlemde eklenir. Aynı (hesap, tarih, tutar, açıklama) ile kayıtlı ya da
+    dosyada daha önce geçen hareketler mükerrer olarak reddedilir.
+    progress(okunan) her gruptan sonra çağrılır. cancel_event ayarlanırsa
+    sıradaki gruba geçilmez; işlenmiş gruplar kayıtlı kalır (report.iptal).
+    ImportReport döndürür.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+
+    with _open_text(path) as f:
+        rows = _read_rows(f, BANKA_SUTUNLARI, required=(("tarih",), ("tutar", "alacak", "borc")))
+        for chunk in _chunks(rows, chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                report.iptal = True
+                break
+            valid = []
+            for satir_no, raw, values in chunk:
+                report.okunan += 1
+                try:
+                    valid.append((satir_no,) + _banka_satiri(hesap_id, values))
+                except ValueError as e:
+                    report.reject(satir_no, str(e), raw)
+
+            raw_by_line = {satir_no: raw for satir_no, raw, _ in chunk}
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN")
+                _stage(cursor, valid, ("hesap_id", "tarih", "tutar", "hareket_tipi", "aciklama"))
+                for (satir_no,) in _duplicates(cursor, "banka_hareketleri",
+                                               ("hesap_id", "tarih", "tutar", "aciklama")):
+                    report.reject(satir_no, "mükerrer hareket", raw_by_line[satir_no])
+                report.eklenen += insert_banka_hareketleri_batch(cursor, "temp.ice_aktarim")
+                cursor.execute("DROP TABLE temp.ice_aktarim")
+
+            if progress:
+                progress(report.okunan)
+
+    report.reddedilen.sort(key=lambda r: r[0])
+    report.sure = time.perf_counter() - start
+    return report
+
+def _aidat_satiri(uye_by_daire, values):
+    if values.get("uye_id"):
+        uye_id = int(values["uye_id"])
+    elif values.get("daire_no"):
+        try:
+            uye_id = uye_by_daire[int(values["daire_no"])]
+        except (KeyError, ValueError):
+            raise ValueError(f"bilinmeyen daire: {values['daire_no']}")
+    else:
+        raise ValueError("daire numarası yok")
+
+    odeme_tarihi = parse_tarih(values.get("odeme_tarihi", ""))
+    yil = int(values["yil"]) if values.get("yil") else int(odeme_tarihi[:4])
+
+    ay = fold_tr(values.get("ay", ""), normalize_space=True)
+    if ay.isdigit() and 1 <= int(ay) <= 12:
+        ay = AY_ISIMLERI[int(ay) - 1]
+    elif not ay:
+        ay = AY_ISIMLERI[int(odeme_tarihi[5:7]) - 1]
+    elif ay not in AY_ISIMLERI:
+        raise ValueError(f"geçersiz ay: {values['ay']}")
+
+    tutar = parse_tutar(values.get("tutar", ""))
+    if tutar <= 0:
+        raise ValueError("tutar pozitif olmalı")
+    return (uye_id, yil, ay, odeme_tarihi, tutar, values.get("aciklama") or None)
+
+def import_aidat_odemeleri(path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+                           cancel_event=None):
+    """CSV'deki aidat ödemelerini aidat_odemeleri'ne aktarır
+
+    Daireler daire_no (ya da uye_id) ile eşlenir; ay adı ya da numarası
+    kabul edilir. Aynı üye, yıl, ay, tarih ve tutarla kayıtlı ödemeler
+    mükerrer olarak reddedilir. ImportReport döndürür.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+
+    with get_connection() as conn:
+        uye_by_daire = {row[0]: row[1] for row in conn.execute("SELECT daire_no, id FROM uyeler")}
+
+    with _open_text(path) as f:
+        rows = _read_rows(f, AIDAT_SUTUNLARI, required=(("daire_no", "uye_id"), ("tutar",)))
+        for chunk in _chunks(rows, chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                report.iptal = True
+                break
+            valid = []
+            for satir_no, raw, values in chunk:
+                report.okunan += 1
+                try:
+                    valid.append((satir_no,) + _aidat_satiri(uye_by_daire, values))
+                except ValueError as e:
+                    report.reject(satir_no, str(e), raw)
+
+            raw_by_line = {satir_no: raw for satir_no, raw, _ in chunk}
+            columns = ("uye_id", "yil", "ay", "odeme_tarihi", "tutar", "aciklama")
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN")
+                _stage(cursor, valid, columns)
+                for (satir_no,) in _duplicates(cursor, "aidat_odemeleri",
+                                               ("uye_id", "yil", "odeme_tarihi", "ay", "tutar")):
+                    report.reject(satir_no, "mükerrer ödeme", raw_by_line[satir_no])
+                with deferred_indexing(cursor, "aidat_odemeleri"):
+                    cursor.execute(f"INSERT INTO aidat_odemeleri ({', '.join(columns)}) "
+                                   f"SELECT {', '.join(columns)} FROM temp.ice_aktarim ORDER BY satir_no")
+                    report.eklenen += cursor.rowcount
+                cursor.execute("DROP TABLE temp.ice_aktarim")
+
+            if progress:
+                progress(report.okunan)
+
+    report.reddedilen.sort(key=lambda r: r[0])
+    report.sure = time.perf_counter() - start
+    return report
+
+def _stage(cursor, rows, columns):
+    # Doğrulanmış grup önce geçici tabloya yazılır; mükerrer kontrolü küme halinde yapılır
+    cursor.execute("DROP TABLE IF EXISTS temp.ice_aktarim")
+    cursor.execute(f"CREATE TEMP TABLE ice_aktarim (satir_no INTEGER PRIMARY KEY, {', '.join(columns)})")
+    placeholders = ", ".join("?" * (len(columns) + 1))
+    cursor.executemany(f"INSERT INTO temp.ice_aktarim VALUES ({placeholders})", rows)
+
+def _duplicates(cursor, table, key_columns):
+    """Tabloda ya da grupta daha önce geçen satırları geçici tablodan siler, satır no'larını döndürür"""
+    match_table = " AND ".join(f"t.{col} IS s.{col}" for col in key_columns)
+    match_stage = " AND ".join(f"o.{col} IS s.{col}" for col in key_columns)
+    cursor.execute(f"CREATE INDEX temp.ice_aktarim_anahtar ON ice_aktarim ({', '.join(key_columns)})")
+    cursor.execute(
+        f"""SELECT s.satir_no FROM temp.ice_aktarim s
+           WHERE EXISTS (SELECT 1 FROM {table} t WHERE {match_table})
+              OR EXISTS (SELECT 1 FROM temp.ice_aktarim o WHERE {match_stage} AND o.satir_no < s.satir_no)""")
+    duplicates = cursor.fetchall()
+    cursor.executemany("DELETE FROM temp.ice_aktarim WHERE satir_no = ?", duplicates)
+    return duplicates
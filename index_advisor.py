@@ -0,0 +1,150 @@
+"""database.py erişimcileri için EXPLAIN QUERY PLAN tabanlı indeks denetimi
+
+Her get_* erişimcisi örnek argümanlarla çalıştırılır, ürettiği SELECT
+sorgularının planı alınır ve indeks kullanmayan tam tablo taramaları
+raporlanır. Bulgu varsa çıkış kodu 1 olur.
+
+Kullanım:
+    python index_advisor.py             # geçici, boş bir şema üzerinde
+    python index_advisor.py apartman.db # mevcut veritabanı üzerinde
+"""
+import inspect
+import os
+import re
+import sys
+import tempfile
+
+import connection
+import database
+from query import where
+
+_NEXT_PAGE = database.encode_page_cursor(("2024-06-01", 1000))
+_NEXT_PAGE_ID = database.encode_page_cursor((1000, 1000))
+
+# Zorunlu parametresi olan erişimciler için örnek çağrılar
+SAMPLE_ARGS = {
+    "get_table_data": [("uyeler", where(daire_no=1)), ("banka_hareketleri", where(hesap_id=1, tarih__gte="2024-01-01")),
+                       ("aidat_odemeleri", where(uye_id__in=[1, 2, 3]), "-odeme_tarihi")],
+    "get_aidat_for_year": [(2024,)],
+    "get_aidat_tarifeleri": [(2023, 6, 2024, 6)],
+    "get_aidat_tutari": [(2024, 1)],
+    "get_aidat_odemeler_by_uye": [(1,), (1, 2024)],
+    "get_banka_hareketleri": [
+        (), (1,), (1, "2024-01-01", "2024-12-31"), (None, "2024-01-01", "2024-12-31")
+    ],
+    "get_giderler": [(), ("2024-01-01", "2024-12-31")],
+    "get_dashboard_ozeti": [(2024, 6)],
+    # Sayfalı erişimcilerde devam sorgusu da denetlenir (ilk sayfa rowid
+    # sırasıyla LIMIT'li bir tarama olabilir)
+    "get_table_data_page": [("aidat_odemeleri", 500, _NEXT_PAGE_ID)],
+    "get_banka_hareketleri_page": [
+        (), (1, None, None, 500, _NEXT_PAGE), (None, "2024-01-01", "2024-12-31", 500, _NEXT_PAGE)
+    ],
+    "get_giderler_page": [(), ("2024-01-01", "2024-12-31", 500, _NEXT_PAGE)],
+    "get_aidat_odemeler_by_uye_page": [(1,), (1, 2024, 500, _NEXT_PAGE)],
+    "get_banka_bakiye": [(1,), (1, "2024-06-30")],
+    "get_aylik_ozet": [(2015, 2024)],
+    "get_yillik_ozet": [(2015, 2024)],
+}
+
+# Bilerek tamamen okunan küçük tablolar
+ALLOWED_SCANS = {"apartman", "banka_hesaplari", "kullanicilar", "sistem_ayarlari"}
+
+# "SCAN tablo" ya da "SCAN tablo AS takma_ad"; "USING ... INDEX" içermeyenler
+_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS (\w+))?$")
+
+# Planlar tablo yerine takma adı gösterir ("SCAN g"); takma adlar SQL'den çözülür
+_KEYWORDS = "WHERE|ON|LEFT|JOIN|INNER|CROSS|ORDER|GROUP|LIMIT|USING"
+_ALIAS_RE = re.compile(
+    rf"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:{_KEYWORDS})\b)(\w+))?", re.IGNORECASE
+)
+
+def _accessors():
+    for name, fn in inspect.getmembers(database, inspect.isfunction):
+        if name.startswith("get_") and fn.__module__ == database.__name__:
+            yield name, fn
+
+def _calls_for(name, fn):
+    if name in SAMPLE_ARGS:
+        return SAMPLE_ARGS[name]
+    params = inspect.signature(fn).parameters.values()
+    if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+           for p in params):
+        return [()]
+    return None
+
+def _capture_queries(fn, args):
+    conn = connection.acquire()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn(*args)
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+def _full_scans(sql):
+    with connection.get_connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    # CTE ve alt sorgu sonuçlarının taranması tablo taraması değildir
+    derived = {row[3].split()[-1] for row in plan
+               if row[3].startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    aliases = {alias: table for table, alias in _ALIAS_RE.findall(sql) if alias}
+    scans = []
+    for row in plan:
+        match = _SCAN_RE.match(row[3])
+        if not match:
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        if table not in ALLOWED_SCANS | derived:
+            scans.append(row[3])
+    return scans
+
+def check_accessors():
+    """Tüm erişimcileri denetler, (erişimci, sorgu, bulgular) listesi döndürür"""
+    findings = []
+    for name, fn in _accessors():
+        calls = _calls_for(name, fn)
+        if calls is None:
+            findings.append((name, None, ["SAMPLE_ARGS içinde örnek çağrı yok"]))
+            continue
+        for args in calls:
+            for sql in _capture_queries(fn, args):
+                scans = _full_scans(sql)
+                if scans:
+                    findings.append((f"{name}{args!r}", sql, scans))
+    return findings
+
+def main(argv):
+    tmp = None
+    if len(argv) > 1:
+        connection.set_db_path(argv[1])
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        connection.set_db_path(os.path.join(tmp.name, "advisor.db"))
+        database.create_tables()
+        database.create_user_table()
+        database.create_indexes()
+
+    try:
+        findings = check_accessors()
+    finally:
+        connection.close_connections()
+        if tmp:
+            tmp.cleanup()
+
+    for accessor, sql, scans in findings:
+        print(f"[TAM TARAMA] {accessor}")
+        if sql:
+            print(f"    {sql}")
+        for detail in scans:
+            print(f"    -> {detail}")
+
+    if findings:
+        print(f"{len(findings)} sorunlu sorgu bulundu.")
+        return 1
+    print("Tüm erişimciler indeks kullanıyor.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
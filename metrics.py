@@ -0,0 +1,268 @@
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+# Bu süreyi (ms) aşan sorgular EXPLAIN planıyla birlikte kaydedilir
+SLOW_QUERY_MS = 100
+SLOW_LOG_PATH = "yavas_sorgular.log"
+# Histogramlar son WINDOW_SECONDS saniyeyi kapsar; pencere SLOTS dilime bölünür
+WINDOW_SECONDS = 600
+SLOTS = 10
+
+# Logaritmik kova üst sınırları (ms): 0.05, 0.1, 0.2 ... ~26 sn
+_SINIRLAR = tuple(0.05 * 2 ** i for i in range(20))
+
+class RollingHistogram:
+    """Son WINDOW_SECONDS saniyenin süre dağılımı
+
+    Pencere eşit dilimlere bölünür; eski dilimler düşürülerek kayan pencere
+    elde edilir. Yüzdelikler kova üst sınırından tahmin edilir.
+    """
+    def __init__(self, window=WINDOW_SECONDS, slots=SLOTS):
+        self.slot_seconds = window / slots
+        self.slots = slots
+        self._dilimler = deque()  # [dilim no, kovalar, adet, toplam ms, en büyük ms, satır]
+
+    def add(self, ms, rows=0, now=None):
+        dilim_no = int((now or time.monotonic()) / self.slot_seconds)
+        if not self._dilimler or self._dilimler[-1][0] != dilim_no:
+            self._dilimler.append([dilim_no, [0] * (len(_SINIRLAR) + 1), 0, 0.0, 0.0, 0])
+            self._drop_old(dilim_no)
+        dilim = self._dilimler[-1]
+        dilim[1][bisect_left(_SINIRLAR, ms)] += 1
+        dilim[2] += 1
+        dilim[3] += ms
+        dilim[4] = max(dilim[4], ms)
+        dilim[5] += rows
+
+    def _drop_old(self, dilim_no):
+        while self._dilimler and self._dilimler[0][0] <= dilim_no - self.slots:
+            self._dilimler.popleft()
+
+    def summary(self, now=None):
+        """adet, ortalama, p50, p95, p99, en büyük (ms) ve toplam satır"""
+        self._drop_old(int((now or time.monotonic()) / self.slot_seconds))
+        kovalar = [0] * (len(_SINIRLAR) + 1)
+        adet = toplam = en_buyuk = satir = 0
+        for _, dilim_kovalari, d_adet, d_toplam, d_max, d_satir in self._dilimler:
+            for i, n in enumerate(dilim_kovalari):
+                kovalar[i] += n
+            adet += d_adet
+            toplam += d_toplam
+            en_buyuk = max(en_buyuk, d_max)
+            satir += d_satir
+
+        def yuzdelik(oran):
+            hedef, birikim = oran * adet, 0
+            for i, n in enumerate(kovalar):
+                birikim += n
+                if birikim >= hedef:
+                    return min(_SINIRLAR[i], en_buyuk) if i < len(_SINIRLAR) else en_buyuk
+            return en_buyuk
+
+        return {"count": adet, "avg": toplam / adet if adet else 0.0,
+                "p50": yuzdelik(0.5) if adet else 0.0, "p95": yuzdelik(0.95) if adet else 0.0,
+                "p99": yuzdelik(0.99) if adet else 0.0, "max": en_buyuk, "rows": satir}
+
+class Metrics:
+    """Sorgu ve arayüz ölçümlerinin süreç genelindeki deposu"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = {}   # sorgu şekli -> RollingHistogram
+        self.errors = {}    # sorgu şekli -> hata sayısı
+        self.ui = {}        # menü eylemi -> RollingHistogram
+        self.slow = deque(maxlen=200)  # (zaman, ms, sql, plan)
+
+    def record_query(self, shape, ms, rows):
+        with self._lock:
+            histogram = self.queries.get(shape)
+            if histogram is None:
+                histogram = self.queries[shape] = RollingHistogram()
+            histogram.add(ms, rows)
+
+    def record_error(self, shape):
+        with self._lock:
+            self.errors[shape] = self.errors.get(shape, 0) + 1
+
+    def record_slow(self, ms, sql, plan):
+        zaman = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self.slow.append((zaman, ms, sql, plan))
+        try:
+            with open(SLOW_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(f"{zaman}  {ms:.1f} ms\n{sql.strip()}\n")
+                for satir in plan:
+                    f.write(f"    {satir}\n")
+                f.write("\n")
+        except OSError as e:
+            print(f"Yavaş sorgu kaydı yazma hatası: {str(e)}")
+
+    def record_ui(self, eylem, ms):
+        with self._lock:
+            histogram = self.ui.get(eylem)
+            if histogram is None:
+                histogram = self.ui[eylem] = RollingHistogram()
+            histogram.add(ms)
+
+    def query_stats(self):
+        """[(şekil, özet, hata sayısı)] toplam süreye göre azalan"""
+        with self._lock:
+            satirlar = [(shape, h.summary(), self.errors.get(shape, 0)) for shape, h in self.queries.items()]
+            satirlar += [(shape, RollingHistogram().summary(), n)
+                         for shape, n in self.errors.items() if shape not in self.queries]
+        satirlar.sort(key=lambda s: s[1]["avg"] * s[1]["count"], reverse=True)
+        return satirlar
+
+    def ui_stats(self):
+        with self._lock:
+            satirlar = [(eylem, h.summary()) for eylem, h in self.ui.items()]
+        satirlar.sort(key=lambda s: s[1]["p95"], reverse=True)
+        return satirlar
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self.slow))
+
+    def reset(self):
+        with self._lock:
+            self.queries.clear()
+            self.errors.clear()
+            self.ui.clear()
+            self.slow.clear()
+
+metrics = Metrics()
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_BOSLUK_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def query_shape(sql):
+    """Sorgunun şekli: sabitler ? ile, IN (?, ?, ...) listeleri (?+) ile değiştirilir"""
+    shape = _BOSLUK_RE.sub(" ", sql).strip()
+    shape = _LITERAL_RE.sub("?", shape)
+    return _IN_RE.sub("IN (?+)", shape)
+
+def _explain(conn, sql, parameters):
+    # Ölçülmeyen düz imleçle; EXPLAIN QUERY PLAN deyimi çalıştırmaz, yazmalar için de güvenlidir
+    try:
+        cursor = sqlite3.Cursor(conn)
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"(plan alınamadı: {e})"]
+
+class TimedCursor(sqlite3.Cursor):
+    """Süre, satır sayısı ve sorgu şeklini kaydeden imleç
+
+    SELECT'lerin asıl işi satırlar okunurken yapılır; süre execute ile
+    fetch* çağrılarının toplamıdır. Kayıt sonuç bittiğinde, yeni bir execute
+    yapıldığında ya da imleç kapatıldığında tamamlanır. `for row in cursor`
+    ile okunan satırlar sayılmaz, süreye yalnızca execute girer.
+    """
+    _bekleyen = None  # [sql, parametreler, ms, satır]
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except Exception:
+            metrics.record_error(query_shape(sql))
+            raise
+        self._bekleyen = [sql, parameters, (time.perf_counter() - start) * 1000, 0]
+        if self.description is None:
+            # Sonuç döndürmeyen deyim: satır sayısı etkilenen satırlardır
+            self._bekleyen[3] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except Exception:
+            metrics.record_error(query_shape(sql))
+            raise
+        metrics.record_query(query_shape(sql), (time.perf_counter() - start) * 1000, max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add(start, 0 if row is None else 1, done=row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._add(start, len(rows), done=len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add(start, len(rows), done=True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass  # yorumlayıcı kapanırken modül nesneleri silinmiş olabilir
+
+    def _add(self, start, rows, done):
+        bekleyen = self._bekleyen
+        if bekleyen is not None:
+            bekleyen[2] += (time.perf_counter() - start) * 1000
+            bekleyen[3] += rows
+            if done:
+                self._finish()
+
+    def _finish(self):
+        bekleyen, self._bekleyen = self._bekleyen, None
+        if bekleyen is None:
+            return
+        sql, parameters, ms, rows = bekleyen
+        metrics.record_query(query_shape(sql), ms, rows)
+        if ms >= SLOW_QUERY_MS:
+            try:
+                plan = _explain(self.connection, sql, parameters)
+            except Exception as e:
+                plan = [f"(plan alınamadı: {e})"]
+            metrics.record_slow(ms, sql, plan)
+
+class TimedConnection(sqlite3.Connection):
+    """Tüm imleçleri (conn.execute kısayolları dahil) TimedCursor olan bağlantı"""
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def timed_ui(eylem, fn, widget):
+    """fn'i çalıştırır; tıklamadan ana döngünün boşa çıkmasına kadar geçen süreyi kaydeder
+
+    Süre pencerenin kurulmasını ve ilk yerleşim/çizimi kapsar (after_idle).
+    """
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            widget.after_idle(lambda: metrics.record_ui(eylem, (time.perf_counter() - start) * 1000))
+    return wrapper
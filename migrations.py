@@ -0,0 +1,216 @@
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import connection
+from connection import open_connection
+from database import AY_ISIMLERI, SCHEMA_VERSION, create_degisiklik_sayaclari
+from utils import fold_tr
+from search import create_search_index, fill_search_index
+
+# Toplu veri yeniden yazımlarında bir işlemde güncellenen en fazla satır
+DEFAULT_BATCH_SIZE = 5000
+
+# create_tables / create_user_table ile kurulan dondurulmuş temel şema.
+# Bundan sonraki her şema ya da veri değişikliği aşağıya numaralı bir adım
+# olarak eklenir ve database.SCHEMA_VERSION son adımın numarasına çekilir.
+BASE_VERSION = 1
+
+class Migration:
+    """Numaralı bir geçiş adımı
+
+    apply(conn, batch_size, progress) etkilenen satır sayısını döndürür.
+    online=True adımlar satırları parça parça işler ve her parçayı ayrı
+    işlemde kaydeder; uygulama açıkken arka planda çalıştırılabilir, yarıda
+    kesilirse bir sonraki çalıştırmada kaldığı yerden tekrar edilebilir
+    (idempotent) olmalıdır. Diğer adımlar tek işlemde uygulanır.
+    """
+    def __init__(self, version, aciklama, apply, online=False):
+        self.version = version
+        self.aciklama = aciklama
+        self.apply = apply
+        self.online = online
+
+class MigrationReport:
+    """Uygulanan (ya da prova edilen) adımlar ve süreleri"""
+    def __init__(self, baslangic_surumu, dry_run=False):
+        self.baslangic_surumu = baslangic_surumu
+        self.son_surum = baslangic_surumu
+        self.dry_run = dry_run
+        self.adimlar = []  # (sürüm, açıklama, satır, süre)
+        self.yedek = None
+        self.sure = 0.0
+
+def _kanonik_ay(ay):
+    # "Şubat", "SUBAT", "2", "02" -> "subat"; tanınmayan değerler için None
+    if ay is None:
+        return None
+    ay = fold_tr(str(ay), normalize_space=True)
+    if ay.isdigit():
+        return AY_ISIMLERI[int(ay) - 1] if 1 <= int(ay) <= 12 else None
+    return ay if ay in AY_ISIMLERI else None
+
+def _ay_adlarini_duzelt(conn, batch_size, progress):
+    """aidat_odemeleri.ay değerlerini AY_ISIMLERI biçimine getirir
+
+    Panel ve kapsayan indeks sorguları ay = 'subat' gibi tam eşleşme arar;
+    "Şubat" ya da "2" olarak kaydedilmiş ödemeler bu sorgularda ve aylık
+    özetin 0. ayında kalıyordu. Güncelleme tetikleyicileri aylık özeti de
+    düzeltir.
+    """
+    conn.create_function("kanonik_ay", 1, _kanonik_ay, deterministic=True)
+    yer_tutucular = ", ".join("?" * len(AY_ISIMLERI))
+    ilk, son = conn.execute("SELECT MIN(id), MAX(id) FROM aidat_odemeleri").fetchone()
+    if ilk is None:
+        return 0
+
+    guncellenen = 0
+    alt = ilk - 1
+    while alt < son:
+        ust = alt + batch_size
+        with conn:
+            cursor = conn.execute(
+                f'''UPDATE aidat_odemeleri SET ay = kanonik_ay(ay)
+                    WHERE id > ? AND id <= ? AND ay NOT IN ({yer_tutucular})
+                      AND kanonik_ay(ay) IS NOT NULL''',
+                (alt, ust, *AY_ISIMLERI)
+            )
+            guncellenen += cursor.rowcount
+        alt = ust
+        if progress:
+            progress(min(ust, son) - ilk + 1, son - ilk + 1)
+    return guncellenen
+
+def _arama_dizini(conn, batch_size, progress):
+    """Üye, gider, banka ve aidat açıklamaları için FTS5 arama dizinini kurar
+
+    Tetikleyiciler önce kurulur; böylece doldurma sürerken eklenen satırlar
+    da dizine girer. Mevcut satırlar id aralıkları halinde eklenir.
+    """
+    with conn:
+        create_search_index(conn.cursor())
+    return fill_search_index(conn, batch_size, progress)
+
+def _degisiklik_sayaclari(conn, batch_size, progress):
+    """Güncelleme/silme sayaçlarını kurar (analiz görüntüsünün artımlı yenilemesi için)"""
+    create_degisiklik_sayaclari(conn.cursor())
+    return 0
+
+MIGRATIONS = [
+    Migration(2, "Aidat ödemelerindeki ay adlarını tek biçime getir", _ay_adlarini_duzelt, online=True),
+    Migration(3, "Arama dizinini oluştur", _arama_dizini, online=True),
+    Migration(4, "Değişiklik sayaçlarını oluştur", _degisiklik_sayaclari),
+]
+
+assert MIGRATIONS[-1].version == SCHEMA_VERSION, "SCHEMA_VERSION son geçiş adımıyla aynı olmalı"
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def set_version(conn, version):
+    # PRAGMA parametre kabul etmez; sürüm her zaman tamsayıdır
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+def pending_migrations(version):
+    """version'dan sonra uygulanması gereken adımlar"""
+    return [m for m in MIGRATIONS if m.version > version]
+
+def backup_database(path=None, hedef=None, progress=None, pages=1024):
+    """Veritabanını sqlite3 çevrimiçi yedekleme API'si ile kopyalar
+
+    Kopyalama pages sayfalık adımlarla yapılır; adımlar arasında diğer
+    bağlantılar yazmaya devam edebilir. hedef verilmezse veritabanının
+    yanına zaman damgalı bir .bak dosyası yazılır. Hedef yolu döndürülür.
+    """
+    path = path or connection.DB_PATH
+    if hedef is None:
+        hedef = f"{path}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
+    kaynak = open_connection(path)
+    kopya = open_connection(hedef)
+    try:
+        kaynak.backup(kopya, pages=pages,
+                      progress=(lambda durum, kalan, toplam: progress(toplam - kalan, toplam))
+                      if progress else None)
+    finally:
+        kopya.close()
+        kaynak.close()
+    return hedef
+
+def migrate(path=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, backup=True,
+            online=True, progress=None):
+    """Bekleyen geçiş adımlarını sırayla uygular, MigrationReport döndürür
+
+    dry_run=True ise adımlar veritabanının geçici bir kopyasında çalıştırılır
+    ve yalnızca süreleri raporlanır; asıl dosyaya dokunulmaz. backup=True
+    ise ilk adımdan önce çevrimiçi yedek alınır. online=False verilirse
+    ilk online adımda durulur (açılışta yalnızca engelleyici adımları
+    çalıştırmak için); kalanlar arka planda tekrar migrate() ile uygulanır.
+    progress(sürüm, işlenen, toplam) her parçadan sonra çağrılır.
+    """
+    start = time.perf_counter()
+    path = path or connection.DB_PATH
+
+    if dry_run:
+        with tempfile.TemporaryDirectory() as tmp:
+            kopya = backup_database(path, os.path.join(tmp, "prova.db"))
+            rapor = migrate(kopya, batch_size, backup=False, online=online, progress=progress)
+        rapor.dry_run = True
+        rapor.sure = time.perf_counter() - start
+        return rapor
+
+    conn = open_connection(path)
+    try:
+        surum = get_version(conn)
+        rapor = MigrationReport(surum)
+        bekleyen = pending_migrations(max(surum, BASE_VERSION))
+        if not online:
+            ilk_online = next((i for i, m in enumerate(bekleyen) if m.online), len(bekleyen))
+            bekleyen = bekleyen[:ilk_online]
+        if surum < BASE_VERSION or not bekleyen:
+            # Temel şema init_database tarafından kurulur
+            return rapor
+
+        if backup:
+            rapor.yedek = backup_database(path)
+
+        for migration in bekleyen:
+            adim_baslangic = time.perf_counter()
+            adim_progress = ((lambda islenen, toplam, v=migration.version: progress(v, islenen, toplam))
+                             if progress else None)
+            if migration.online:
+                satir = migration.apply(conn, batch_size, adim_progress)
+                with conn:
+                    set_version(conn, migration.version)
+            else:
+                with conn:
+                    satir = migration.apply(conn, batch_size, adim_progress)
+                    set_version(conn, migration.version)
+            rapor.adimlar.append((migration.version, migration.aciklama, satir,
+                                  time.perf_counter() - adim_baslangic))
+            rapor.son_surum = migration.version
+    finally:
+        conn.close()
+    rapor.sure = time.perf_counter() - start
+    return rapor
+
+def main(argv):
+    """Komut satırı: python migrations.py [--dry-run] [--batch N] [veritabani]"""
+    dry_run = "--dry-run" in argv
+    batch_size = DEFAULT_BATCH_SIZE
+    if "--batch" in argv:
+        batch_size = int(argv[argv.index("--batch") + 1])
+    yollar = [a for i, a in enumerate(argv)
+              if not a.startswith("--") and (i == 0 or argv[i - 1] != "--batch")]
+    rapor = migrate(yollar[0] if yollar else None, batch_size, dry_run=dry_run)
+
+    print(f"Sürüm {rapor.baslangic_surumu} -> {rapor.son_surum}"
+          + (" (prova, veritabanı değişmedi)" if rapor.dry_run else ""))
+    for version, aciklama, satir, sure in rapor.adimlar:
+        print(f"  {version:3d}  {aciklama:<55} {satir:9,d} satır  {sure:7.2f} sn")
+    if rapor.yedek:
+        print(f"Yedek: {rapor.yedek}")
+
+if __name__ == "__main__":
+    import sys
+    main(sys.argv[1:])
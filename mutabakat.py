@@ -0,0 +1,280 @@
+import re
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import combinations
+
+from connection import get_connection
+from database import AY_ISIMLERI, _ay_no_sql
+from utils import fold_tr
+from records import RECORD, set_row_format
+
+# Açıklamada daire numarası: "daire 12", "d.12", "D:12", "12 nolu daire", "12 numarali daire"
+_DAIRE_RE = re.compile(
+    r"\b(?:daire|d|dno|kapi)\s*(?:no)?\s*[:.\-/#]?\s*(\d{1,4})\b"
+    r"|\b(\d{1,4})\s*(?:no\W?lu|numarali)?\s*daire\b"
+)
+_KELIME_RE = re.compile(r"[a-z]+")
+_AY_NUMARALARI = {ay: i for i, ay in enumerate(AY_ISIMLERI, start=1)}
+
+# Aynı iki nadir kelimeyi paylaşan daire sayısı bunu aşarsa isim ayırt edici sayılmaz
+MAX_ISIM_ADAYI = 50
+# Yalnızca tutarla eşleşmede bu kadardan fazla aday varsa daire aranmaz
+MAX_TUTAR_ADAYI = 20
+
+class MutabakatSonucu:
+    """Eşleştirme sonucu: eşleşen, belirsiz ve eşleşmeyen banka gelirleri"""
+    def __init__(self):
+        self.eslesen = []     # {"hareket": satır, "uye_id", "aylar": [(yil, ay_no, tutar)], "neden"}
+        self.belirsiz = []    # {"hareket": satır, "adaylar": [uye_id], "neden"}
+        self.eslesmeyen = []  # {"hareket": satır, "neden"}
+        self.daire_no = {}    # uye_id -> daire_no, gösterim için
+        self.sure = 0.0
+
+def _ay_indeksi(yil, ay_no):
+    # Ay karşılaştırmaları için tek tamsayı: yil * 12 + (ay_no - 1)
+    return yil * 12 + ay_no - 1
+
+class _Uyeler:
+    """uyeler tablosundan kurulan daire no ve isim arama yapıları"""
+    def __init__(self, uyeler):
+        self.by_daire = {row["daire_no"]: row["id"] for row in uyeler if row["daire_no"] is not None}
+        self.isim_kelimeleri = {}
+        self.by_kelime = defaultdict(set)
+        for row in uyeler:
+            kelimeler = {k for k in _KELIME_RE.findall(fold_tr(row["adi_soyadi"] or "", normalize_space=True)) if len(k) > 1}
+            if len(kelimeler) >= 2:
+                self.isim_kelimeleri[row["id"]] = kelimeler
+                for kelime in kelimeler:
+                    self.by_kelime[kelime].add(row["id"])
+
+        # Her isim en nadir iki kelimesi üzerinden aranır, sonra tamamı doğrulanır
+        self.by_cift = defaultdict(set)
+        for uye_id, kelimeler in self.isim_kelimeleri.items():
+            cift = frozenset(sorted(kelimeler, key=lambda k: (len(self.by_kelime[k]), k))[:2])
+            self.by_cift[cift].add(uye_id)
+        for cift in [cift for cift, uye_idleri in self.by_cift.items() if len(uye_idleri) > MAX_ISIM_ADAYI]:
+            del self.by_cift[cift]
+        # Aynı gönderen her ay aynı adla gelir; isim araması açıklama kelimelerine göre önbelleklenir
+        self._isim_onbellegi = {}
+
+    def daireler(self, metin):
+        return {self.by_daire[int(no)] for pair in _DAIRE_RE.findall(metin)
+                for no in pair if no and int(no) in self.by_daire}
+
+    def isimler(self, kelimeler):
+        anahtar = tuple(sorted(k for k in kelimeler if k in self.by_kelime))
+        sonuc = self._isim_onbellegi.get(anahtar)
+        if sonuc is None:
+            sonuc = {uye_id for cift in combinations(anahtar, 2)
+                     for uye_id in self.by_cift.get(frozenset(cift), ())
+                     if self.isim_kelimeleri[uye_id] <= kelimeler}
+            self._isim_onbellegi[anahtar] = sonuc
+        return sonuc
+
+class _Borclar:
+    """Dairelerin açık aidat borçları ve tutar -> daire arama yapısı"""
+    def __init__(self, aylar, tarifeler, odenenler, uye_idleri):
+        self.by_uye = {}  # uye_id -> {ay indeksi: [ay indeksi, kalan]} (aylar artan sırada)
+        self.by_tutar = defaultdict(dict)  # kalan tutar -> {uye_id: açık ay sayısı}
+        for uye_id in uye_idleri:
+            acik = {}
+            for yil, ay_no in aylar:
+                kalan = tarifeler.get((yil, ay_no), 0) - odenenler.get((uye_id, yil, ay_no), 0)
+                if kalan > 0:
+                    m = _ay_indeksi(yil, ay_no)
+                    acik[m] = [m, kalan]
+                    self._index(kalan, uye_id, 1)
+            self.by_uye[uye_id] = acik
+
+    def _index(self, kalan, uye_id, delta):
+        adaylar = self.by_tutar[kalan]
+        adaylar[uye_id] = adaylar.get(uye_id, 0) + delta
+        if adaylar[uye_id] <= 0:
+            del adaylar[uye_id]
+
+    def allocate(self, uye_id, tutar, ay, ilk, son, aylar=None):
+        """tutar'ın karşıladığı açık ayları döndürür, uymuyorsa None
+
+        Önce tutarı tek başına karşılayan, hareket ayına (ay) en yakın açık ay
+        aranır (eşitlikte önceki ay); yoksa en eski açık aylardan başlayarak
+        tutara tam denk gelen ardışık aylar alınır. aylar verilirse yalnızca o
+        ay numaralarına bakılır.
+        """
+        acik = self.by_uye.get(uye_id)
+        if not acik:
+            return None
+
+        # Ödemelerin çoğu kendi ayına aittir: aylar yakından uzağa doğrudan denenir
+        for fark in range(max(ay - ilk, son - ay) + 1):
+            for m in ((ay,) if fark == 0 else (ay - fark, ay + fark)):
+                borc = acik.get(m)
+                if (borc is not None and borc[1] == tutar and ilk <= m <= son
+                        and (not aylar or m % 12 + 1 in aylar)):
+                    return [borc]
+
+        toplam = 0
+        secilen = []
+        for m, borc in acik.items():
+            if borc[1] <= 0 or m < ilk or m > son or (aylar and m % 12 + 1 not in aylar):
+                continue
+            toplam += borc[1]
+            secilen.append(borc)
+            if toplam == tutar:
+                return secilen
+            if toplam > tutar:
+                break
+        return None
+
+    def consume(self, uye_id, secilen):
+        for borc in secilen:
+            self._index(borc[1], uye_id, -1)
+            borc[1] = 0
+
+def _ay(tarih, gun=0):
+    d = date.fromisoformat(tarih[:10]) + timedelta(days=gun)
+    return (d.year, d.month)
+
+def _aylar_arasi(ilk, son):
+    yil, ay_no = ilk
+    while (yil, ay_no) <= son:
+        yield yil, ay_no
+        yil, ay_no = (yil + 1, 1) if ay_no == 12 else (yil, ay_no + 1)
+
+def reconcile(start_date, end_date, hesap_id=None, geri_gun=365, ileri_gun=31):
+    """Tarih aralığındaki eşleşmemiş banka gelirlerini dairelerin aidat borçlarıyla eşleştirir
+
+    Daire açıklamadaki daire numarası ya da sakin adından bulunur; bulunamazsa
+    tutara bakılır. Tutar, hareket tarihinden geri_gun önce ile ileri_gun
+    sonrası arasındaki açık aylardan birinin kalanına (hareket ayına en yakın
+    olan) ya da en eski açık ayların toplamına tam denk gelmelidir; açıklamada
+    ay adı varsa o aylar önceliklidir. Arama yapıları uyeler ve borçlardan bir
+    kez kurulur, hareket başına tüm daireler taranmaz. Veritabanına yazmaz.
+    """
+    sonuc = MutabakatSonucu()
+    start = time.perf_counter()
+    ilk_ay = _ay(start_date, -geri_gun)
+    son_ay = _ay(end_date, ileri_gun)
+
+    with get_connection() as conn:
+        # Dönemin tüm hareketleri bellekte tutulur: sqlite3.Row yerine kayıt sınıfı
+        cursor = set_row_format(conn.cursor(), RECORD, "banka_hareketleri")
+        conditions = ["h.tarih BETWEEN ? AND ?", "h.hareket_tipi = 'Gelir'",
+                      "NOT EXISTS (SELECT 1 FROM mutabakat_eslesmeleri m WHERE m.hareket_id = h.id)"]
+        params = [start_date, end_date]
+        if hesap_id is not None:
+            conditions.append("h.hesap_id = ?")
+            params.append(hesap_id)
+        cursor.execute(f"""SELECT h.id, h.hesap_id, h.tarih, h.tutar, h.aciklama
+                           FROM banka_hareketleri h
+                           WHERE {' AND '.join(conditions)}
+                           ORDER BY h.tarih, h.id""", params)
+        hareketler = cursor.fetchall()
+
+        cursor.execute("SELECT id, daire_no, adi_soyadi FROM uyeler")
+        uyeler = cursor.fetchall()
+
+        # Yalnızca içeride kullanılan sonuçlar düz demet olarak okunur
+        cursor.row_factory = None
+        cursor.execute("SELECT yil, ay_no, tutar FROM aidat_tarifeleri WHERE (yil, ay_no) BETWEEN (?, ?) AND (?, ?)",
+                       (*ilk_ay, *son_ay))
+        tarifeler = {(yil, ay_no): tutar for yil, ay_no, tutar in cursor.fetchall()}
+
+        # Gruplama sırası (yil, ay, uye_id) kapsayan indeksle aynı: geçici sıralama yok
+        cursor.execute(f"""SELECT uye_id, yil, {_ay_no_sql('ay')}, SUM(tutar)
+                           FROM aidat_odemeleri
+                           WHERE yil BETWEEN ? AND ?
+                           GROUP BY yil, ay, uye_id""", (ilk_ay[0], son_ay[0]))
+        odenenler = defaultdict(int)
+        for uye_id, yil, ay_no, tutar in cursor.fetchall():
+            odenenler[(uye_id, yil, ay_no)] += tutar or 0
+
+    arama = _Uyeler(uyeler)
+    sonuc.daire_no = {row["id"]: row["daire_no"] for row in uyeler}
+    borclar = _Borclar(list(_aylar_arasi(ilk_ay, son_ay)), tarifeler, odenenler,
+                       [row["id"] for row in uyeler])
+    pencereler = {}  # tarih -> (hareket ayı, pencerenin ilk ayı, son ayı)
+
+    for hareket in hareketler:
+        metin = fold_tr(hareket["aciklama"] or "", normalize_space=True)
+        kelimeler = set(_KELIME_RE.findall(metin))
+        tutar = hareket["tutar"] or 0
+        tarih = hareket["tarih"][:10]
+        if tarih not in pencereler:
+            pencereler[tarih] = tuple(_ay_indeksi(*_ay(tarih, gun)) for gun in (0, -geri_gun, ileri_gun))
+        ay, ilk, son = pencereler[tarih]
+        anilan_aylar = {_AY_NUMARALARI[k] for k in kelimeler if k in _AY_NUMARALARI}
+
+        daireler = arama.daireler(metin)
+        isimler = arama.isimler(kelimeler)
+        if daireler and isimler:
+            adaylar = (daireler & isimler) or (daireler | isimler)
+            neden = "daire no ve isim" if daireler & isimler else "daire no ve isim çelişiyor"
+        elif daireler or isimler:
+            adaylar = daireler or isimler
+            neden = "daire no" if daireler else "isim"
+        else:
+            adaylar = borclar.by_tutar.get(tutar, ())
+            neden = "yalnızca tutar"
+            if not adaylar:
+                sonuc.eslesmeyen.append({"hareket": hareket, "neden": "daire, isim ya da tutar bulunamadı"})
+                continue
+            if len(adaylar) > MAX_TUTAR_ADAYI:
+                sonuc.belirsiz.append({"hareket": hareket, "adaylar": [],
+                                       "neden": f"tutar {len(adaylar)} daireye uyuyor"})
+                continue
+            adaylar = set(adaylar)
+
+        uyanlar = {}
+        for uye_id in adaylar:
+            secilen = None
+            if anilan_aylar:
+                secilen = borclar.allocate(uye_id, tutar, ay, ilk, son, anilan_aylar)
+            if secilen is None:
+                secilen = borclar.allocate(uye_id, tutar, ay, ilk, son)
+            if secilen is not None:
+                uyanlar[uye_id] = secilen
+
+        if len(uyanlar) == 1:
+            uye_id, secilen = next(iter(uyanlar.items()))
+            sonuc.eslesen.append({"hareket": hareket, "uye_id": uye_id, "neden": neden,
+                                  "aylar": [(m // 12, m % 12 + 1, kalan) for m, kalan in secilen]})
+            borclar.consume(uye_id, secilen)
+        elif uyanlar:
+            sonuc.belirsiz.append({"hareket": hareket, "adaylar": sorted(uyanlar),
+                                   "neden": f"{neden}: tutar birden çok daireye uyuyor"})
+        elif neden == "yalnızca tutar":
+            sonuc.eslesmeyen.append({"hareket": hareket, "neden": "tutar açık bir borca uymuyor"})
+        else:
+            sonuc.belirsiz.append({"hareket": hareket, "adaylar": sorted(adaylar),
+                                   "neden": f"{neden}: tutar açık borçlara uymuyor"})
+
+    sonuc.sure = time.perf_counter() - start
+    return sonuc
+
+def apply_matches(eslesmeler):
+    """Eşleşmeleri aidat ödemesi olarak kaydeder, hareketleri eşleşmiş olarak işaretler
+
+    Her eşleşen ay için bir aidat_odemeleri satırı eklenir (ödeme tarihi
+    banka hareketinin tarihidir). Eklenen ödeme sayısını döndürür.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            eklenen = 0
+            for eslesme in eslesmeler:
+                hareket = eslesme["hareket"]
+                for yil, ay_no, tutar in eslesme["aylar"]:
+                    cursor.execute(
+                        "INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar, aciklama) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (eslesme["uye_id"], yil, AY_ISIMLERI[ay_no - 1], hareket["tarih"][:10], tutar,
+                         f"Banka: {hareket['aciklama'] or ''}".strip())
+                    )
+                    cursor.execute("INSERT INTO mutabakat_eslesmeleri (hareket_id, odeme_id) VALUES (?, ?)",
+                                   (hareket["id"], cursor.lastrowid))
+                    eklenen += 1
+            return eklenen
+    except Exception as e:
+        print(f"Mutabakat kaydetme hatası: {str(e)}")
+        return 0
@@ -0,0 +1,433 @@
+import os
+import threading
+import time
+import zlib
+from datetime import date
+from functools import lru_cache
+from itertools import repeat
+
+from export import ExportCancelled
+
+A4 = (595, 842)
+
+# Standart PDF yazı tipleri kullanılır, dosyaya gömülmez. Metin cp1254 ile
+# kodlanır: Türkçe harflerden Ç Ö Ü ç ö ü WinAnsi ile aynı konumdadır, kalan
+# altısı (Ğ İ Ş ğ ı ş) WinAnsi'de başka harflere ait konumları kullanır ve
+# /Differences ile yeniden adlandırılır.
+_KODLAMA = (b"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences "
+            b"[208 /Gbreve 221 /Idotaccent 222 /Scedilla 240 /gbreve 253 /dotlessi 254 /scedilla] >>")
+YAZI_TIPLERI = {"normal": ("F1", "Helvetica"), "kalin": ("F2", "Helvetica-Bold")}
+
+def _genislikler(ascii_genislik, turkce_genislik):
+    # cp1254 bayt değeri -> 1000 birimlik em içindeki genişlik (Adobe AFM)
+    tablo = [556] * 256
+    tablo[32:127] = ascii_genislik
+    for harf, genislik in zip("ÇĞİÖŞÜçğıöşü", turkce_genislik):
+        tablo[harf.encode("cp1254")[0]] = genislik
+    return tablo
+
+_GENISLIK = {
+    "normal": _genislikler(
+        [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278]
+        + [556] * 10
+        + [278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500,
+           667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+           278, 278, 278, 469, 556, 333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222,
+           500, 222, 833, 556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500,
+           334, 260, 334, 584],
+        (722, 778, 278, 778, 667, 722, 500, 556, 278, 556, 500, 556)),
+    "kalin": _genislikler(
+        [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278]
+        + [556] * 10
+        + [333, 333, 584, 584, 584, 611, 975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556,
+           722, 611, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+           333, 278, 333, 584, 556, 333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278,
+           556, 278, 889, 611, 611, 611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500,
+           389, 280, 389, 584],
+        (722, 778, 278, 778, 667, 722, 556, 611, 278, 611, 556, 611)),
+}
+
+AY_ADLARI = ("Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+             "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık")
+
+# Yerleşim şablonları. Koordinatlar nokta (1/72 inç), sol alt köşeden.
+#   yazi X Y YAZI_TIPI BOYUT HIZA METIN      METIN {alan} yer tutucuları içerebilir
+#   cizgi X1 Y1 X2 Y2 KALINLIK
+#   tablo X Y SATIR_ARALIGI YAZI_TIPI BOYUT ALAN
+#   sutun GENISLIK HIZA BASLIK                 son tablo'ya sütun ekler
+# HIZA sol, sag ya da orta; YAZI_TIPI normal ya da kalin.
+SABLONLAR = {
+    "aidat_ekstresi": """
+yazi 50 790 kalin 16 sol {apartman}
+yazi 50 774 normal 9 sol {adres}
+yazi 545 790 kalin 12 sag AİDAT EKSTRESİ
+yazi 545 774 normal 9 sag Dönem: {donem}
+cizgi 50 762 545 762 1
+yazi 50 738 kalin 11 sol Daire {daire_no}
+yazi 50 722 normal 10 sol {adi_soyadi}
+yazi 545 738 normal 9 sag Düzenleme tarihi: {tarih}
+tablo 50 690 16 normal 10 satirlar
+sutun 115 sol Ay
+sutun 95 sag Aidat
+sutun 95 sag Ödenen
+sutun 95 sag Kalan
+sutun 95 sag Gecikme
+cizgi 50 480 545 480 0.5
+yazi 54 466 kalin 10 sol Toplam
+yazi 256 466 kalin 10 sag {toplam_aidat}
+yazi 351 466 kalin 10 sag {toplam_odenen}
+yazi 446 466 kalin 10 sag {toplam_kalan}
+yazi 541 466 kalin 10 sag {toplam_gecikme}
+cizgi 50 450 545 450 0.5
+yazi 50 426 kalin 12 sol Ödenmesi gereken toplam: {toplam_borc} TL
+yazi 50 410 normal 9 sol Fazla ödeme (alacak): {fazla} TL
+yazi 50 386 normal 9 sol Ödemelerinizi açıklamaya daire numaranızı yazarak yapınız.
+cizgi 50 72 545 72 0.5
+yazi 50 60 normal 8 sol {apartman}
+yazi 545 60 normal 8 sag Yönetici: {yonetici}
+""",
+    "genel_rapor": """
+yazi 50 790 kalin 16 sol {apartman}
+yazi 545 790 kalin 12 sag GENEL RAPOR {yil}
+yazi 545 774 normal 9 sag Düzenleme tarihi: {tarih}
+cizgi 50 762 545 762 1
+yazi 50 740 kalin 11 sol Aylık Özet
+tablo 50 718 15 normal 8 aylar
+sutun 67 sol Ay
+sutun 61 sag Tahsil Edilen
+sutun 61 sag Beklenen
+sutun 61 sag Gider (Banka)
+sutun 61 sag Gider (Nakit)
+sutun 61 sag Banka Girişi
+sutun 61 sag Banka Çıkışı
+sutun 61 sag Net
+yazi 50 490 kalin 11 sol Gider Kategorileri
+tablo 50 468 15 normal 8 kategoriler
+sutun 255 sol Kategori
+sutun 80 sag Adet
+sutun 100 sag Toplam
+sutun 60 sag Pay
+""",
+}
+
+def _metin(yazi, boyut, hiza, x, y, metin):
+    # Tek satırlık metnin içerik akışı komutu
+    bayt = metin.encode("cp1254", "replace")
+    if hiza != "sol":
+        genislik = sum(map(_GENISLIK[yazi].__getitem__, bayt)) * boyut / 1000
+        x -= genislik if hiza == "sag" else genislik / 2
+    bayt = bayt.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"BT /%s %g Tf %.2f %.2f Td (%s) Tj ET\n" % (
+        YAZI_TIPLERI[yazi][0].encode("ascii"), boyut, x, y, bayt)
+
+def _cizgi(x1, y1, x2, y2, kalinlik):
+    return b"%g w %g %g m %g %g l S\n" % (kalinlik, x1, y1, x2, y2)
+
+def _hucre_x(x, genislik, hiza):
+    # Hücre içinde 4 nokta kenar boşluğu
+    if hiza == "sag":
+        return x + genislik - 4
+    if hiza == "orta":
+        return x + genislik / 2
+    return x + 4
+
+class Sablon:
+    """Ayrıştırılmış yerleşim şablonu
+
+    Yer tutucu içermeyen yazılar, çizgiler ve tablo başlıkları ayrıştırma
+    sırasında bir kez içerik akışına çevrilir (sabit). Her sayfada yalnızca
+    yer tutuculu yazılar ve tablo satırları bağlamdan üretilir (degisken).
+    """
+    __slots__ = ("ad", "sabit", "degisken")
+
+    def __init__(self, ad, sabit, degisken):
+        self.ad = ad
+        self.sabit = sabit
+        self.degisken = degisken
+
+def parse_template(metin, ad="sablon"):
+    """Şablon metnini Sablon'a çevirir; hatalı satırda ValueError"""
+    sabit = []
+    degisken = []
+    tablo = None
+    for satir_no, satir in enumerate(metin.splitlines(), 1):
+        satir = satir.strip()
+        if not satir or satir.startswith("#"):
+            continue
+        komut, _, kalan = satir.partition(" ")
+        try:
+            if komut == "yazi":
+                x, y, yazi, boyut, hiza, metin_ = kalan.split(" ", 5)
+                if yazi not in YAZI_TIPLERI or hiza not in ("sol", "sag", "orta"):
+                    raise ValueError(f"bilinmeyen yazı tipi ya da hiza: {yazi} {hiza}")
+                islem = (yazi, float(boyut), hiza, float(x), float(y), metin_)
+                if "{" in metin_:
+                    degisken.append(("yazi",) + islem)
+                else:
+                    sabit.append(_metin(*islem))
+                tablo = None
+            elif komut == "cizgi":
+                sabit.append(_cizgi(*(float(deger) for deger in kalan.split())))
+                tablo = None
+            elif komut == "tablo":
+                x, y, aralik, yazi, boyut, alan = kalan.split()
+                if yazi not in YAZI_TIPLERI:
+                    raise ValueError(f"bilinmeyen yazı tipi: {yazi}")
+                tablo = ["tablo", float(x), float(y), float(aralik), yazi, float(boyut), alan, []]
+                degisken.append(tablo)
+            elif komut == "sutun":
+                if tablo is None:
+                    raise ValueError("sutun bir tablo satırını izlemeli")
+                genislik, hiza, baslik = kalan.split(" ", 2)
+                if hiza not in ("sol", "sag", "orta"):
+                    raise ValueError(f"bilinmeyen hiza: {hiza}")
+                tablo[7].append((float(genislik), hiza))
+                # Başlık her sayfada aynıdır
+                x = tablo[1] + sum(g for g, _ in tablo[7][:-1])
+                sabit.append(_metin("kalin", tablo[5], hiza, _hucre_x(x, float(genislik), hiza),
+                                    tablo[2], baslik))
+            else:
+                raise ValueError(f"bilinmeyen komut: {komut}")
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"{ad} şablonu, satır {satir_no}: {e}") from None
+
+    # Tablo başlıklarının altına çizgi
+    for islem in degisken:
+        if islem[0] == "tablo":
+            _, x, y, _, _, _, _, sutunlar = islem
+            sabit.append(_cizgi(x, y - 5, x + sum(g for g, _ in sutunlar), y - 5, 0.5))
+    return Sablon(ad, b"".join(sabit), tuple(
+        tuple(islem[:7]) + (tuple(islem[7]),) if islem[0] == "tablo" else islem for islem in degisken))
+
+@lru_cache(maxsize=None)
+def load_template(ad):
+    """SABLONLAR'daki şablonu ayrıştırır; süreç başına bir kez"""
+    return parse_template(SABLONLAR[ad], ad)
+
+def render_page(sablon, baglam):
+    """Bağlam sözlüğüyle doldurulmuş sayfanın (sıkıştırılmamış) içerik akışı"""
+    parcalar = [sablon.sabit]
+    for islem in sablon.degisken:
+        if islem[0] == "yazi":
+            _, yazi, boyut, hiza, x, y, metin = islem
+            parcalar.append(_metin(yazi, boyut, hiza, x, y, metin.format_map(baglam)))
+        else:
+            _, x, y, aralik, yazi, boyut, alan, sutunlar = islem
+            for i, satir in enumerate(baglam[alan], 1):
+                hucre_x = x
+                for (genislik, hiza), deger in zip(sutunlar, satir):
+                    parcalar.append(_metin(yazi, boyut, hiza, _hucre_x(hucre_x, genislik, hiza),
+                                           y - aralik * i, str(deger)))
+                    hucre_x += genislik
+    return b"".join(parcalar)
+
+class PdfYazici:
+    """Sayfaları geldikçe diske yazan PDF dosyası
+
+    Yazı tipleri ve kaynak sözlüğü dosyanın başında bir kez yazılır, tüm
+    sayfalar bunları paylaşır. Sayfa ağacı ve çapraz başvuru tablosu
+    close()'da eklenir; bellekte yalnızca nesne konumları tutulur. with
+    bloğu hatayla biterse yarım dosya silinir.
+    """
+    def __init__(self, path, boyut=A4):
+        self.path = path
+        self.boyut = boyut
+        self.file = open(path, "wb")
+        # Nesne numarası -> dosya konumu; 1 katalog, 2 sayfa ağacı (sona yazılır)
+        self.konumlar = [0, 0, 0]
+        self.sayfalar = []
+        self.file.write(b"%PDF-1.4\n%\xe7\xf0\xea\xf2\n")
+        kodlama = self._nesne(_KODLAMA)
+        fontlar = [self._nesne(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding %d 0 R >>"
+                               % (ad.encode("ascii"), kodlama))
+                   for _, ad in YAZI_TIPLERI.values()]
+        self.kaynaklar = self._nesne(
+            b"<< /Font << " + b" ".join(b"/%s %d 0 R" % (kisa.encode("ascii"), no)
+                                        for (kisa, _), no in zip(YAZI_TIPLERI.values(), fontlar))
+            + b" >> >>")
+
+    def _nesne(self, govde, no=None):
+        if no is None:
+            no = len(self.konumlar)
+            self.konumlar.append(0)
+        self.konumlar[no] = self.file.tell()
+        self.file.write(b"%d 0 obj\n%s\nendobj\n" % (no, govde))
+        return no
+
+    def add_page(self, akis):
+        """zlib ile sıkıştırılmış içerik akışını yeni sayfa olarak yazar"""
+        icerik = self._nesne(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+                             % (len(akis), akis))
+        self.sayfalar.append(self._nesne(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %d 0 R /Contents %d 0 R >>"
+            % (*self.boyut, self.kaynaklar, icerik)))
+
+    def close(self):
+        self._nesne(b"<< /Type /Pages /Kids [%s] /Count %d >>"
+                    % (b" ".join(b"%d 0 R" % no for no in self.sayfalar), len(self.sayfalar)), 2)
+        self._nesne(b"<< /Type /Catalog /Pages 2 0 R >>", 1)
+        xref = self.file.tell()
+        self.file.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.konumlar))
+        self.file.write(b"".join(b"%010d 00000 n \n" % konum for konum in self.konumlar[1:]))
+        self.file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                        % (len(self.konumlar), xref))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            os.remove(self.path)
+
+# Sayfa üretim süreçleri; ilk paralel işte açılır, uygulama kapanırken kapatılır
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # fork, Tk ve arka plan iş parçacıkları olan süreçte güvenli değildir
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def shutdown_render_pool():
+    """Uygulama kapanırken PDF süreçlerini kapatır"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+def _render_chunk(sablon_adi, baglamlar):
+    # Ayrı süreçte çalışır; şablon süreç başına bir kez ayrıştırılır
+    sablon = load_template(sablon_adi)
+    return [zlib.compress(render_page(sablon, baglam)) for baglam in baglamlar]
+
+def render_pages(sablon_adi, baglamlar, parallel=True, chunk_size=25):
+    """Sayfaların sıkıştırılmış içerik akışlarını sırayla verir
+
+    Sayfalar chunk_size'lık gruplar halinde süreç havuzunda üretilir; gruplar
+    bittikçe sırayla verilir, böylece ilk sayfalar diske yazılırken sonrakiler
+    hâlâ üretilmektedir. Tek çekirdekte ya da tek grupta süreç açılmaz.
+    """
+    gruplar = [baglamlar[i:i + chunk_size] for i in range(0, len(baglamlar), chunk_size)]
+    if parallel and len(gruplar) > 1 and (os.cpu_count() or 1) > 1:
+        sonuclar = _get_pool().map(_render_chunk, repeat(sablon_adi), gruplar)
+    else:
+        sonuclar = map(_render_chunk, repeat(sablon_adi), gruplar)
+    for grup in sonuclar:
+        yield from grup
+
+def write_pdf(path, sablon_adi, baglamlar, progress=None, cancel_event=None, parallel=True):
+    """Her bağlam için bir sayfa olan PDF dosyası yazar
+
+    progress(yazılan, toplam) her sayfadan sonra çağrılır (arka plan iş
+    parçacığından). cancel_event ayarlanırsa ExportCancelled fırlatılır ve
+    yarım dosya silinir. (sayfa_sayısı, süre_sn) döndürür.
+    """
+    start = time.perf_counter()
+    with PdfYazici(path) as pdf:
+        for akis in render_pages(sablon_adi, baglamlar, parallel):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            pdf.add_page(akis)
+            if progress:
+                progress(len(pdf.sayfalar), len(baglamlar))
+    return len(baglamlar), time.perf_counter() - start
+
+def _tutar(deger):
+    return f"{int(deger):,}".replace(",", ".")
+
+def _apartman_bilgileri():
+    # Süreç havuzundaki işçiler veritabanını yüklemesin diye yerel içe aktarma
+    from database import get_apartman_bilgileri
+    apartman = get_apartman_bilgileri()
+    return {"apartman": (apartman["adi"] if apartman else None) or "Apartman Yönetimi",
+            "adres": (apartman["adres"] if apartman else None) or "",
+            "yonetici": (apartman["yonetici"] if apartman else None) or "",
+            "tarih": date.today().strftime("%d.%m.%Y")}
+
+def statement_contexts(yil, ay, gecikme_orani=0.0):
+    """Daire başına aylık aidat ekstresi bağlamları (aidat_ekstresi şablonu)
+
+    Borçlar compute_borclar ile tüm daireler için tek seferde hesaplanır;
+    ekstre yılın başından seçilen ayın sonuna kadarki ayları gösterir.
+    """
+    import calendar
+    from borc import compute_borclar
+
+    son_gun = date(yil, ay, calendar.monthrange(yil, ay)[1])
+    sonuc = compute_borclar(yil, yil, as_of=son_gun, gecikme_orani=gecikme_orani)
+    ortak = _apartman_bilgileri()
+    ortak["donem"] = f"{AY_ADLARI[ay - 1]} {yil}"
+
+    aylar = [AY_ADLARI[ay_no - 1] for _, ay_no in sonuc.aylar]
+    tarife = [_tutar(t) for t in sonuc.tarife.tolist()]
+    toplam_aidat = _tutar(sum(sonuc.tarife.tolist()))
+    odenen, kalan, gecikme = sonuc.odenen.tolist(), sonuc.kalan.tolist(), sonuc.gecikme.tolist()
+    anapara, gecikme_toplam, _, fazla = (dizi.tolist() for dizi in sonuc.daire_toplamlari())
+
+    baglamlar = []
+    for i in range(len(sonuc.uye_idleri)):
+        baglamlar.append({
+            **ortak,
+            "daire_no": sonuc.daire_nolari[i] if sonuc.daire_nolari[i] is not None else "",
+            "adi_soyadi": sonuc.adlar[i] or "",
+            "satirlar": [(ad, t, _tutar(o), _tutar(k), _tutar(g))
+                         for ad, t, o, k, g in zip(aylar, tarife, odenen[i], kalan[i], gecikme[i])],
+            "toplam_aidat": toplam_aidat,
+            "toplam_odenen": _tutar(sum(odenen[i])),
+            "toplam_kalan": _tutar(anapara[i]),
+            "toplam_gecikme": _tutar(gecikme_toplam[i]),
+            "toplam_borc": _tutar(anapara[i] + gecikme_toplam[i]),
+            "fazla": _tutar(fazla[i]),
+        })
+    baglamlar.sort(key=lambda baglam: (not isinstance(baglam["daire_no"], int), baglam["daire_no"]))
+    return baglamlar
+
+def write_statements(path, yil, ay, gecikme_orani=0.0, progress=None, cancel_event=None, parallel=True):
+    """Tüm dairelerin ay ekstrelerini tek PDF'e yazar, her daire bir sayfa"""
+    return write_pdf(path, "aidat_ekstresi", statement_contexts(yil, ay, gecikme_orani),
+                     progress=progress, cancel_event=cancel_event, parallel=parallel)
+
+def general_report_context(yil, en_fazla_kategori=15):
+    """Genel rapor sayfasının bağlamı: aylık özet ve gider kategorileri
+
+    Toplamlar analytics görüntüsünden alınır. En büyük en_fazla_kategori
+    kategori ayrı, kalanlar "Diğer" satırında gösterilir.
+    """
+    from analytics import get_snapshot, OLCULER
+
+    goruntu = get_snapshot()
+    aylik = {olcu: dizi.tolist() for olcu, dizi in goruntu.aylik(yil).items()}
+    aylar = []
+    for ay in range(12):
+        degerler = [aylik[olcu][ay] for olcu in OLCULER]
+        net = aylik["tahsil_edilen"][ay] - aylik["gider_banka"][ay] - aylik["gider_nakit"][ay]
+        aylar.append([AY_ADLARI[ay]] + degerler + [net])
+    aylar.append(["TOPLAM"] + [sum(sutun) for sutun in list(zip(*aylar))[1:]])
+
+    kategoriler = goruntu.gider_kategorileri(yil)
+    if len(kategoriler) > en_fazla_kategori:
+        diger = kategoriler[en_fazla_kategori - 1:]
+        kategoriler = kategoriler[:en_fazla_kategori - 1] + [
+            ("Diğer", sum(adet for _, adet, _ in diger), sum(toplam for _, _, toplam in diger))]
+    genel = sum(toplam for _, _, toplam in kategoriler) or 1
+
+    return {**_apartman_bilgileri(), "yil": yil,
+            "aylar": [[satir[0]] + [_tutar(deger) for deger in satir[1:]] for satir in aylar],
+            "kategoriler": [(kategori or "(kategorisiz)", adet, _tutar(toplam), f"%{toplam / genel * 100:.1f}")
+                            for kategori, adet, toplam in kategoriler]}
+
+def write_general_report(path, yil, progress=None, cancel_event=None):
+    """Yılın genel raporunu tek sayfalık PDF olarak yazar"""
+    return write_pdf(path, "genel_rapor", [general_report_context(yil)],
+                     progress=progress, cancel_event=cancel_event, parallel=False)
@@ -0,0 +1,118 @@
+import json
+from functools import lru_cache
+
+# Karşılaştırma işleçleri: sütun__islec=değer. İşleç verilmezse eşitlik.
+_ISLECLER = {
+    "eq": "{col} = ?",
+    "ne": "{col} <> ?",
+    "lt": "{col} < ?",
+    "lte": "{col} <= ?",
+    "gt": "{col} > ?",
+    "gte": "{col} >= ?",
+    # Liste uzunluğu SQL metnini değiştirmesin diye tek JSON parametresi
+    "in": "{col} IN (SELECT value FROM json_each(?))",
+    "between": "{col} BETWEEN ? AND ?",
+    # LIKE yerine aralık: indeks kullanılabilir, % ve _ özel anlam taşımaz
+    "startswith": "{col} >= ? AND {col} < ?",
+    "isnull": "{col} IS NULL",
+    "notnull": "{col} IS NOT NULL",
+}
+
+class Filter:
+    """Değiştirilemez koşul kümesi: [(sütun, işleç, değer)]
+
+    where() ile oluşturulur, & ile birleştirilir. Koşullar AND ile bağlanır.
+    Aynı sütun/işleç birleşimi her zaman aynı SQL metnini üretir; değerler
+    yalnızca parametre olarak geçer.
+    """
+    __slots__ = ("kosullar",)
+
+    def __init__(self, kosullar=()):
+        self.kosullar = tuple(kosullar)
+
+    def __and__(self, other):
+        return Filter(self.kosullar + other.kosullar)
+
+    def __bool__(self):
+        return bool(self.kosullar)
+
+    def __repr__(self):
+        return "where(" + ", ".join(
+            f"{col}={value!r}" if op == "eq" else f"{col}__{op}={value!r}"
+            for col, op, value in self.kosullar
+        ) + ")"
+
+def where(**kwargs):
+    """where(daire_no=12), where(tarih__gte="2024-01-01", hareket_tipi="Gelir")
+
+    Sütun adları ve değer tipleri sorgu derlenirken tablonun izinli
+    sütunlarına göre denetlenir. isnull/notnull işleçlerinde değer True olmalıdır.
+    """
+    kosullar = []
+    for key, value in kwargs.items():
+        col, _, op = key.partition("__")
+        op = op or "eq"
+        if op not in _ISLECLER:
+            raise ValueError(f"Bilinmeyen işleç: {op}")
+        kosullar.append((col, op, value))
+    return Filter(kosullar)
+
+def _check_value(table, col, tip, value):
+    # bool int'in alt sınıfıdır ama sütun değeri olarak kabul edilmez
+    if value is None or not isinstance(value, tip) or isinstance(value, bool):
+        raise TypeError(f"{table}.{col} için {tip.__name__} beklenir: {value!r}")
+    return value
+
+def _params(table, columns, filtre):
+    params = []
+    for col, op, value in filtre.kosullar:
+        tip = columns[col]
+        if op in ("isnull", "notnull"):
+            if value is not True:
+                raise ValueError(f"{col}__{op} için değer True olmalı")
+        elif op == "in":
+            params.append(json.dumps([_check_value(table, col, tip, v) for v in value], ensure_ascii=False))
+        elif op == "between":
+            alt, ust = value
+            params += [_check_value(table, col, tip, alt), _check_value(table, col, tip, ust)]
+        elif op == "startswith":
+            if tip is not str:
+                raise TypeError(f"{table}.{col} metin sütunu değil")
+            params += [_check_value(table, col, tip, value), value + "\U0010ffff"]
+        else:
+            params.append(_check_value(table, col, tip, value))
+    return params
+
+@lru_cache(maxsize=512)
+def _compile(table, shape, order_by, has_limit):
+    # shape: ((sütun, işleç), ...). Sonuç yalnızca sütun adlarına bağlıdır,
+    # değerlere bağlı değildir; sqlite3 deyim önbelleği her çağrıda isabet eder
+    sql = f"SELECT * FROM {table}"
+    if shape:
+        sql += " WHERE " + " AND ".join(_ISLECLER[op].format(col=col) for col, op in shape)
+    if order_by:
+        sql += " ORDER BY " + ", ".join(
+            f"{col[1:]} DESC" if col.startswith("-") else col for col in order_by
+        )
+    if has_limit:
+        sql += " LIMIT ?"
+    return sql
+
+def compile_select(table, columns, filtre=None, order_by=(), limit=None):
+    """(sql, parametreler) döndürür
+
+    columns izinli sütun -> Python tipi sözlüğüdür; tablo ve sütun adları
+    SQL'e yalnızca bu sözlükten gelir. order_by sütun adları demetidir,
+    "-" ön eki azalan sıralamadır.
+    """
+    filtre = filtre or Filter()
+    if isinstance(order_by, str):
+        order_by = (order_by,)
+    for col in [col for col, _, _ in filtre.kosullar] + [col.lstrip("-") for col in order_by]:
+        if col not in columns:
+            raise ValueError(f"{table} tablosunda izin verilmeyen sütun: {col}")
+    params = _params(table, columns, filtre)
+    if limit is not None:
+        params.append(int(limit))
+    shape = tuple((col, op) for col, op, _ in filtre.kosullar)
+    return _compile(table, shape, tuple(order_by), limit is not None), params
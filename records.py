@@ -0,0 +1,178 @@
+from array import array
+from functools import lru_cache
+from keyword import iskeyword
+from operator import itemgetter
+
+# Sorgu başına satır biçimleri
+ROW = "row"          # sqlite3.Row (bağlantının varsayılanı)
+TUPLE = "tuple"      # düz demet: en ucuzu, yalnızca sıra ile erişim
+RECORD = "record"    # tabloya özel kayıt sınıfı: demet kadar yer, sütun adıyla da erişim
+COLUMNS = "columns"  # sütun sütun: tamsayılar array('q'), tekrar eden metinler paylaşılır
+ROW_FORMATS = (ROW, TUPLE, RECORD, COLUMNS)
+
+class Kayit(tuple):
+    """Kayıt sınıflarının tabanı
+
+    sqlite3.Row'un okuma arayüzünü taklit eder: row[0], row["tutar"],
+    row.keys(), dict(row); sütunlar ayrıca nitelik olarak da okunur
+    (row.tutar). Örnek başına sözlük yoktur (__slots__ = ()), bellekte düz
+    demet kadar yer kaplar.
+    """
+    __slots__ = ()
+    _sutunlar = ()
+    _indeks = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            indeks = self._indeks.get(key)
+            if indeks is None:
+                # sqlite3.Row gibi büyük/küçük harf duyarsız
+                indeks = self._indeks.get(key.lower())
+                if indeks is None:
+                    raise IndexError(f"Sütun yok: {key}")
+            key = indeks
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self._sutunlar)
+
+    def _asdict(self):
+        return dict(zip(self._sutunlar, self))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" + ", ".join(
+            f"{name}={value!r}" for name, value in zip(self._sutunlar, self)) + ")"
+
+    def __reduce__(self):
+        # Sınıflar çalışma anında üretildiğinden adıyla değil, sütunlarıyla saklanır
+        return _kayit, (type(self).__name__, self._sutunlar, tuple(self))
+
+def _kayit(name, sutunlar, values):
+    return record_class(name, sutunlar)(values)
+
+@lru_cache(maxsize=256)
+def record_class(name, sutunlar):
+    """name adlı, sutunlar sıralı kayıt sınıfı; aynı tablo ve sütunlar için aynı sınıf"""
+    sutunlar = tuple(sutunlar)
+    ozellikler = {"__slots__": (), "_sutunlar": sutunlar,
+                  "_indeks": {**{s.lower(): i for i, s in enumerate(sutunlar)},
+                              **{s: i for i, s in enumerate(sutunlar)}}}
+    for i, sutun in enumerate(sutunlar):
+        # "COUNT(*)" gibi adlar ve yöntemlerle çakışanlar yalnızca row["..."] ile okunur
+        if sutun.isidentifier() and not iskeyword(sutun) and not hasattr(Kayit, sutun):
+            ozellikler.setdefault(sutun, property(itemgetter(i)))
+    sinif_adi = name if name.isidentifier() else "Kayit"
+    return type(sinif_adi, (Kayit,), ozellikler)
+
+def record_factory(name="Kayit"):
+    """Kayıt sınıfı üreten row_factory
+
+    Sınıf imlecin sütunlarına göre bir kez seçilir; satır başına yalnızca
+    demet oluşturulur.
+    """
+    son = (None, None)  # (cursor.description, sınıf); tek okumada birlikte alınır
+
+    def factory(cursor, row):
+        nonlocal son
+        description, sinif = son
+        if cursor.description is not description:
+            description = cursor.description
+            sinif = record_class(name, tuple(d[0] for d in description))
+            son = (description, sinif)
+        return tuple.__new__(sinif, row)
+    return factory
+
+class Sutunlar:
+    """Sütun sütun sonuç kümesi
+
+    sonuc["tutar"] bir sütunun tüm değerlerini, sonuc[i] i. satırı (demet)
+    verir; len() satır sayısıdır. Tamsayı sütunları array('q') içinde
+    değer başına 8 baytta tutulur.
+    """
+    __slots__ = ("names", "columns", "_indeks")
+
+    def __init__(self, names, columns):
+        self.names = tuple(names)
+        self.columns = columns
+        self._indeks = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[self._indeks[key]]
+        return tuple(column[key] for column in self.columns)
+
+    def __iter__(self):
+        return zip(*self.columns)
+
+    def keys(self):
+        return list(self.names)
+
+def fetch_columns(cursor, batch_size=5000):
+    """Yürütülmüş imlecin kalan satırlarını Sutunlar olarak okur
+
+    Satırlar batch_size'lık gruplar halinde sütunlara aktarılır; tüm
+    sonuç hiçbir an satır nesneleri olarak bellekte durmaz. Metin sütunlarında
+    tekrar eden değerler (tarih, tür, ay adı) tek nesneyi paylaşır; değerlerin
+    yarıdan fazlası farklı çıkan sütunlarda paylaşım bırakılır.
+    """
+    cursor.row_factory = None
+    names = [d[0] for d in cursor.description]
+    columns = [array("q") for _ in names]
+    paylasim = [{} for _ in names]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for i, values in enumerate(zip(*rows)):
+            column = columns[i]
+            if type(column) is array:
+                uzunluk = len(column)
+                try:
+                    column.extend(values)
+                    continue
+                except TypeError:
+                    # İlk tamsayı olmayan değer (metin, ondalık, NULL): sütun listeye döner
+                    del column[uzunluk:]
+                    column = columns[i] = list(column)
+            sozluk = paylasim[i]
+            if sozluk is not None:
+                # SQLite değerlerinin hepsi hash'lenebilir; eşit değerler tek nesneye iner
+                values = list(map(sozluk.setdefault, values, values))
+                if len(sozluk) > (len(column) + len(values)) // 2:
+                    paylasim[i] = None
+            column.extend(values)
+    return Sutunlar(names, columns)
+
+def fetch_all(cursor, row_format=RECORD, name="Kayit", batch_size=5000):
+    """Yürütülmüş imlecin tüm satırlarını istenen biçimde döndürür"""
+    if row_format == COLUMNS:
+        return fetch_columns(cursor, batch_size)
+    if row_format == RECORD and cursor.description:
+        # Sütunlar belli: satırlar demet olarak okunup gruplar halinde C tarafında
+        # sınıfa çevrilir, satır başına Python çağrısı yapılmaz
+        cursor.row_factory = None
+        sinif = record_class(name, tuple(d[0] for d in cursor.description))
+        rows = []
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return rows
+            rows.extend(map(sinif, batch))
+    set_row_format(cursor, row_format, name)
+    return cursor.fetchall()
+
+def set_row_format(cursor, row_format, name="Kayit"):
+    """İmlecin satır biçimini ayarlar (ROW, TUPLE ya da RECORD); imleci döndürür"""
+    if row_format == ROW:
+        # Bağlantının varsayılanı sqlite3.Row'dur
+        cursor.row_factory = cursor.connection.row_factory
+    elif row_format == TUPLE:
+        cursor.row_factory = None
+    elif row_format == RECORD:
+        cursor.row_factory = record_factory(name)
+    else:
+        raise ValueError(f"Bilinmeyen satır biçimi: {row_format}")
+    return cursor
@@ -4,12 +4,25 @@ import csv
 from datetime import datetime
 import calendar
 import os
+import time
 from utils import (
     center_window, format_currency, create_scrollable_frame, setup_treeview,
     create_combobox_with_label, create_entry_with_label, get_month_name
 )
+import threading
+from db_executor import BackgroundLoader, get_executor, run_in_background
+from export import export_table, available_formats, ExportCancelled
+from importer import import_banka_ekstresi, import_aidat_odemeleri
+from mutabakat import reconcile, apply_matches
+from borc import compute_borclar
+from analytics import get_snapshot, OLCULER
+from tenants import consolidated_report
+from pdf import AY_ADLARI, statement_contexts, write_statements, write_general_report
+from metrics import metrics, SLOW_QUERY_MS, WINDOW_SECONDS
+from cache import query_cache
+from search import search, search_index_ready
 from database import (
-    create_connection, get_all_uyeler, get_aidat_for_year, get_aidat_odemeler_by_uye,
+    create_connection, get_aidat_for_year, get_aidat_odemeler_by_uye,
     get_giderler, get_all_banka_hesaplari, get_banka_hareketleri
 )
 
@@ -48,3 +61,666 @@ class ReportBase:
         # Kapat butonu
         ttk.Button(self.button_frame, text="Kapat", 
                   command=self.window.destroy).pack(side="right", padx=5)
+        
+        # Arka plan sorguları ve yükleniyor göstergesi
+        self.loader = BackgroundLoader(self.window, self.button_frame)
+    
+    def load_async(self, fn, *args, on_success=None, key=None, **kwargs):
+        """Rapor verisini arka planda yükler, sonucu on_success'e verir
+
+        Aynı sorgu yeniden istendiğinde (örn. filtre değişince) önceki
+        isteğin sonucu yok sayılır.
+        """
+        return self.loader.load(fn, *args, on_success=on_success, key=key, **kwargs)
+
+class BorcRaporu(ReportBase):
+    """Daire bazında birikmiş aidat borçları ve gecikme tutarları"""
+    def __init__(self, parent):
+        super().__init__(parent, "Daire Borç Durumu", width=950, height=650)
+
+        year = datetime.now().year
+        years = [str(y) for y in range(year - 30, year + 1)]
+        start_frame, self.start_combo = create_combobox_with_label(
+            self.toolbar_frame, "Başlangıç:", values=years, default=str(year - 1), width=6)
+        start_frame.pack(side="left", padx=5)
+        end_frame, self.end_combo = create_combobox_with_label(
+            self.toolbar_frame, "Bitiş:", values=years, default=str(year), width=6)
+        end_frame.pack(side="left", padx=5)
+        rate_frame, self.rate_entry = create_entry_with_label(
+            self.toolbar_frame, "Aylık gecikme (%):", width=5)
+        self.rate_entry.insert(0, "0")
+        rate_frame.pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="Hesapla", command=self.run).pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        columns = ("daire_no", "adi_soyadi", "borclu_ay", "anapara", "gecikme", "toplam", "fazla")
+        headings = ("Daire", "Adı Soyadı", "Borçlu Ay", "Anapara", "Gecikme", "Toplam", "Fazla Ödeme")
+        widths = (60, 220, 80, 110, 110, 120, 110)
+
+        def format_row(row):
+            return row[:3] + tuple(format_currency(value) for value in row[3:])
+
+        frame, self.tree = setup_treeview(self.content_frame, columns, headings, widths,
+                                          virtual=True, formatter=format_row)
+        frame.pack(fill="both", expand=True)
+        self.run()
+
+    def run(self):
+        try:
+            start_year, end_year = int(self.start_combo.get()), int(self.end_combo.get())
+            rate = float(self.rate_entry.get().replace(",", ".") or 0) / 100
+        except ValueError:
+            messagebox.showerror("Hata", "Yıl ve gecikme oranı sayı olmalıdır.", parent=self.window)
+            return
+        self.load_async(compute_borclar, min(start_year, end_year), max(start_year, end_year),
+                        gecikme_orani=rate, on_success=self.show)
+
+    def show(self, sonuc):
+        anapara, gecikme, borclu_ay, fazla = sonuc.daire_toplamlari()
+        rows = [(sonuc.daire_nolari[i], sonuc.adlar[i] or "", int(borclu_ay[i]), int(anapara[i]),
+                 int(gecikme[i]), int(anapara[i] + gecikme[i]), int(fazla[i]))
+                for i in range(len(sonuc.uye_idleri))]
+        rows.sort(key=lambda row: row[5], reverse=True)
+        self.tree.set_rows(rows)
+
+        toplam_anapara, toplam_gecikme, borclu_daire = sonuc.genel_toplam()
+        self.summary_label.configure(
+            text=f"Borçlu daire: {borclu_daire}  Anapara: {format_currency(toplam_anapara)} TL  "
+                 f"Gecikme: {format_currency(toplam_gecikme)} TL  ({sonuc.sure * 1000:.0f} ms)"
+        )
+
+class GenelRaporForm(ReportBase):
+    """Aidat, gider ve banka verilerinin aylık, kategori ve yıllar arası özeti
+
+    Hesaplar analytics görüntüsü üzerinde yapılır; rapor her açıldığında
+    yalnızca son görüntüden sonra eklenen satırlar okunur.
+    """
+    BASLIKLAR = ("Tahsil Edilen", "Beklenen", "Gider (Banka)", "Gider (Nakit)", "Banka Girişi", "Banka Çıkışı")
+
+    def __init__(self, parent):
+        super().__init__(parent, "Genel Rapor", width=1100, height=650)
+
+        year = datetime.now().year
+        years = [str(y) for y in range(year - 30, year + 1)]
+        year_frame, self.year_combo = create_combobox_with_label(
+            self.toolbar_frame, "Yıl:", values=years, default=str(year), width=6)
+        year_frame.pack(side="left", padx=5)
+        self.year_combo.bind("<<ComboboxSelected>>", lambda event: self.run())
+        ttk.Button(self.toolbar_frame, text="Yenile", command=self.run).pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="PDF", command=self.save_pdf).pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        def format_amounts(row, start):
+            return row[:start] + tuple(format_currency(value) for value in row[start:])
+
+        def format_change(row):
+            return (row[0],) + tuple(f"{format_currency(bu)} / {format_currency(onceki)}"
+                                     + ("" if oran is None else f" (%{oran * 100:+.0f})")
+                                     for bu, onceki, oran in row[1:])
+
+        notebook = ttk.Notebook(self.content_frame)
+        notebook.pack(fill="both", expand=True)
+        frame, self.month_tree = setup_treeview(
+            notebook, ("ay",) + OLCULER + ("net",), ("Ay",) + self.BASLIKLAR + ("Net",),
+            (90,) + (130,) * (len(OLCULER) + 1), virtual=True, formatter=lambda row: format_amounts(row, 1))
+        notebook.add(frame, text="Aylık")
+        frame, self.category_tree = setup_treeview(
+            notebook, ("kategori", "adet", "toplam", "oran"), ("Gider Kategorisi", "Adet", "Toplam", "Pay"),
+            (300, 80, 140, 80), virtual=True,
+            formatter=lambda row: (row[0], row[1], format_currency(row[2]), f"%{row[3] * 100:.1f}"))
+        notebook.add(frame, text="Gider Kategorileri")
+        frame, self.compare_tree = setup_treeview(
+            notebook, ("ay",) + OLCULER, ("Ay (bu yıl / geçen yıl)",) + self.BASLIKLAR,
+            (150,) + (150,) * len(OLCULER), virtual=True, formatter=format_change)
+        notebook.add(frame, text="Geçen Yılla Karşılaştırma")
+        self.run()
+
+    def run(self):
+        self.load_async(self._hesapla, int(self.year_combo.get()), on_success=self.show, key="genel")
+
+    def save_pdf(self):
+        yil = int(self.year_combo.get())
+        save_pdf(self.window, f"genel_rapor_{yil}.pdf", write_general_report, yil)
+
+    @staticmethod
+    def _hesapla(yil):
+        goruntu = get_snapshot()
+        aylik = goruntu.aylik(yil)
+        kategoriler = goruntu.gider_kategorileri(yil)
+        return goruntu, aylik, kategoriler, goruntu.yil_karsilastirma(yil)
+
+    def show(self, result):
+        goruntu, aylik, kategoriler, karsilastirma = result
+        net = aylik["tahsil_edilen"] - aylik["gider_banka"] - aylik["gider_nakit"]
+        rows = [(get_month_name(ay).capitalize(),) + tuple(int(aylik[olcu][ay - 1]) for olcu in OLCULER)
+                + (int(net[ay - 1]),) for ay in range(1, 13)]
+        rows.append(("TOPLAM",) + tuple(int(aylik[olcu].sum()) for olcu in OLCULER) + (int(net.sum()),))
+        self.month_tree.set_rows(rows)
+
+        genel = sum(toplam for _, _, toplam in kategoriler) or 1
+        self.category_tree.set_rows([(kategori, adet, toplam, toplam / genel)
+                                     for kategori, adet, toplam in kategoriler])
+        self.compare_tree.set_rows([(get_month_name(ay_no).capitalize() if ay_no else "TOPLAM",)
+                                    + tuple(olculer[olcu] for olcu in OLCULER)
+                                    for ay_no, olculer in karsilastirma])
+        self.summary_label.configure(
+            text=f"{sum(len(tablo) for tablo in goruntu.tablolar.values()):,} kayıt bellekte "
+                 f"({goruntu.nbytes() / 1e6:.1f} MB), yenileme {goruntu.yenilenen_satir:,} satır, "
+                 f"{goruntu.sure * 1000:.0f} ms"
+        )
+
+class EkstreForm(ReportBase):
+    """Dairelerin aylık aidat ekstreleri: önizleme ve tek PDF'te toplu çıktı"""
+    def __init__(self, parent):
+        super().__init__(parent, "Aidat Ekstreleri", width=950, height=650)
+
+        today = datetime.now()
+        years = [str(y) for y in range(today.year - 30, today.year + 1)]
+        year_frame, self.year_combo = create_combobox_with_label(
+            self.toolbar_frame, "Yıl:", values=years, default=str(today.year), width=6)
+        year_frame.pack(side="left", padx=5)
+        month_frame, self.month_combo = create_combobox_with_label(
+            self.toolbar_frame, "Ay:", values=AY_ADLARI, default=AY_ADLARI[today.month - 1], width=9)
+        month_frame.pack(side="left", padx=5)
+        rate_frame, self.rate_entry = create_entry_with_label(
+            self.toolbar_frame, "Aylık gecikme (%):", width=5)
+        self.rate_entry.insert(0, "0")
+        rate_frame.pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="Önizle", command=self.run).pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="PDF Oluştur", command=self.save_pdf).pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        columns = ("daire_no", "adi_soyadi", "aidat", "odenen", "kalan", "gecikme", "toplam")
+        headings = ("Daire", "Adı Soyadı", "Aidat", "Ödenen", "Kalan", "Gecikme", "Ödenecek")
+        widths = (60, 220, 100, 100, 100, 100, 110)
+        frame, self.tree = setup_treeview(self.content_frame, columns, headings, widths, virtual=True)
+        frame.pack(fill="both", expand=True)
+        self.run()
+
+    def _params(self):
+        try:
+            rate = float(self.rate_entry.get().replace(",", ".") or 0) / 100
+            return int(self.year_combo.get()), AY_ADLARI.index(self.month_combo.get()) + 1, rate
+        except ValueError:
+            messagebox.showerror("Hata", "Yıl, ay ve gecikme oranını kontrol edin.", parent=self.window)
+            return None
+
+    def run(self):
+        params = self._params()
+        if params:
+            self.load_async(statement_contexts, *params, on_success=self.show, key="ekstre")
+
+    def show(self, baglamlar):
+        self.tree.set_rows([(b["daire_no"], b["adi_soyadi"], b["toplam_aidat"], b["toplam_odenen"],
+                             b["toplam_kalan"], b["toplam_gecikme"], b["toplam_borc"]) for b in baglamlar])
+        self.summary_label.configure(text=f"{len(baglamlar)} daire")
+
+    def save_pdf(self):
+        params = self._params()
+        if not params:
+            return
+        yil, ay, rate = params
+        save_pdf(self.window, f"aidat_ekstresi_{yil}_{ay:02d}.pdf", write_statements, yil, ay, rate)
+
+class KonsolideRapor(ReportBase):
+    """Tüm binaların toplamları; her bina ayrı süreçte hesaplanır"""
+    def __init__(self, parent):
+        super().__init__(parent, "Konsolide Bina Raporu", width=1000, height=600)
+
+        year = datetime.now().year
+        years = [str(y) for y in range(year - 30, year + 1)]
+        start_frame, self.start_combo = create_combobox_with_label(
+            self.toolbar_frame, "Başlangıç:", values=years, default=str(year), width=6)
+        start_frame.pack(side="left", padx=5)
+        end_frame, self.end_combo = create_combobox_with_label(
+            self.toolbar_frame, "Bitiş:", values=years, default=str(year), width=6)
+        end_frame.pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="Hesapla", command=self.run).pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        columns = ("kod", "adi", "daire_sayisi", "tahsil_edilen", "beklenen", "gider",
+                   "banka_bakiye", "borc", "borclu_daire")
+        headings = ("Kod", "Bina", "Daire", "Tahsil Edilen", "Beklenen", "Gider",
+                    "Banka Bakiyesi", "Aidat Borcu", "Borçlu Daire")
+        widths = (70, 200, 60, 110, 110, 110, 120, 110, 90)
+
+        def format_row(row):
+            return row[:3] + tuple(format_currency(value) for value in row[3:8]) + row[8:]
+
+        frame, self.tree = setup_treeview(self.content_frame, columns, headings, widths,
+                                          virtual=True, formatter=format_row)
+        frame.pack(fill="both", expand=True)
+        self.run()
+
+    def run(self):
+        start_year, end_year = int(self.start_combo.get()), int(self.end_combo.get())
+        self.load_async(consolidated_report, min(start_year, end_year), max(start_year, end_year),
+                        on_success=self.show)
+
+    def show(self, result):
+        satirlar, toplam = result
+        keys = ("daire_sayisi", "tahsil_edilen", "beklenen", "gider", "banka_bakiye", "borc", "borclu_daire")
+        rows = [(satir["kod"], satir["adi"] if satir["hata"] is None else f"{satir['adi']} (hata: {satir['hata']})")
+                + tuple(satir[key] for key in keys) for satir in satirlar]
+        rows.append(("", "TOPLAM") + tuple(toplam[key] for key in keys))
+        self.tree.set_rows(rows)
+        hatali = sum(1 for satir in satirlar if satir["hata"] is not None)
+        self.summary_label.configure(
+            text=f"{len(satirlar)} bina" + (f", {hatali} bina okunamadı" if hatali else "")
+        )
+
+class PerformansRaporu(ReportBase):
+    """Sorgu süreleri, yavaş sorgular ve menü gecikmeleri (son WINDOW_SECONDS saniye)"""
+    def __init__(self, parent):
+        super().__init__(parent, "Performans", width=1100, height=650)
+
+        ttk.Button(self.toolbar_frame, text="Yenile", command=self.refresh).pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="Sıfırla", command=self.reset).pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        def format_ms(row, start, end):
+            return row[:start] + tuple(f"{value:.2f}" for value in row[start:end]) + row[end:]
+
+        notebook = ttk.Notebook(self.content_frame)
+        notebook.pack(fill="both", expand=True)
+        frame, self.query_tree = setup_treeview(
+            notebook, ("sorgu", "adet", "ort", "p50", "p95", "max", "satir", "hata"),
+            ("Sorgu", "Adet", "Ort. ms", "p50 ms", "p95 ms", "En Büyük ms", "Satır", "Hata"),
+            (480, 60, 70, 70, 70, 90, 80, 50), virtual=True, formatter=lambda row: format_ms(row, 2, 6))
+        notebook.add(frame, text="Sorgular")
+        frame, self.slow_tree = setup_treeview(
+            notebook, ("zaman", "ms", "sorgu", "plan"), ("Zaman", "Süre ms", "Sorgu", "Plan"),
+            (130, 70, 450, 400), virtual=True, formatter=lambda row: format_ms(row, 1, 2))
+        notebook.add(frame, text=f"Yavaş Sorgular (>{SLOW_QUERY_MS} ms)")
+        frame, self.ui_tree = setup_treeview(
+            notebook, ("eylem", "adet", "ort", "p50", "p95", "max"),
+            ("Menü Eylemi", "Adet", "Ort. ms", "p50 ms", "p95 ms", "En Büyük ms"),
+            (300, 60, 80, 80, 80, 90), virtual=True, formatter=lambda row: format_ms(row, 2, 6))
+        notebook.add(frame, text="Arayüz Gecikmesi")
+        self.refresh()
+
+    def refresh(self):
+        keys = ("avg", "p50", "p95", "max")
+        self.query_tree.set_rows([(shape, ozet["count"]) + tuple(ozet[key] for key in keys) + (ozet["rows"], hata)
+                                  for shape, ozet, hata in metrics.query_stats()])
+        self.slow_tree.set_rows([(zaman, ms, " ".join(sql.split()), " | ".join(plan))
+                                 for zaman, ms, sql, plan in metrics.slow_queries()])
+        self.ui_tree.set_rows([(eylem, ozet["count"]) + tuple(ozet[key] for key in keys)
+                               for eylem, ozet in metrics.ui_stats()])
+        stats = query_cache.stats()
+        self.summary_label.configure(
+            text=f"Son {WINDOW_SECONDS // 60} dakika. Önbellek: %{stats['hit_ratio'] * 100:.0f} isabet "
+                 f"({stats['hits']}/{stats['hits'] + stats['misses']}), {stats['entries']} kayıt, "
+                 f"{stats['rows']} satır"
+        )
+
+    def reset(self):
+        metrics.reset()
+        query_cache.reset_stats()
+        self.refresh()
+
+class AramaPenceresi(ReportBase):
+    """Üyeler, giderler, banka hareketleri ve aidat ödemelerinde genel arama"""
+    KAYNAKLAR = {"Tümü": None, "Üyeler": ("uyeler",), "Giderler": ("giderler",),
+                 "Banka Hareketleri": ("banka_hareketleri",), "Aidat Ödemeleri": ("aidat_odemeleri",)}
+    KAYNAK_ADLARI = {"uyeler": "Üye", "giderler": "Gider", "banka_hareketleri": "Banka",
+                     "aidat_odemeleri": "Aidat"}
+
+    def __init__(self, parent, text=""):
+        super().__init__(parent, "Arama", width=1000, height=600)
+        self._bekleyen = None
+
+        entry_frame, self.entry = create_entry_with_label(self.toolbar_frame, "Ara:", width=40)
+        entry_frame.pack(side="left", padx=5)
+        kaynak_frame, self.kaynak_combo = create_combobox_with_label(
+            self.toolbar_frame, "Kaynak:", values=list(self.KAYNAKLAR), default="Tümü", width=18)
+        kaynak_frame.pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        columns = ("kaynak", "tarih", "baslik", "tutar", "aciklama")
+        headings = ("Kaynak", "Tarih", "Kayıt", "Tutar", "Açıklama / İletişim")
+        widths = (70, 90, 250, 100, 420)
+
+        def format_row(row):
+            return row[:3] + ("" if row[3] is None else format_currency(row[3]),) + row[4:]
+
+        frame, self.tree = setup_treeview(self.content_frame, columns, headings, widths,
+                                          virtual=True, formatter=format_row)
+        frame.pack(fill="both", expand=True)
+
+        # Yazarken ara: son tuştan kısa süre sonra; eski isteklerin sonucu yok sayılır
+        self.entry.bind("<KeyRelease>", lambda event: self._schedule())
+        self.entry.bind("<Return>", lambda event: self.run())
+        self.kaynak_combo.bind("<<ComboboxSelected>>", lambda event: self.run())
+        self.entry.insert(0, text)
+        self.entry.focus_set()
+        if text:
+            self.run()
+
+    def _schedule(self):
+        if self._bekleyen is not None:
+            self.window.after_cancel(self._bekleyen)
+        self._bekleyen = self.window.after(250, self.run)
+
+    def run(self):
+        self._bekleyen = None
+        text = self.entry.get().strip()
+        if not text:
+            self.tree.set_rows([])
+            self.summary_label.configure(text="")
+            return
+        self.load_async(self._search, text, self.KAYNAKLAR[self.kaynak_combo.get()],
+                        on_success=self.show, key="arama")
+
+    @staticmethod
+    def _search(text, kaynaklar):
+        start = time.perf_counter()
+        if not search_index_ready():
+            return None, 0.0
+        return search(text, kaynaklar=kaynaklar), time.perf_counter() - start
+
+    def show(self, result):
+        sonuclar, sure = result
+        if sonuclar is None:
+            self.summary_label.configure(text="Arama dizini hazırlanıyor, biraz sonra tekrar deneyin")
+            return
+        self.tree.set_rows([(self.KAYNAK_ADLARI[s["kaynak"]], s["tarih"] or "", s["baslik"], s["tutar"],
+                             s["aciklama"] or "") for s in sonuclar])
+        self.summary_label.configure(text=f"{len(sonuclar)} sonuç ({sure * 1000:.0f} ms)")
+
+class MutabakatRaporu(ReportBase):
+    """Banka gelirlerini dairelerin aidat borçlarıyla eşleştirir"""
+    def __init__(self, parent):
+        super().__init__(parent, "Banka - Aidat Mutabakatı", width=1000, height=650)
+        self.sonuc = None
+
+        year = datetime.now().year
+        year_frame, self.year_combo = create_combobox_with_label(
+            self.toolbar_frame, "Yıl:", values=[str(y) for y in range(year - 5, year + 1)],
+            default=str(year), width=8
+        )
+        year_frame.pack(side="left", padx=5)
+        ttk.Button(self.toolbar_frame, text="Eşleştir", command=self.run).pack(side="left", padx=5)
+        self.save_button = ttk.Button(self.toolbar_frame, text="Eşleşenleri Kaydet",
+                                      command=self.save, state="disabled")
+        self.save_button.pack(side="left", padx=5)
+        self.summary_label = ttk.Label(self.toolbar_frame, text="")
+        self.summary_label.pack(side="left", padx=10)
+
+        notebook = ttk.Notebook(self.content_frame)
+        notebook.pack(fill="both", expand=True)
+        columns = ("tarih", "tutar", "aciklama", "daire", "neden")
+        headings = ("Tarih", "Tutar", "Açıklama", "Daire / Adaylar", "Neden")
+        widths = (90, 90, 380, 150, 250)
+        self.trees = {}
+        for key, title in (("eslesen", "Eşleşen"), ("belirsiz", "Belirsiz"), ("eslesmeyen", "Eşleşmeyen")):
+            frame, tree = setup_treeview(notebook, columns, headings, widths, virtual=True)
+            notebook.add(frame, text=title)
+            self.trees[key] = tree
+
+    def run(self):
+        year = int(self.year_combo.get())
+        self.save_button.configure(state="disabled")
+        self.load_async(reconcile, f"{year}-01-01", f"{year}-12-31", on_success=self.show)
+
+    def show(self, sonuc):
+        self.sonuc = sonuc
+        daire_no = sonuc.daire_no
+
+        def satir(kayit, daire):
+            hareket = kayit["hareket"]
+            return (hareket["tarih"], format_currency(hareket["tutar"]), hareket["aciklama"] or "",
+                    daire, kayit["neden"])
+
+        self.trees["eslesen"].set_rows([
+            satir(k, f"{daire_no.get(k['uye_id'])} ({', '.join(f'{ay}/{yil}' for yil, ay, _ in k['aylar'])})")
+            for k in sonuc.eslesen
+        ])
+        self.trees["belirsiz"].set_rows([
+            satir(k, ", ".join(str(daire_no.get(uye_id)) for uye_id in k["adaylar"][:10]))
+            for k in sonuc.belirsiz
+        ])
+        self.trees["eslesmeyen"].set_rows([satir(k, "") for k in sonuc.eslesmeyen])
+        self.summary_label.configure(
+            text=f"{len(sonuc.eslesen)} eşleşen, {len(sonuc.belirsiz)} belirsiz, "
+                 f"{len(sonuc.eslesmeyen)} eşleşmeyen ({sonuc.sure * 1000:.0f} ms)"
+        )
+        if sonuc.eslesen:
+            self.save_button.configure(state="normal")
+
+    def save(self):
+        if not self.sonuc or not messagebox.askyesno(
+                "Onay", f"{len(self.sonuc.eslesen)} eşleşme aidat ödemesi olarak kaydedilsin mi?",
+                parent=self.window):
+            return
+        self.save_button.configure(state="disabled")
+        self.load_async(apply_matches, self.sonuc.eslesen, on_success=self.saved)
+
+    def saved(self, eklenen):
+        messagebox.showinfo("Bilgi", f"{eklenen} aidat ödemesi kaydedildi.", parent=self.window)
+        self.run()
+
+def _run_with_progress(parent, title, text, unit, action, fn, *args, on_done=None):
+    """fn(*args, progress=..., cancel_event=...) işini arka planda çalıştırır
+
+    İlerleme çubuğu ve iptal düğmesi olan bir pencere gösterilir; arayüz
+    beklemez. fn progress(yapılan, toplam) çağırır, iptalde ExportCancelled
+    fırlatır. İş bitince pencere kapanır ve sonuç on_done(sonuç)'a verilir;
+    iptal ve hata mesajlarında action ("Dışa aktarma" gibi) kullanılır.
+    """
+    window = tk.Toplevel(parent)
+    window.title(title)
+    window.geometry("400x150")
+    window.transient(parent)
+    center_window(window)
+
+    status_label = ttk.Label(window, text=text)
+    status_label.pack(pady=(20, 10))
+    progress_bar = ttk.Progressbar(window, mode="determinate", length=300, maximum=1)
+    progress_bar.pack(pady=5)
+
+    cancel_event = threading.Event()
+    ttk.Button(window, text="İptal", command=cancel_event.set).pack(pady=10)
+    window.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+    # Arka plan iş parçacığı yalnızca bu sözlüğü günceller; arayüz okur
+    state = {"written": 0, "total": 0}
+
+    def on_progress(written, total):
+        state["written"] = written
+        state["total"] = total
+
+    future = get_executor().submit(fn, *args, progress=on_progress, cancel_event=cancel_event)
+
+    def poll():
+        if state["total"]:
+            progress_bar.configure(maximum=state["total"], value=state["written"])
+            status_label.configure(
+                text=f"{state['written']:,} / {state['total']:,} {unit}".replace(",", "."))
+        if not future.done():
+            window.after(100, poll)
+            return
+
+        window.destroy()
+        error = future.exception()
+        if isinstance(error, ExportCancelled):
+            messagebox.showinfo("Bilgi", f"{action} iptal edildi.", parent=parent)
+        elif error is not None:
+            messagebox.showerror("Hata", f"{action} hatası: {str(error)}", parent=parent)
+        elif on_done:
+            on_done(future.result())
+
+    window.after(100, poll)
+
+def export_data_to_csv(parent, table_name):
+    """Tabloyu CSV, sıkıştırılmış CSV veya XLSX olarak dışa aktarır
+
+    Aktarım arka planda akış halinde yapılır; ilerleme çubuğu ve iptal
+    düğmesi olan bir pencere gösterilir.
+    """
+    filetypes = [("CSV dosyası", "*.csv"), ("Sıkıştırılmış CSV", "*.csv.gz")]
+    if "xlsx" in available_formats():
+        filetypes.append(("Excel dosyası", "*.xlsx"))
+    path = filedialog.asksaveasfilename(
+        parent=parent,
+        title="Dışa Aktar",
+        initialfile=f"{table_name}_{datetime.now().strftime('%Y%m%d')}.csv",
+        defaultextension=".csv",
+        filetypes=filetypes
+    )
+    if not path:
+        return
+
+    def done(result):
+        rows, seconds = result
+        rate = rows / seconds if seconds else rows
+        messagebox.showinfo(
+            "Bilgi",
+            f"{rows} satır {seconds:.1f} saniyede aktarıldı ({rate:,.0f} satır/sn).\n{path}",
+            parent=parent
+        )
+
+    _run_with_progress(parent, "Dışa Aktarılıyor", f"{table_name} aktarılıyor...", "satır",
+                       "Dışa aktarma", export_table, table_name, path, on_done=done)
+
+def save_pdf(parent, initialfile, fn, *args):
+    """fn(path, *args, progress=..., cancel_event=...) ile PDF yazar
+
+    Sayfalar arka planda üretilip diske yazılırken ilerleme penceresi
+    gösterilir.
+    """
+    path = filedialog.asksaveasfilename(
+        parent=parent,
+        title="PDF Kaydet",
+        initialfile=initialfile,
+        defaultextension=".pdf",
+        filetypes=[("PDF dosyası", "*.pdf")]
+    )
+    if not path:
+        return
+
+    def done(result):
+        pages, seconds = result
+        messagebox.showinfo("Bilgi", f"{pages} sayfa {seconds:.1f} saniyede yazıldı.\n{path}",
+                            parent=parent)
+
+    _run_with_progress(parent, "PDF Oluşturuluyor", "Sayfalar hazırlanıyor...", "sayfa",
+                       "PDF oluşturma", fn, path, *args, on_done=done)
+
+def import_data_from_csv(parent, kind):
+    """Banka ekstresini (kind="banka") ya da aidat ödemelerini (kind="aidat") içe aktarır
+
+    Dosya arka planda gruplar halinde işlenir; reddedilen satırlar nedenleriyle
+    birlikte ayrı bir CSV'ye kaydedilebilir.
+    """
+    window = tk.Toplevel(parent)
+    window.title("Ekstre İçe Aktar" if kind == "banka" else "Aidat Ödemeleri İçe Aktar")
+    window.geometry("450x250")
+    window.transient(parent)
+    center_window(window)
+
+    hesap_combo = None
+    hesaplar = {}
+    if kind == "banka":
+        # Hesaplar arka planda yüklenir; gelene kadar başlat düğmesi kapalıdır
+        hesap_frame, hesap_combo = create_combobox_with_label(window, "Hesap:", values=[], width=30)
+        hesap_combo.configure(state="readonly")
+        hesap_frame.pack(fill="x", padx=20, pady=(20, 5))
+
+    status_label = ttk.Label(window, text="CSV dosyası seçin.")
+    status_label.pack(pady=10)
+    progress_bar = ttk.Progressbar(window, mode="indeterminate", length=300)
+    progress_bar.pack(pady=5)
+
+    cancel_event = threading.Event()
+    button_frame = ttk.Frame(window)
+    button_frame.pack(pady=10)
+
+    # Arka plan iş parçacığı yalnızca "okunan"ı günceller; arayüz okur
+    state = {"okunan": 0, "calisiyor": False}
+
+    def close():
+        # Aktarım sürerken pencere, iş sıradaki grupta durunca kapanır
+        if state["calisiyor"]:
+            cancel_event.set()
+        else:
+            window.destroy()
+
+    def start():
+        path = filedialog.askopenfilename(
+            parent=window,
+            title="İçe Aktar",
+            filetypes=[("CSV dosyası", "*.csv *.txt"), ("Tüm dosyalar", "*.*")]
+        )
+        if not path:
+            return
+        start_button.configure(state="disabled")
+        progress_bar.start(10)
+        state["calisiyor"] = True
+
+        def on_progress(okunan):
+            state["okunan"] = okunan
+
+        if kind == "banka":
+            future = get_executor().submit(import_banka_ekstresi, path, hesaplar[hesap_combo.get()],
+                                           progress=on_progress, cancel_event=cancel_event)
+        else:
+            future = get_executor().submit(import_aidat_odemeleri, path,
+                                           progress=on_progress, cancel_event=cancel_event)
+
+        def poll():
+            status_label.configure(text=f"{state['okunan']:,} satır işlendi".replace(",", "."))
+            if not future.done():
+                window.after(100, poll)
+                return
+
+            window.destroy()
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("Hata", f"İçe aktarma hatası: {str(error)}", parent=parent)
+                return
+            report = future.result()
+            message = (f"{report.okunan} satır okundu, {report.eklenen} kayıt eklendi, "
+                       f"{len(report.reddedilen)} satır reddedildi ({report.sure:.1f} sn).")
+            if report.iptal:
+                message = "İçe aktarma iptal edildi; tamamlanan gruplar kaydedildi.\n" + message
+            if not report.reddedilen:
+                messagebox.showinfo("Bilgi", message, parent=parent)
+            elif messagebox.askyesno("Bilgi", message + "\n\nReddedilen satırlar kaydedilsin mi?",
+                                     parent=parent):
+                rejects_path = filedialog.asksaveasfilename(
+                    parent=parent,
+                    title="Reddedilen Satırlar",
+                    initialfile=f"reddedilen_{datetime.now().strftime('%Y%m%d')}.csv",
+                    defaultextension=".csv",
+                    filetypes=[("CSV dosyası", "*.csv")]
+                )
+                if rejects_path:
+                    report.write_rejects(rejects_path)
+
+        window.after(100, poll)
+
+    start_button = ttk.Button(button_frame, text="Dosya Seç ve Başlat", command=start)
+    start_button.pack(side="left", padx=5)
+    ttk.Button(button_frame, text="İptal", command=close).pack(side="left", padx=5)
+    window.protocol("WM_DELETE_WINDOW", close)
+
+    def show_hesaplar(rows):
+        hesaplar.update((f"{h['banka_adi']} - {h['hesap_no']}", h["id"]) for h in rows)
+        if not hesaplar:
+            window.destroy()
+            messagebox.showwarning("Uyarı", "Önce bir banka hesabı tanımlayın.", parent=parent)
+            return
+        hesap_combo.configure(values=list(hesaplar))
+        hesap_combo.set(next(iter(hesaplar)))
+        start_button.configure(state="normal")
+
+    if kind == "banka":
+        start_button.configure(state="disabled")
+        run_in_background(window, get_all_banka_hesaplari, on_success=show_hesaplar)
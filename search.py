@@ -0,0 +1,309 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+
+import connection
+from connection import get_connection
+from utils import TR_KATLAMA_HEDEF, TR_KATLAMA_KAYNAK, fold_tr
+
+# Her kaynak tablonun ayrı, içeriksiz (content='') bir FTS5 dizini vardır; dizin
+# satırının rowid'i kaynak satırın id'sidir. Metin kaynak tablodan okunur.
+# Kaynak -> (dizin tablosu, dizine giren ifade; "{r}" NEW/OLD ya da tablo adı)
+ARAMA_KAYNAKLARI = {
+    "uyeler": ("arama_uyeler",
+               "COALESCE({r}.daire_no, '') || ' ' || COALESCE({r}.adi_soyadi, '') || ' ' || "
+               "COALESCE({r}.telefon, '') || ' ' || COALESCE({r}.email, '')"),
+    "giderler": ("arama_giderler", "COALESCE({r}.aciklama, '')"),
+    "banka_hareketleri": ("arama_banka_hareketleri", "COALESCE({r}.aciklama, '')"),
+    "aidat_odemeleri": ("arama_aidat_odemeleri", "COALESCE({r}.aciklama, '')"),
+}
+
+ARAMA_TETIKLEYICILERI = tuple(
+    f"{table}_arama_{event}" for table in ARAMA_KAYNAKLARI for event in ("ekle", "sil", "guncelle")
+)
+
+# unicode61 "I"yı "i"ye çevirir ama "ı"yı çevirmez; "Işık", "IŞIK", "isik"
+# aynı terime düşsün diye metin dizine girmeden önce fold_tr ile sadeleştirilir.
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_LIMIT = 50
+# Her kaynakta puanlanan en fazla eşleşme; daha çok satırla eşleşen
+# aramalarda en yeni CANDIDATE_LIMIT satır arasından sıralanır
+CANDIDATE_LIMIT = 1000
+# Bundan çok satırda geçen terimlerin satır sayısı TERM_CACHE_SECONDS saklanır
+TERM_CACHE_MIN_ROWS = 1000
+TERM_CACHE_SECONDS = 300
+
+_terim_onbellegi = {}  # (veritabanı, dizin, terim) -> (zaman, MATCH ifadesi, satır sayısı)
+_terim_lock = threading.Lock()
+
+def _fold_sql(expr):
+    # fold_tr() ile aynı dönüşüm; tetikleyiciler kullanıcı tanımlı fonksiyon
+    # gerektirmesin diye (sqlite3 komut satırından yapılan yazmalar da) saf SQL
+    for kaynak, hedef in zip(TR_KATLAMA_KAYNAK, TR_KATLAMA_HEDEF):
+        expr = f"replace({expr}, '{kaynak}', '{hedef}')"
+    return expr
+
+def _dizin_sql(table, ref):
+    return _fold_sql(ARAMA_KAYNAKLARI[table][1].format(r=ref))
+
+def create_search_index(cursor):
+    """Arama dizini tablolarını ve eşitleme tetikleyicilerini oluşturur
+
+    Dizinler boş oluşturulur; mevcut satırlar fill_search_index ile eklenir.
+    İçeriksiz dizinden silmek için eski metin gerektiğinden silme ve
+    güncelleme tetikleyicileri OLD değerlerini dizine 'delete' komutuyla verir.
+    """
+    for table, (fts, _) in ARAMA_KAYNAKLARI.items():
+        cursor.execute(f'''CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                          metin, content='', tokenize='unicode61 remove_diacritics 2',
+                          prefix='2 3')''')
+        cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts}_terimler USING fts5vocab({fts}, 'row')")
+        ekle, sil = _dizin_deyimleri(table)
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_arama_ekle
+                          AFTER INSERT ON {table}
+                          BEGIN {ekle} END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_arama_sil
+                          AFTER DELETE ON {table}
+                          BEGIN {sil} END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_arama_guncelle
+                          AFTER UPDATE ON {table}
+                          BEGIN {sil} {ekle} END''')
+
+def _dizin_deyimleri(table):
+    """Tetikleyici gövdeleri: (NEW satırını dizine ekleyen, OLD satırını dizinden silen)"""
+    fts = ARAMA_KAYNAKLARI[table][0]
+    ekle = f"INSERT INTO {fts} (rowid, metin) VALUES (NEW.id, {_dizin_sql(table, 'NEW')});"
+    sil = (f"INSERT INTO {fts} ({fts}, rowid, metin) "
+           f"VALUES ('delete', OLD.id, {_dizin_sql(table, 'OLD')});")
+    return ekle, sil
+
+def fill_search_index(conn, batch_size, progress=None):
+    """Dizinde olmayan kaynak satırlarını id aralıkları halinde ekler
+
+    Her aralık ayrı işlemde yazılır; yarıda kesilirse kaldığı yerden devam
+    eder. Tetikleyiciler kurulduktan sonra eklenen satırlar zaten dizindedir
+    ve atlanır. Eklenen satır sayısını döndürür.
+    """
+    araliklar = {table: conn.execute(f"SELECT MIN(id), MAX(id) FROM {table}").fetchone()
+                 for table in ARAMA_KAYNAKLARI}
+    toplam = sum(son - ilk + 1 for ilk, son in araliklar.values() if ilk is not None)
+    eklenen = islenen = 0
+    for table, (ilk, son) in araliklar.items():
+        if ilk is None:
+            continue
+        fts = ARAMA_KAYNAKLARI[table][0]
+        alt = ilk - 1
+        while alt < son:
+            ust = min(alt + batch_size, son)
+            with conn:
+                cursor = conn.execute(
+                    f'''INSERT INTO {fts} (rowid, metin)
+                        SELECT id, {_dizin_sql(table, table)} FROM {table}
+                        WHERE id > ? AND id <= ?
+                          AND id NOT IN (SELECT rowid FROM {fts} WHERE rowid > ? AND rowid <= ?)''',
+                    (alt, ust, alt, ust)
+                )
+                eklenen += cursor.rowcount
+            islenen += ust - alt
+            alt = ust
+            if progress:
+                progress(islenen, toplam)
+    return eklenen
+
+@contextmanager
+def deferred_indexing(cursor, *tables):
+    """Toplu eklemede satır başına dizin tetikleyicisi yerine eklenenleri sonda tek seferde dizine alır
+
+    Yeni satırlar blok bitene kadar dizinde değildir; içeriksiz dizinde
+    olmayan bir satırı silmek dizini bozacağından blok süresince silme ve
+    güncelleme tetikleyicileri yalnızca bloktan önceki satırlar için
+    çalışır. Yeni satırlar sonda son hâlleriyle dizine alınır. Blok içinde
+    id değiştirilmemelidir. Çağıran açık bir işlem içinde olmalıdır (hata
+    olursa tetikleyiciler geri alınarak geri gelir). Dizin henüz
+    kurulmadıysa (geçiş adımı bekliyorsa) hiçbir şey yapılmaz.
+    """
+    tables = [t for t in tables
+              if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?",
+                                (ARAMA_KAYNAKLARI[t][0],)).fetchone() is not None]
+    son_idler = {}
+    for table in tables:
+        son_id = son_idler[table] = cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        ekle, sil = _dizin_deyimleri(table)
+        for event in ("ekle", "sil", "guncelle"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_arama_{event}")
+        cursor.execute(f'''CREATE TRIGGER {table}_arama_sil
+                          AFTER DELETE ON {table} WHEN OLD.id <= {int(son_id)}
+                          BEGIN {sil} END''')
+        cursor.execute(f'''CREATE TRIGGER {table}_arama_guncelle
+                          AFTER UPDATE ON {table} WHEN OLD.id <= {int(son_id)}
+                          BEGIN {sil} {ekle} END''')
+
+    yield
+
+    for table in tables:
+        # Blok süresince kullanılan koşullu tetikleyiciler; create_search_index asıllarını kurar
+        cursor.execute(f"DROP TRIGGER {table}_arama_sil")
+        cursor.execute(f"DROP TRIGGER {table}_arama_guncelle")
+        cursor.execute(f"INSERT INTO {ARAMA_KAYNAKLARI[table][0]} (rowid, metin) "
+                       f"SELECT id, {_dizin_sql(table, table)} FROM {table} WHERE id > ?",
+                       (son_idler[table],))
+    if tables:
+        create_search_index(cursor)
+
+def rebuild_search_index(cursor):
+    """Dizinleri boşaltıp kaynak tablolardan yeniden doldurur"""
+    for table, (fts, _) in ARAMA_KAYNAKLARI.items():
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('delete-all')")
+        cursor.execute(f"INSERT INTO {fts} (rowid, metin) SELECT id, {_dizin_sql(table, table)} FROM {table}")
+
+def search_index_ready():
+    """Arama dizini oluşturulmuş mu (geçiş adımı arka planda sürüyor olabilir)"""
+    with get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name IN ({})".format(
+            ", ".join("?" * len(ARAMA_KAYNAKLARI))), [fts for fts, _ in ARAMA_KAYNAKLARI.values()]
+        ).fetchone()[0] == len(ARAMA_KAYNAKLARI)
+
+def _sadelestir(text):
+    # fold_tr() ve unicode61'in remove_diacritics'i: puanlamada dizindeki terimlerle aynı biçim
+    return "".join(c for c in unicodedata.normalize("NFKD", fold_tr(text)) if not unicodedata.combining(c))
+
+def _terimler(text):
+    return _TOKEN_RE.findall(_sadelestir(text))
+
+def _terim_bilgisi(cursor, fts, terim):
+    """(MATCH ifadesi, terimi içeren satır sayısı)
+
+    Önek tek bir terime açılıyorsa tam terim aranır: FTS5 önek aramasında
+    açılan terimlerin tüm satır listelerini birleştirir, tam terimde ise
+    seyrek terimin satırlarına atlayarak ilerler. Sık terimlerin bilgisi
+    (okuması satır sayısıyla orantılıdır) bir süre saklanır; seyrek terimler
+    ucuzdur ve her seferinde okunur, böylece yeni kayıtlar hemen bulunur.
+    """
+    key = (connection.DB_PATH, fts, terim)
+    with _terim_lock:
+        kayit = _terim_onbellegi.get(key)
+    if kayit is not None and time.monotonic() - kayit[0] < TERM_CACHE_SECONDS:
+        return kayit[1], kayit[2]
+    cursor.execute(f"SELECT COUNT(*), MIN(term), COALESCE(SUM(doc), 0) FROM {fts}_terimler "
+                   f"WHERE term >= ? AND term < ?", (terim, terim + "\U0010ffff"))
+    acilim, ilk, adet = cursor.fetchone()
+    # Terimler tırnaklıdır; FTS5 sözdizimi kullanıcı girdisinden gelmez
+    ifade = f'"{terim}"' if acilim == 1 and ilk == terim else f'"{terim}"*'
+    if adet >= TERM_CACHE_MIN_ROWS:
+        with _terim_lock:
+            if len(_terim_onbellegi) >= 4096:
+                _terim_onbellegi.clear()
+            _terim_onbellegi[key] = (time.monotonic(), ifade, adet)
+    return ifade, adet
+
+def _satir_sayisi(cursor, table):
+    key = (connection.DB_PATH, table, None)
+    with _terim_lock:
+        kayit = _terim_onbellegi.get(key)
+    if kayit is not None and time.monotonic() - kayit[0] < TERM_CACHE_SECONDS:
+        return kayit[2]
+    adet = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    with _terim_lock:
+        _terim_onbellegi[key] = (time.monotonic(), None, adet)
+    return adet
+
+def _bm25(belge, bilgiler, satir_sayisi, ortalama_uzunluk, k1=1.2, b=0.75):
+    # FTS5'in bm25'i ile aynı formül; terim sıklığı belgedeki önek eşleşmeleridir
+    skor = 0.0
+    uzunluk_etkisi = k1 * (1 - b + b * len(belge) / ortalama_uzunluk)
+    for terim, adet in bilgiler:
+        tf = sum(1 for kelime in belge if kelime.startswith(terim))
+        idf = max(math.log((satir_sayisi - adet + 0.5) / (adet + 0.5)), 1e-6)
+        skor += idf * tf * (k1 + 1) / (tf + uzunluk_etkisi)
+    return skor
+
+# Sonuç satırları: (id, tarih, başlık, tutar, açıklama) ve puanlama için dizindeki metin
+_DETAY_SQL = {
+    "uyeler": ("SELECT id, NULL, 'Daire ' || daire_no || ' - ' || COALESCE(adi_soyadi, ''), NULL, "
+               "trim(COALESCE(telefon, '') || ' ' || COALESCE(email, '')), {metin} FROM uyeler "
+               "WHERE id IN ({idler})", "uyeler"),
+    "giderler": ("SELECT id, odeme_tarihi, 'Gider (' || COALESCE(odeme_sekli, '') || ')', tutar, aciklama, "
+                 "{metin} FROM giderler WHERE id IN ({idler})", "giderler"),
+    "banka_hareketleri": ("SELECT h.id, h.tarih, COALESCE(b.banka_adi, '') || ' ' || "
+                          "COALESCE(h.hareket_tipi, ''), h.tutar, h.aciklama, {metin} "
+                          "FROM banka_hareketleri h LEFT JOIN banka_hesaplari b ON b.id = h.hesap_id "
+                          "WHERE h.id IN ({idler})", "h"),
+    "aidat_odemeleri": ("SELECT o.id, o.odeme_tarihi, 'Aidat - Daire ' || COALESCE(u.daire_no, '?') || ' ' "
+                        "|| o.yil || ' ' || o.ay, o.tutar, o.aciklama, {metin} FROM aidat_odemeleri o "
+                        "LEFT JOIN uyeler u ON u.id = o.uye_id WHERE o.id IN ({idler})", "o"),
+}
+
+def search(text, limit=DEFAULT_LIMIT, kaynaklar=None):
+    """Üyeler, giderler, banka hareketleri ve aidat ödemelerinde arama yapar
+
+    Her kelime önek olarak aranır ve tümü eşleşmelidir ("ayş yılm" ->
+    "Ayşe Yılmaz"). Her kaynakta dizin sırasıyla en yeni CANDIDATE_LIMIT
+    eşleşme alınır ve bm25 ile puanlanır. Puanlama SQL'deki bm25() yerine
+    burada yapılır: bm25() her sorguda sık terimlerin tüm satır listesini
+    okur. Her satır sözlüktür: kaynak, id, tarih, baslik, tutar, aciklama, skor.
+    """
+    terimler = _terimler(text)
+    if not terimler:
+        return []
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            sonuclar = []
+            for table, (fts, ifade) in ARAMA_KAYNAKLARI.items():
+                if kaynaklar is not None and table not in kaynaklar:
+                    continue
+                bilgiler = [_terim_bilgisi(cursor, fts, terim) for terim in terimler]
+                if any(adet == 0 for _, adet in bilgiler):
+                    continue
+                cursor.execute(f"SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY rowid DESC LIMIT ?",
+                               (" ".join(match for match, _ in bilgiler), CANDIDATE_LIMIT))
+                idler = [row[0] for row in cursor.fetchall()]
+                if not idler:
+                    continue
+
+                sql, alias = _DETAY_SQL[table]
+                cursor.execute(sql.format(metin=ifade.format(r=alias), idler=", ".join("?" * len(idler))), idler)
+                satirlar = [(row, _terimler(row[5])) for row in cursor.fetchall()]
+                if not satirlar:
+                    continue  # dizin okunduktan sonra silinmiş
+                ortalama = max(sum(len(belge) for _, belge in satirlar) / len(satirlar), 1)
+                satir_sayisi = _satir_sayisi(cursor, table)
+                terim_adetleri = list(zip(terimler, (adet for _, adet in bilgiler)))
+                for row, belge in satirlar:
+                    sonuclar.append({"kaynak": table, "id": row[0], "tarih": row[1], "baslik": row[2],
+                                     "tutar": row[3], "aciklama": row[4],
+                                     "skor": _bm25(belge, terim_adetleri, satir_sayisi, ortalama)})
+        # Eşit puanlarda yeni kayıt önce
+        sonuclar.sort(key=lambda sonuc: (-sonuc["skor"], -sonuc["id"]))
+        return sonuclar[:limit]
+    except Exception as e:
+        print(f"Arama hatası: {str(e)}")
+        return []
+
+def check_search_index(rebuild=False):
+    """Dizindeki satır sayılarını kaynak tablolarla karşılaştırır
+
+    Uyuşmayan (kaynak, dizindeki, beklenen) satırlarını döndürür.
+    rebuild=True ise uyuşmazlık bulunduğunda dizinler yeniden oluşturulur.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            uyusmayan = []
+            for table, (fts, _) in ARAMA_KAYNAKLARI.items():
+                dizinde = cursor.execute(f"SELECT COUNT(*) FROM {fts}").fetchone()[0]
+                beklenen = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if dizinde != beklenen:
+                    uyusmayan.append((table, dizinde, beklenen))
+            if uyusmayan and rebuild:
+                with conn:
+                    rebuild_search_index(cursor)
+            return uyusmayan
+    except Exception as e:
+        print(f"Arama dizini kontrol hatası: {str(e)}")
+        return []
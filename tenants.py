@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+
+import connection
+
+# Bina kayıt defteri: bina kodu -> veritabanı dosyası
+REGISTRY_PATH = "binalar.db"
+# Yeni binaların veritabanı dosyalarının varsayılan klasörü
+TENANT_DIR = "binalar"
+
+_current = None
+_pool = None
+_pool_lock = threading.Lock()
+
+class Bina:
+    """Kayıt defterindeki bir bina"""
+    def __init__(self, kod, adi, db_path):
+        self.kod = kod
+        self.adi = adi
+        self.db_path = db_path
+
+    def __repr__(self):
+        return f"Bina({self.kod!r}, {self.adi!r}, {self.db_path!r})"
+
+def _registry():
+    conn = sqlite3.connect(REGISTRY_PATH)
+    conn.execute('''CREATE TABLE IF NOT EXISTS binalar (
+                    kod TEXT PRIMARY KEY,
+                    adi TEXT NOT NULL,
+                    db_path TEXT NOT NULL UNIQUE)''')
+    return closing(conn)
+
+def list_tenants():
+    """Kayıtlı binaları koda göre sıralı döndürür; kayıt defteri yoksa boş liste"""
+    if not os.path.exists(REGISTRY_PATH):
+        return []
+    with _registry() as conn:
+        return [Bina(*row) for row in conn.execute("SELECT kod, adi, db_path FROM binalar ORDER BY kod")]
+
+def get_tenant(kod):
+    with _registry() as conn:
+        row = conn.execute("SELECT kod, adi, db_path FROM binalar WHERE kod=?", (kod,)).fetchone()
+    if row is None:
+        raise KeyError(f"Kayıtlı olmayan bina: {kod}")
+    return Bina(*row)
+
+def add_tenant(kod, adi, db_path=None):
+    """Binayı kayıt defterine ekler; dosya verilmezse TENANT_DIR/<kod>.db kullanılır
+
+    Şema binanın ilk açılışında (activate_tenant) oluşturulur.
+    """
+    if db_path is None:
+        os.makedirs(TENANT_DIR, exist_ok=True)
+        db_path = os.path.join(TENANT_DIR, f"{kod}.db")
+    with _registry() as conn, conn:
+        conn.execute("INSERT INTO binalar (kod, adi, db_path) VALUES (?, ?, ?)", (kod, adi, db_path))
+    return Bina(kod, adi, db_path)
+
+def remove_tenant(kod):
+    """Binayı kayıt defterinden çıkarır; veritabanı dosyası silinmez"""
+    with _registry() as conn, conn:
+        conn.execute("DELETE FROM binalar WHERE kod=?", (kod,))
+
+def current_tenant():
+    """Etkin binanın kodu; tek binalı kurulumda None"""
+    return _current
+
+def activate_tenant(kod):
+    """Uygulamanın varsayılan veritabanını binanın dosyasına yönlendirir
+
+    Diğer binaların havuzlanmış bağlantıları açık kalır; her bina kendi
+    bağlantılarını kullanır (havuz ve sorgu önbelleği dosya yoluna göre
+    ayrılır). Şema gerekiyorsa oluşturulur.
+    """
+    global _current
+    from database import init_database
+    bina = get_tenant(kod)
+    connection.set_db_path(bina.db_path, close_existing=False)
+    init_database()
+    _current = kod
+    return bina
+
+def tenant_connection(kod):
+    """Etkin binayı değiştirmeden bir binanın havuzlanmış bağlantısını verir"""
+    return connection.get_connection(get_tenant(kod).db_path)
+
+def _bina_ozeti(kod, adi, db_path, start_year, end_year, as_of):
+    # Ayrı süreçte çalışır: süreç başına tek bağlantı, binalar sırayla işlenir
+    from database import get_yillik_ozet, get_banka_bakiyeleri
+    from borc import compute_borclar
+    ozet = {"kod": kod, "adi": adi, "daire_sayisi": 0, "tahsil_edilen": 0, "beklenen": 0,
+            "gider": 0, "banka_bakiye": 0, "borc": 0, "borclu_daire": 0, "hata": None}
+    try:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        connection.set_db_path(db_path)
+        for yil in get_yillik_ozet(start_year, end_year):
+            ozet["tahsil_edilen"] += yil["tahsil_edilen"]
+            ozet["beklenen"] += yil["beklenen"]
+            ozet["gider"] += yil["gider_banka"] + yil["gider_nakit"]
+        ozet["banka_bakiye"] = sum(row["bakiye"] for row in get_banka_bakiyeleri())
+        borclar = compute_borclar(start_year, end_year, as_of=as_of)
+        ozet["daire_sayisi"] = len(borclar.uye_idleri)
+        ozet["borc"], _, ozet["borclu_daire"] = borclar.genel_toplam()
+    except Exception as e:
+        ozet["hata"] = str(e)
+    finally:
+        connection.close_connections()
+    return ozet
+
+def _new_pool(max_workers):
+    # Açılışı yavaşlatmamak için yalnızca konsolide raporda yüklenir
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # fork, Tk ve arka plan iş parçacıkları olan süreçte güvenli değildir
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(os.cpu_count() or 1)
+        return _pool
+
+def shutdown_pool():
+    """Uygulama kapanırken konsolide rapor süreçlerini kapatır"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+def consolidated_report(start_year, end_year=None, kodlar=None, as_of=None, parallel=True):
+    """Binaların özetlerini toplar: (bina satırları, genel toplam)
+
+    Her binanın toplamları, bakiyesi ve borç hesabı kendi dosyası üzerinde
+    ayrı bir süreçte yapılır; borç motoru CPU ağırlıklı olduğundan binalar
+    çekirdeklere dağıtılır. Açılamayan binalar "hata" alanıyla döner ve
+    toplama katılmaz.
+    """
+    end_year = end_year or start_year
+    as_of = as_of or date.today()
+    binalar = [b for b in list_tenants() if kodlar is None or b.kod in kodlar]
+    args = [(b.kod, b.adi, b.db_path, start_year, end_year, as_of) for b in binalar]
+
+    # Bina özetleri varsayılan veritabanı yolunu değiştirdiğinden hep ayrı
+    # süreçte çalışır; parallel=False tek süreçli karşılaştırma içindir
+    if not args:
+        satirlar = []
+    elif parallel:
+        satirlar = list(_get_pool().map(_bina_ozeti, *zip(*args)))
+    else:
+        with _new_pool(1) as pool:
+            satirlar = list(pool.map(_bina_ozeti, *zip(*args)))
+
+    toplam = dict.fromkeys(("daire_sayisi", "tahsil_edilen", "beklenen", "gider",
+                            "banka_bakiye", "borc", "borclu_daire"), 0)
+    for satir in satirlar:
+        if satir["hata"] is None:
+            for key in toplam:
+                toplam[key] += satir[key]
+    return satirlar, toplam
+
+def main(argv):
+    """Komut satırı: python tenants.py liste | ekle KOD "Adı" [dosya] | sil KOD"""
+    komut = argv[0] if argv else "liste"
+    if komut == "ekle" and len(argv) >= 3:
+        print(add_tenant(argv[1], argv[2], argv[3] if len(argv) > 3 else None))
+    elif komut == "sil" and len(argv) == 2:
+        remove_tenant(argv[1])
+    else:
+        for bina in list_tenants():
+            print(f"{bina.kod:<12} {bina.adi:<30} {bina.db_path}")
+
+if __name__ == "__main__":
+    import sys
+    main(sys.argv[1:])
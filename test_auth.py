@@ -0,0 +1,61 @@
+"""auth.py şifre doğrulama ve bcrypt maliyeti testleri
+
+    python -m pytest -q test_auth.py
+"""
+import pytest
+
+import auth
+from connection import get_connection
+from database import read_setting
+
+@pytest.fixture(autouse=True)
+def oturumlar():
+    auth.clear_sessions()
+    yield
+    auth.clear_sessions()
+    auth.set_bcrypt_cost(auth.DEFAULT_BCRYPT_COST)
+
+def _saklanan_maliyet(kullanici_adi="admin"):
+    with get_connection() as conn:
+        row = conn.execute("SELECT sifre FROM kullanicilar WHERE kullanici_adi=?", (kullanici_adi,)).fetchone()
+    return auth.hash_cost(row[0])
+
+def test_cost_defaults_without_setting(db):
+    with get_connection() as conn:
+        assert auth.load_bcrypt_cost(conn.cursor()) == auth.DEFAULT_BCRYPT_COST
+    assert _saklanan_maliyet() == auth.DEFAULT_BCRYPT_COST
+
+def test_saved_cost_rehashes_on_login(db):
+    auth.save_bcrypt_cost(auth.MIN_BCRYPT_COST)
+    with get_connection() as conn:
+        assert read_setting(conn.cursor(), auth.BCRYPT_COST_AYARI) == str(auth.MIN_BCRYPT_COST)
+
+    # Başka bir süreç varsayılan maliyetle başlamış olsa da ayar veritabanından okunur
+    auth.set_bcrypt_cost(auth.DEFAULT_BCRYPT_COST)
+    oturum = auth.verify_user("admin", "admin123")
+    assert oturum is not None and oturum.rol == "yönetici"
+    assert _saklanan_maliyet() == auth.MIN_BCRYPT_COST
+
+    auth.clear_sessions()
+    assert auth.verify_user("admin", "admin123") is not None
+    assert auth.verify_user("admin", "yanlis") is None
+
+@pytest.mark.parametrize("cost", [3, 32, "on"])
+def test_invalid_cost_is_not_saved(db, cost):
+    with pytest.raises(ValueError):
+        auth.save_bcrypt_cost(cost)
+    with get_connection() as conn:
+        assert read_setting(conn.cursor(), auth.BCRYPT_COST_AYARI) is None
+
+def test_verify_user_reads_given_database(db, tmp_path):
+    import connection
+    from database import init_database
+    diger = str(tmp_path / "diger.db")
+    connection.set_db_path(diger, close_existing=False)
+    init_database()
+    with get_connection() as conn:
+        conn.execute("DELETE FROM kullanicilar")
+    connection.set_db_path(db, close_existing=False)
+
+    assert auth.verify_user("admin", "admin123", diger) is None
+    assert auth.verify_user("admin", "admin123", db) is not None
@@ -0,0 +1,44 @@
+"""Sorgu önbelleğinin geçersiz kılınma testleri
+
+    python -m pytest -q test_cache.py
+"""
+import sqlite3
+
+from cache import query_cache
+from connection import get_connection
+from database import get_all_uyeler
+
+def _uye_ekle(conn, daire_no):
+    conn.execute("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (?, ?)", (daire_no, f"Sakin {daire_no}"))
+
+def test_write_through_pool_invalidates(db):
+    with get_connection() as conn:
+        _uye_ekle(conn, 1)
+    assert len(get_all_uyeler()) == 1
+    assert len(get_all_uyeler()) == 1
+    assert query_cache.stats()["hits"] >= 1
+
+    with get_connection() as conn:
+        _uye_ekle(conn, 2)
+    assert len(get_all_uyeler()) == 2
+
+def test_write_from_other_process_invalidates(db):
+    with get_connection() as conn:
+        _uye_ekle(conn, 1)
+    assert len(get_all_uyeler()) == 1
+
+    # İzlenmeyen bağlantı: başka bir sürecin (ya da sqlite3 komut satırının) yazması
+    dis = sqlite3.connect(db)
+    with dis:
+        _uye_ekle(dis, 2)
+    dis.close()
+
+    assert len(get_all_uyeler()) == 2
+
+def test_unchanged_database_keeps_entries(db):
+    with get_connection() as conn:
+        _uye_ekle(conn, 1)
+    get_all_uyeler()
+    hits = query_cache.stats()["hits"]
+    get_all_uyeler()
+    assert query_cache.stats()["hits"] == hits + 1
@@ -0,0 +1,47 @@
+"""connection.get_connection işlem sınırlarının testleri
+
+    python -m pytest -q test_connection.py
+"""
+import pytest
+
+from connection import get_connection
+from database import bulk_write, get_apartman_bilgileri
+
+def _tetikleyiciler():
+    with get_connection() as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+
+def test_nested_accessor_keeps_bulk_write_rollback(db):
+    once = _tetikleyiciler()
+    assert once
+
+    with pytest.raises(RuntimeError):
+        with bulk_write():
+            # İçteki erişimci bulk_write'ın işlemini (DROP TRIGGER'lar) commit etmemeli
+            get_apartman_bilgileri()
+            raise RuntimeError("iptal")
+
+    assert _tetikleyiciler() == once
+
+def test_nested_error_rolls_back_only_inner_block(db):
+    with get_connection() as conn:
+        conn.execute("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (1, 'Dış')")
+        with pytest.raises(RuntimeError):
+            with get_connection() as ic:
+                ic.execute("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (2, 'İç')")
+                raise RuntimeError("iç blok")
+        assert conn.in_transaction
+
+    with get_connection() as conn:
+        assert [row[0] for row in conn.execute("SELECT adi_soyadi FROM uyeler")] == ["Dış"]
+
+def test_outer_rollback_undoes_nested_block(db):
+    with pytest.raises(RuntimeError):
+        with get_connection() as conn:
+            conn.execute("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (1, 'Dış')")
+            with get_connection() as ic:
+                ic.execute("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (2, 'İç')")
+            raise RuntimeError("dış blok")
+
+    with get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM uyeler").fetchone()[0] == 0
@@ -0,0 +1,198 @@
+"""database.py erişimcilerinin testleri
+
+    python -m pytest -q test_database.py
+"""
+import sqlite3
+
+import pytest
+
+from connection import get_connection
+from database import (_keyset_page, bulk_write, check_aylik_ozet, check_bakiye_defteri,
+                      insert_banka_hareketleri_batch)
+from records import TUPLE
+
+@pytest.fixture
+def giderler():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE giderler (id INTEGER PRIMARY KEY, tarih TEXT)")
+    # Boş tarihler artan sırada başta, azalan sırada sonda gelir
+    conn.executemany("INSERT INTO giderler VALUES (?, ?)", [
+        (1, "2024-03-01"), (2, None), (3, "2024-01-01"), (4, None),
+        (5, "2024-02-01"), (6, "2024-01-01"), (7, None),
+    ])
+    yield conn
+    conn.close()
+
+def _tum_sayfalar(conn, order_column, descending, limit):
+    idler, page_cursor = [], None
+    while True:
+        rows, page_cursor = _keyset_page(conn.cursor(), "SELECT id, tarih FROM giderler", [], [],
+                                         order_column, "id", limit, page_cursor,
+                                         descending=descending, row_format=TUPLE)
+        idler += [row[0] for row in rows]
+        if page_cursor is None:
+            return idler
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_keyset_pages_match_full_order(giderler, descending, limit):
+    yon = "DESC" if descending else "ASC"
+    beklenen = [row[0] for row in giderler.execute(f"SELECT id FROM giderler ORDER BY tarih {yon}, id {yon}")]
+    assert _tum_sayfalar(giderler, "tarih", descending, limit) == beklenen
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_keyset_pages_by_id(giderler, descending):
+    beklenen = sorted(range(1, 8), reverse=descending)
+    assert _tum_sayfalar(giderler, "id", descending, 3) == beklenen
+
+HAREKETLER = [
+    (1, "2024-01-03", 1000, "Gelir"),
+    (1, "2024-01-03", 200, "Gider"),
+    (1, "2024-01-10", 300, "Gider"),
+    (2, "2024-01-05", 500, "Gelir"),
+    (1, "2024-02-01", 750, "Gelir"),
+]
+
+def _hareket_ekle(conn, hareketler=HAREKETLER):
+    conn.executemany("INSERT INTO banka_hareketleri (hesap_id, tarih, tutar, hareket_tipi) VALUES (?, ?, ?, ?)",
+                     hareketler)
+
+def _bakiye(conn, hesap_id, tarih):
+    row = conn.execute("SELECT bakiye FROM banka_bakiye_gunluk WHERE hesap_id=? AND tarih<=? "
+                       "ORDER BY tarih DESC LIMIT 1", (hesap_id, tarih)).fetchone()
+    return row[0] if row else 0
+
+def test_ledger_follows_inserts(db):
+    with get_connection() as conn:
+        _hareket_ekle(conn)
+        assert _bakiye(conn, 1, "2024-01-31") == 500
+        assert _bakiye(conn, 1, "2024-12-31") == 1250
+        assert _bakiye(conn, 2, "2024-12-31") == 500
+    assert check_bakiye_defteri() == []
+
+@pytest.mark.parametrize("sql, params", [
+    ("UPDATE banka_hareketleri SET tutar=? WHERE id=?", (150, 2)),
+    ("UPDATE banka_hareketleri SET tarih=? WHERE id=?", ("2023-12-31", 3)),
+    ("UPDATE banka_hareketleri SET tarih=? WHERE id=?", ("2024-03-01", 1)),
+    ("UPDATE banka_hareketleri SET hesap_id=? WHERE id=?", (2, 5)),
+    ("UPDATE banka_hareketleri SET hareket_tipi=? WHERE id=?", ("Gider", 4)),
+    ("DELETE FROM banka_hareketleri WHERE id=?", (1,)),
+    ("DELETE FROM banka_hareketleri WHERE hesap_id=?", (1,)),
+])
+def test_ledger_follows_updates_and_deletes(db, sql, params):
+    with get_connection() as conn:
+        _hareket_ekle(conn)
+    with get_connection() as conn:
+        conn.execute(sql, params)
+    assert check_bakiye_defteri() == []
+
+def test_ledger_after_bulk_write(db):
+    with get_connection() as conn:
+        _hareket_ekle(conn, HAREKETLER[:2])
+    with bulk_write() as conn:
+        _hareket_ekle(conn, HAREKETLER[2:])
+        conn.execute("UPDATE banka_hareketleri SET tutar=400 WHERE id=1")
+    assert check_bakiye_defteri() == []
+    with get_connection() as conn:
+        assert _bakiye(conn, 1, "2024-12-31") == 650
+
+def test_ledger_after_bulk_write_rollback(db):
+    with get_connection() as conn:
+        _hareket_ekle(conn)
+        once = conn.execute("SELECT * FROM banka_bakiye_gunluk ORDER BY hesap_id, tarih").fetchall()
+    with pytest.raises(RuntimeError):
+        with bulk_write() as conn:
+            _hareket_ekle(conn, [(1, "2024-01-01", 5000, "Gelir")])
+            raise RuntimeError("iptal")
+
+    # Tetikleyiciler geri gelmiş olmalı: sonraki yazmalar defteri yine günceller
+    with get_connection() as conn:
+        assert conn.execute("SELECT * FROM banka_bakiye_gunluk ORDER BY hesap_id, tarih").fetchall() == once
+        _hareket_ekle(conn, [(2, "2024-01-06", 100, "Gider")])
+        assert _bakiye(conn, 2, "2024-12-31") == 400
+    assert check_bakiye_defteri() == []
+
+def test_ledger_after_batch_insert(db):
+    with get_connection() as conn:
+        _hareket_ekle(conn, HAREKETLER[2:])
+        conn.execute("CREATE TEMP TABLE ekstre (hesap_id, tarih, tutar, hareket_tipi, aciklama)")
+        conn.executemany("INSERT INTO ekstre VALUES (?, ?, ?, ?, NULL)", HAREKETLER[:2])
+        assert insert_banka_hareketleri_batch(conn.cursor(), "temp.ekstre") == 2
+    assert check_bakiye_defteri() == []
+
+def test_ledger_check_finds_mismatch(db):
+    with get_connection() as conn:
+        _hareket_ekle(conn)
+        conn.execute("UPDATE banka_bakiye_gunluk SET bakiye = bakiye + 1 WHERE hesap_id=1 AND tarih='2024-01-10'")
+    assert [row[:2] for row in check_bakiye_defteri()] == [(1, "2024-01-10")]
+    assert [row[:2] for row in check_bakiye_defteri(rebuild=True)] == [(1, "2024-01-10")]
+    assert check_bakiye_defteri() == []
+
+def _ozet_verisi(conn):
+    _hareket_ekle(conn)
+    conn.executemany("INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar) VALUES (?, ?, ?, ?, ?)",
+                     [(1, 2024, "ocak", "2024-01-05", 500), (2, 2024, "subat", "2024-01-20", 500),
+                      (1, 2023, "aralik", "2024-01-02", 450)])
+    conn.executemany("INSERT INTO giderler (odeme_tarihi, tutar, odeme_sekli) VALUES (?, ?, ?)",
+                     [("2024-01-15", 300, "Banka"), ("2024-01-16", 120, "Nakit"), ("2024-02-01", 80, "Nakit")])
+
+def _ozet(conn, yil, ay_no):
+    return tuple(conn.execute("SELECT tahsil_edilen, gider_banka, gider_nakit, banka_gelir, banka_gider "
+                              "FROM aylik_ozet WHERE yil=? AND ay_no=?", (yil, ay_no)).fetchone())
+
+def test_rollup_follows_inserts(db):
+    with get_connection() as conn:
+        _ozet_verisi(conn)
+        assert _ozet(conn, 2024, 1) == (500, 300, 120, 1500, 500)
+        assert _ozet(conn, 2024, 2) == (500, 0, 80, 750, 0)
+        assert _ozet(conn, 2023, 12) == (450, 0, 0, 0, 0)
+    assert check_aylik_ozet() == []
+
+@pytest.mark.parametrize("sql, params", [
+    ("UPDATE aidat_odemeleri SET tutar=? WHERE id=?", (600, 1)),
+    ("UPDATE aidat_odemeleri SET ay=?, yil=? WHERE id=?", ("mart", 2025, 2)),
+    ("DELETE FROM aidat_odemeleri WHERE id=?", (3,)),
+    ("UPDATE giderler SET odeme_sekli=? WHERE id=?", ("Nakit", 1)),
+    ("UPDATE giderler SET odeme_tarihi=? WHERE id=?", ("2023-11-30", 3)),
+    ("DELETE FROM giderler WHERE odeme_sekli=?", ("Nakit",)),
+    ("UPDATE banka_hareketleri SET tarih=? WHERE id=?", ("2024-02-10", 2)),
+    ("UPDATE banka_hareketleri SET hareket_tipi=? WHERE id=?", ("Gider", 5)),
+    ("DELETE FROM banka_hareketleri WHERE id=?", (4,)),
+])
+def test_rollup_follows_updates_and_deletes(db, sql, params):
+    with get_connection() as conn:
+        _ozet_verisi(conn)
+    with get_connection() as conn:
+        conn.execute(sql, params)
+    assert check_aylik_ozet() == []
+
+def test_rollup_after_bulk_write(db):
+    with bulk_write() as conn:
+        _ozet_verisi(conn)
+        conn.execute("DELETE FROM giderler WHERE id=2")
+    assert check_aylik_ozet() == []
+    with get_connection() as conn:
+        assert _ozet(conn, 2024, 1) == (500, 300, 0, 1500, 500)
+
+def test_rollup_after_bulk_write_rollback(db):
+    with get_connection() as conn:
+        _ozet_verisi(conn)
+        once = conn.execute("SELECT * FROM aylik_ozet ORDER BY yil, ay_no").fetchall()
+    with pytest.raises(RuntimeError):
+        with bulk_write() as conn:
+            conn.execute("DELETE FROM aidat_odemeleri")
+            raise RuntimeError("iptal")
+
+    with get_connection() as conn:
+        assert conn.execute("SELECT * FROM aylik_ozet ORDER BY yil, ay_no").fetchall() == once
+        conn.execute("UPDATE giderler SET tutar=tutar + 1")
+        assert _ozet(conn, 2024, 1)[1:3] == (301, 121)
+    assert check_aylik_ozet() == []
+
+def test_rollup_check_finds_mismatch(db):
+    with get_connection() as conn:
+        _ozet_verisi(conn)
+        conn.execute("UPDATE aylik_ozet SET gider_nakit = 0 WHERE yil=2024 AND ay_no=2")
+    assert [tuple(row) for row in check_aylik_ozet()] == [(2024, 2)]
+    assert [tuple(row) for row in check_aylik_ozet(rebuild=True)] == [(2024, 2)]
+    assert check_aylik_ozet() == []
@@ -0,0 +1,31 @@
+"""export.py dışa aktarma testleri
+
+    python -m pytest -q test_export.py
+"""
+import csv
+import os
+
+import pytest
+
+from connection import get_connection
+from export import export_table
+
+def test_export_writes_all_rows(db, tmp_path):
+    with get_connection() as conn:
+        conn.executemany("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (?, ?)",
+                         [(no, f"Sakin {no}") for no in range(1, 8)])
+    path = str(tmp_path / "uyeler.csv")
+    rows, _ = export_table("uyeler", path, batch_size=3)
+    assert rows == 7
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        satirlar = list(csv.reader(f))
+    assert satirlar[0][:3] == ["id", "daire_no", "adi_soyadi"]
+    assert len(satirlar) == 8
+
+@pytest.mark.parametrize("table_name", ["kullanicilar", "sistem_ayarlari", "sqlite_master",
+                                        "uyeler; DROP TABLE uyeler"])
+def test_export_rejects_tables_outside_whitelist(db, tmp_path, table_name):
+    path = str(tmp_path / "disari.csv")
+    with pytest.raises(ValueError):
+        export_table(table_name, path)
+    assert not os.path.exists(path)
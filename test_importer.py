@@ -0,0 +1,108 @@
+"""importer.py içe aktarma testleri
+
+    python -m pytest -q test_importer.py
+"""
+import threading
+
+import pytest
+
+from connection import get_connection
+from database import check_aylik_ozet, check_bakiye_defteri
+from importer import import_aidat_odemeleri, import_banka_ekstresi, parse_tarih, parse_tutar
+
+EKSTRE = """Hesap: TR00 0000 0000;;;
+İşlem Tarihi;Açıklama;İşlem Tutarı;İşlem Tipi
+01.03.2024;Daire 3 aidat;1.250,00;Alacak
+02.03.2024;Elektrik;-480,50;
+02.03.2024;Elektrik;-480,50;
+31.02.2024;Hatalı tarih;100;Alacak
+05.03.2024;Sıfır;0;
+06.03.2024;Bilinmeyen tip;100;X
+07.03.2024;Su;75;Borç
+"""
+
+AIDAT = """Daire No,Yıl,Ay,Ödeme Tarihi,Tutar,Açıklama
+1,2024,Ocak,2024-01-05,500,
+2,2024,2,2024-02-03,500,
+1,2024,Ocak,2024-01-05,500,tekrar
+9,2024,Ocak,2024-01-05,500,
+2,2024,onüçüncü,2024-02-03,500,
+2,2024,Mart,2024-03-03,-5,
+,2024,Mart,2024-03-03,500,
+2,,,05.04.2024,500,
+"""
+
+def _dosya(tmp_path, ad, metin, encoding="utf-8"):
+    path = tmp_path / ad
+    path.write_bytes(metin.encode(encoding))
+    return str(path)
+
+def _hesap_ekle():
+    with get_connection() as conn:
+        return conn.execute("INSERT INTO banka_hesaplari (banka_adi) VALUES ('Deneme')").lastrowid
+
+@pytest.mark.parametrize("text, beklenen", [
+    ("1.234,56", 1235), ("1234.56", 1235), ("12.500", 12500), ("-250 TL", -250), ("₺ 99", 99),
+])
+def test_parse_tutar(text, beklenen):
+    assert parse_tutar(text) == beklenen
+
+def test_parse_tarih():
+    assert parse_tarih("05.04.2024") == "2024-04-05"
+    with pytest.raises(ValueError):
+        parse_tarih("2024-13-01")
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1254"])
+def test_bank_statement_rejects_and_duplicates(db, tmp_path, encoding):
+    hesap_id = _hesap_ekle()
+    path = _dosya(tmp_path, "ekstre.csv", EKSTRE, encoding)
+
+    rapor = import_banka_ekstresi(path, hesap_id, chunk_size=2)
+    assert (rapor.okunan, rapor.eklenen) == (7, 3)
+    assert [(no, neden.split(":")[0]) for no, neden, _ in rapor.reddedilen] == [
+        (5, "mükerrer hareket"), (6, "geçersiz tarih"), (7, "tutar sıfır"), (8, "bilinmeyen hareket tipi"),
+    ]
+    with get_connection() as conn:
+        satirlar = conn.execute("SELECT tarih, tutar, hareket_tipi FROM banka_hareketleri ORDER BY id").fetchall()
+    assert [tuple(row) for row in satirlar] == [
+        ("2024-03-01", 1250, "Gelir"), ("2024-03-02", 481, "Gider"), ("2024-03-07", 75, "Gider"),
+    ]
+
+    # Aynı dosya yeniden: geçerli satırların hepsi mükerrer
+    tekrar = import_banka_ekstresi(path, hesap_id)
+    assert tekrar.eklenen == 0
+    assert sum(neden == "mükerrer hareket" for _, neden, _ in tekrar.reddedilen) == 4
+
+    assert check_bakiye_defteri() == []
+    assert check_aylik_ozet() == []
+
+def test_dues_payments_rejects_and_duplicates(db, tmp_path):
+    with get_connection() as conn:
+        conn.executemany("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (?, ?)", [(1, "Bir"), (2, "İki")])
+    path = _dosya(tmp_path, "aidat.csv", AIDAT)
+
+    rapor = import_aidat_odemeleri(path, chunk_size=3)
+    assert (rapor.okunan, rapor.eklenen) == (8, 3)
+    assert [(no, neden.split(":")[0]) for no, neden, _ in rapor.reddedilen] == [
+        (4, "mükerrer ödeme"), (5, "bilinmeyen daire"), (6, "geçersiz ay"),
+        (7, "tutar pozitif olmalı"), (8, "daire numarası yok"),
+    ]
+    with get_connection() as conn:
+        satirlar = conn.execute("SELECT yil, ay, odeme_tarihi, tutar FROM aidat_odemeleri ORDER BY id").fetchall()
+    assert [tuple(row) for row in satirlar] == [
+        (2024, "ocak", "2024-01-05", 500), (2024, "subat", "2024-02-03", 500), (2024, "nisan", "2024-04-05", 500),
+    ]
+
+    assert import_aidat_odemeleri(path).eklenen == 0
+    assert check_aylik_ozet() == []
+
+def test_cancelled_import_keeps_finished_chunks(db, tmp_path):
+    hesap_id = _hesap_ekle()
+    path = _dosya(tmp_path, "ekstre.csv", EKSTRE)
+    iptal = threading.Event()
+
+    rapor = import_banka_ekstresi(path, hesap_id, chunk_size=2, progress=lambda okunan: iptal.set(),
+                                  cancel_event=iptal)
+    assert rapor.iptal
+    assert (rapor.okunan, rapor.eklenen) == (2, 2)
+    assert check_bakiye_defteri() == []
@@ -0,0 +1,88 @@
+"""migrations.py geçiş adımlarının testleri
+
+    python -m pytest -q test_migrations.py
+"""
+import os
+
+import pytest
+
+import connection
+from cache import query_cache
+from database import (SCHEMA_VERSION, check_aylik_ozet, create_indexes, create_tables,
+                      create_user_table, schema_is_current)
+from migrations import BASE_VERSION, get_version, migrate
+from search import search
+
+class Kesinti(Exception):
+    pass
+
+@pytest.fixture
+def eski_db(tmp_path):
+    """Temel şemada (BASE_VERSION) kalmış, eski biçimli ay adları içeren veritabanı"""
+    path = str(tmp_path / "eski.db")
+    connection.set_db_path(path)
+    query_cache.clear()
+    create_tables()
+    create_user_table()
+    create_indexes()
+    with connection.get_connection() as conn:
+        conn.execute(f"PRAGMA user_version = {BASE_VERSION}")
+        conn.executemany("INSERT INTO uyeler (daire_no, adi_soyadi) VALUES (?, ?)",
+                         [(no, f"Sakin {no}") for no in range(1, 6)])
+        conn.executemany("INSERT INTO aidat_odemeleri (uye_id, yil, ay, odeme_tarihi, tutar) VALUES (?, ?, ?, ?, ?)",
+                         [(1, 2024, "Şubat", "2024-02-01", 500), (2, 2024, "2", "2024-02-02", 500),
+                          (3, 2024, "MART", "2024-03-01", 500), (4, 2024, "ocak", "2024-01-03", 500)])
+    yield path
+    connection.close_connections()
+    query_cache.clear()
+
+def _surum(path):
+    with connection.get_connection(path) as conn:
+        return get_version(conn)
+
+def _aylar(path):
+    with connection.get_connection(path) as conn:
+        return [row[0] for row in conn.execute("SELECT ay FROM aidat_odemeleri ORDER BY id")]
+
+def test_offline_run_stops_at_first_online_step(eski_db):
+    rapor = migrate(eski_db, backup=False, online=False)
+    assert rapor.adimlar == []
+    assert _surum(eski_db) == BASE_VERSION
+    assert _aylar(eski_db) == ["Şubat", "2", "MART", "ocak"]
+
+def test_online_steps_resume_after_interruption(eski_db):
+    def kes(surum, islenen, toplam):
+        # Arama dizini doldurulurken ilk parçadan sonra kesilir
+        if surum == 3:
+            raise Kesinti()
+
+    with pytest.raises(Kesinti):
+        migrate(eski_db, batch_size=2, backup=False, progress=kes)
+    assert _surum(eski_db) == 2
+    assert _aylar(eski_db) == ["subat", "subat", "mart", "ocak"]
+    assert check_aylik_ozet() == []
+
+    # Engelleyici adım (4) online adım 3 bitmeden çalışmaz
+    assert migrate(eski_db, backup=False, online=False).adimlar == []
+    assert not schema_is_current()
+
+    rapor = migrate(eski_db, batch_size=2)
+    assert [adim[0] for adim in rapor.adimlar] == [3, 4]
+    assert os.path.exists(rapor.yedek)
+    assert _surum(eski_db) == SCHEMA_VERSION
+    assert schema_is_current()
+
+    # Yarıda kalan doldurma tekrar edildiğinde satırlar iki kez dizine girmez
+    with connection.get_connection() as conn:
+        conn.execute("INSERT INTO arama_uyeler (arama_uyeler) VALUES ('integrity-check')")
+        assert conn.execute("SELECT COUNT(*) FROM arama_uyeler WHERE arama_uyeler MATCH 'sakin'").fetchone()[0] == 5
+    assert [row["id"] for row in search("sakin 3", kaynaklar=("uyeler",))] == [3]
+
+    assert migrate(eski_db).adimlar == []
+
+def test_dry_run_leaves_database_untouched(eski_db):
+    rapor = migrate(eski_db, dry_run=True)
+    assert rapor.dry_run
+    assert [adim[0] for adim in rapor.adimlar] == [2, 3, 4]
+    assert _surum(eski_db) == BASE_VERSION
+    assert _aylar(eski_db) == ["Şubat", "2", "MART", "ocak"]
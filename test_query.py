@@ -0,0 +1,98 @@
+"""query.py sorgu derleyicisinin testleri
+
+    python -m pytest -q test_query.py
+"""
+import sqlite3
+
+import pytest
+
+from query import compile_select, where
+
+SUTUNLAR = {"id": int, "tarih": str, "tutar": int, "aciklama": str}
+SATIRLAR = [
+    (1, "2024-01-05", 100, "Aidat"),
+    (2, "2024-01-20", 250, "Aidat ocak"),
+    (3, "2024-02-03", 400, None),
+    (4, "2024-03-15", 250, "Elektrik"),
+]
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE hareketler (id INTEGER PRIMARY KEY, tarih TEXT, tutar INTEGER, aciklama TEXT)")
+    conn.executemany("INSERT INTO hareketler VALUES (?, ?, ?, ?)", SATIRLAR)
+    yield conn
+    conn.close()
+
+def _idler(conn, filtre, **kwargs):
+    sql, params = compile_select("hareketler", SUTUNLAR, filtre, order_by="id", **kwargs)
+    return [row[0] for row in conn.execute(sql, params)]
+
+@pytest.mark.parametrize("filtre, beklenen", [
+    (where(tutar=250), [2, 4]),
+    (where(tutar__eq=250), [2, 4]),
+    (where(tutar__ne=250), [1, 3]),
+    (where(tutar__lt=250), [1]),
+    (where(tutar__lte=250), [1, 2, 4]),
+    (where(tutar__gt=250), [3]),
+    (where(tutar__gte=250), [2, 3, 4]),
+    (where(id__in=[1, 3, 9]), [1, 3]),
+    (where(id__in=[]), []),
+    (where(tarih__between=("2024-01-20", "2024-02-03")), [2, 3]),
+    (where(aciklama__startswith="Aidat"), [1, 2]),
+    (where(aciklama__startswith="%"), []),
+    (where(aciklama__isnull=True), [3]),
+    (where(aciklama__notnull=True), [1, 2, 4]),
+    (where(tutar=250) & where(tarih__gte="2024-02-01"), [4]),
+])
+def test_operators(conn, filtre, beklenen):
+    assert _idler(conn, filtre) == beklenen
+
+def test_sql_text_depends_only_on_shape():
+    sql1, params1 = compile_select("hareketler", SUTUNLAR, where(id__in=[1, 2], tutar__gte=10))
+    sql2, params2 = compile_select("hareketler", SUTUNLAR, where(id__in=[], tutar__gte=99))
+    assert sql1 == sql2
+    assert params1 == ["[1, 2]", 10]
+    assert params2 == ["[]", 99]
+
+def test_order_by_and_limit(conn):
+    sql, params = compile_select("hareketler", SUTUNLAR, order_by=("-tutar", "id"), limit=2)
+    assert sql == "SELECT * FROM hareketler ORDER BY tutar DESC, id LIMIT ?"
+    assert [row[0] for row in conn.execute(sql, params)] == [3, 2]
+
+def test_no_filter():
+    assert compile_select("hareketler", SUTUNLAR) == ("SELECT * FROM hareketler", [])
+
+def test_unknown_operator():
+    with pytest.raises(ValueError):
+        where(tutar__like="1%")
+
+@pytest.mark.parametrize("filtre, order_by", [
+    (where(daire_no=1), ()),
+    (where(id__in=[1]) & where(sifre="x"), ()),
+    (None, ("-sifre",)),
+])
+def test_unknown_column(filtre, order_by):
+    with pytest.raises(ValueError):
+        compile_select("hareketler", SUTUNLAR, filtre, order_by=order_by)
+
+@pytest.mark.parametrize("filtre", [
+    where(tutar="250"),
+    where(tutar=True),
+    where(tutar=None),
+    where(tarih=20240101),
+    where(id__in=[1, "2"]),
+    where(tarih__between=("2024-01-01", 5)),
+    where(tutar__startswith=2),
+])
+def test_wrong_type(filtre):
+    with pytest.raises(TypeError):
+        compile_select("hareketler", SUTUNLAR, filtre)
+
+@pytest.mark.parametrize("filtre", [
+    where(aciklama__isnull=False),
+    where(aciklama__notnull=1),
+])
+def test_null_operators_require_true(filtre):
+    with pytest.raises(ValueError):
+        compile_select("hareketler", SUTUNLAR, filtre)
@@ -0,0 +1,67 @@
+"""search.py arama dizini testleri
+
+    python -m pytest -q test_search.py
+"""
+import pytest
+
+from connection import get_connection
+from database import bulk_write
+from search import deferred_indexing, search
+
+def _giderler(text):
+    return sorted(row["id"] for row in search(text, kaynaklar=("giderler",)))
+
+def _gider_ekle(conn, aciklama):
+    return conn.execute("INSERT INTO giderler (odeme_tarihi, tutar, aciklama, odeme_sekli) "
+                        "VALUES ('2024-01-01', 100, ?, 'Nakit')", (aciklama,)).lastrowid
+
+def _dizin_saglam():
+    with get_connection() as conn:
+        conn.execute("INSERT INTO arama_giderler (arama_giderler) VALUES ('integrity-check')")
+
+def test_triggers_follow_writes(db):
+    with get_connection() as conn:
+        bir = _gider_ekle(conn, "Asansör bakımı")
+        iki = _gider_ekle(conn, "Elektrik faturası")
+    assert _giderler("asansor") == [bir]
+
+    with get_connection() as conn:
+        conn.execute("UPDATE giderler SET aciklama='Asansör parçası' WHERE id=?", (iki,))
+        conn.execute("DELETE FROM giderler WHERE id=?", (bir,))
+    assert _giderler("asansör") == [iki]
+    assert _giderler("elektrik") == []
+    _dizin_saglam()
+
+def test_deferred_indexing_allows_changes_to_new_rows(db):
+    with get_connection() as conn:
+        eski = _gider_ekle(conn, "Çatı onarımı")
+    with bulk_write() as conn:
+        silinen = _gider_ekle(conn, "Çatı boyası")
+        degisen = _gider_ekle(conn, "Bahçe")
+        conn.execute("UPDATE giderler SET aciklama='Çatı temizliği' WHERE id=?", (degisen,))
+        conn.execute("DELETE FROM giderler WHERE id=?", (silinen,))
+        conn.execute("UPDATE giderler SET aciklama='Su faturası' WHERE id=?", (eski,))
+
+    _dizin_saglam()
+    assert _giderler("catı") == [degisen]
+    assert _giderler("bahce") == []
+    assert _giderler("su") == [eski]
+
+    # Asıl tetikleyiciler geri kurulmuş olmalı
+    with get_connection() as conn:
+        conn.execute("DELETE FROM giderler WHERE id=?", (degisen,))
+        yeni = _gider_ekle(conn, "Çatı kaplaması")
+    assert _giderler("çatı") == [yeni]
+    _dizin_saglam()
+
+def test_deferred_indexing_rollback_restores_triggers(db):
+    with get_connection() as conn:
+        once = [tuple(row) for row in conn.execute("SELECT name, sql FROM sqlite_master WHERE type='trigger' ORDER BY name")]
+    with pytest.raises(RuntimeError):
+        with get_connection() as conn:
+            conn.execute("BEGIN")
+            with deferred_indexing(conn.cursor(), "giderler"):
+                _gider_ekle(conn, "Geçici")
+                raise RuntimeError("iptal")
+    with get_connection() as conn:
+        assert [tuple(row) for row in conn.execute("SELECT name, sql FROM sqlite_master WHERE type='trigger' ORDER BY name")] == once
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import re
+from operator import itemgetter
 from datetime import datetime
 import locale
 
@@ -54,6 +55,22 @@ def validate_numeric_input(P):
         return True
     return P.isdigit()
 
+# Türkçe büyük/küçük harf ve karakter katlama: "Işık", "IŞIK", "isik" aynı biçime düşer
+TR_KATLAMA_KAYNAK = "İIıŞşÇçĞğÖöÜü"
+TR_KATLAMA_HEDEF = "iiissccggoouu"
+_TR_KATLAMA = str.maketrans(TR_KATLAMA_KAYNAK, TR_KATLAMA_HEDEF)
+
+def fold_tr(text, normalize_space=False):
+    """Türkçe karakterleri sadeleştirip küçük harfe çevirir
+
+    normalize_space=True ise '_' boşluk sayılır ve ardışık boşluklar tek
+    boşluğa indirilir (CSV başlıkları, ay adları gibi serbest girişler için).
+    """
+    text = text.translate(_TR_KATLAMA).lower()
+    if normalize_space:
+        text = " ".join(text.replace("_", " ").split())
+    return text
+
 def get_current_date():
     """Güncel tarihi döndürür (YYYY-MM-DD formatında)"""
     return datetime.now().strftime("%Y-%m-%d")
@@ -95,11 +112,20 @@ def create_scrollable_frame(parent, **kwargs):
     
     return container, scrollable_frame
 
-def setup_treeview(parent, columns, headings, column_widths=None):
-    """Treeview widget'ı oluşturur ve yapılandırır"""
+def setup_treeview(parent, columns, headings, column_widths=None, virtual=False,
+                   formatter=None):
+    """Treeview widget'ı oluşturur ve yapılandırır
+
+    virtual=True ise ikinci değer bir VirtualTreeview olur: satırlar
+    set_rows() ile verilir ve yalnızca görünen pencere Treeview'e yüklenir.
+    """
     # Scrollbar ile birlikte frame oluştur
     frame = ttk.Frame(parent)
     
+    if virtual:
+        vtree = VirtualTreeview(frame, columns, headings, column_widths, formatter=formatter)
+        return frame, vtree
+    
     # Treeview oluştur
     tree = ttk.Treeview(frame, columns=columns, show="headings")
     
@@ -121,6 +147,149 @@ def setup_treeview(parent, columns, headings, column_widths=None):
     
     return frame, tree
 
+class VirtualTreeview:
+    """Büyük sonuç kümeleri için sanal Treeview
+
+    Satırlar sıkıştırılmış bir listede (demet olarak) tutulur; Treeview'e
+    yalnızca görünen satırlar ve her iki yanda overscan kadar satır eklenir.
+    Kaydırma çubuğu tüm kümeyi temsil eder, sıralama widget öğeleri yerine
+    arka plandaki listede yapılır. Öğe kimlikleri satırın listedeki sırasıdır.
+    """
+    def __init__(self, frame, columns, headings, column_widths=None, overscan=20,
+                 formatter=None):
+        self.columns = list(columns)
+        self.overscan = overscan
+        self.formatter = formatter
+        self.rows = []
+        self.first = 0               # görünen ilk satır
+        self.visible = 20            # görünen satır sayısı (boyuta göre güncellenir)
+        self.loaded = (0, 0)         # Treeview'e yüklü satır aralığı [başlangıç, bitiş)
+        self.sort_column = None
+        self.sort_reverse = False
+
+        self.tree = ttk.Treeview(frame, columns=self.columns, show="headings")
+        self.vsb = ttk.Scrollbar(frame, orient="vertical", command=self._on_scrollbar)
+        hsb = ttk.Scrollbar(frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        for i, col in enumerate(self.columns):
+            self.tree.heading(col, text=headings[i], command=lambda c=col: self.sort_by(c))
+            if column_widths and i < len(column_widths):
+                self.tree.column(col, width=column_widths[i])
+
+        self.vsb.pack(side='right', fill='y')
+        hsb.pack(side='bottom', fill='x')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Up>", lambda e: self._move_focus(-1))
+        self.tree.bind("<Down>", lambda e: self._move_focus(1))
+        self.tree.bind("<Prior>", lambda e: self._move_focus(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._move_focus(self.visible))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, rows):
+        """Satırları değiştirir; sqlite3.Row vb. demetlere çevrilerek saklanır"""
+        self.rows = [tuple(row) for row in rows]
+        if self.sort_column is not None:
+            self._sort_rows()
+        self.first = 0
+        self._render(force=True)
+
+    def get_row(self, index):
+        """Arka plandaki listeden satırı döndürür"""
+        return self.rows[index]
+
+    def selected_rows(self):
+        """Seçili öğelerin satırlarını döndürür"""
+        return [self.rows[int(iid)] for iid in self.tree.selection()]
+
+    def sort_by(self, column):
+        """Sütuna göre sıralar; aynı sütuna tekrar tıklanınca yön değişir"""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self._sort_rows()
+        self.first = 0
+        self._render(force=True)
+
+    def _sort_rows(self):
+        index = self.columns.index(self.sort_column)
+        # Boş (None) değerler yönden bağımsız olarak sona
+        present = [row for row in self.rows if row[index] is not None]
+        missing = [row for row in self.rows if row[index] is None]
+        present.sort(key=itemgetter(index), reverse=self.sort_reverse)
+        self.rows = present + missing
+
+    def _scroll_to(self, first):
+        max_first = max(0, len(self.rows) - self.visible)
+        first = max(0, min(int(first), max_first))
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def _scroll_units(self, units):
+        self._scroll_to(self.first + units)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        return self._scroll_units(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(value) * len(self.rows))
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self._scroll_to(self.first + int(value) * step)
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - rowheight) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self._render(force=True)
+
+    def _move_focus(self, delta):
+        focus = self.tree.focus()
+        index = int(focus) + delta if focus else self.first
+        index = max(0, min(index, len(self.rows) - 1))
+        if index < self.first:
+            self._scroll_to(index)
+        elif index >= self.first + self.visible:
+            self._scroll_to(index - self.visible + 1)
+        if self.rows:
+            self.tree.selection_set(str(index))
+            self.tree.focus(str(index))
+        return "break"
+
+    def _render(self, force=False):
+        start, end = self.loaded
+        if force or self.first < start or self.first + self.visible > end:
+            # Görünen pencere yüklü aralığın dışına çıktı; yeniden yükle
+            start = max(0, self.first - self.overscan)
+            end = min(len(self.rows), self.first + self.visible + self.overscan)
+            self.tree.delete(*self.tree.get_children())
+            for index in range(start, end):
+                row = self.rows[index]
+                values = self.formatter(row) if self.formatter else row
+                self.tree.insert("", "end", iid=str(index), values=values)
+            self.loaded = (start, end)
+
+        if end > start:
+            self.tree.yview_moveto((self.first - start) / (end - start))
+        total = len(self.rows)
+        if total:
+            self.vsb.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
 def create_combobox_with_label(parent, label_text, values=None, default=None, width=20):
     """Etiket ile birlikte combobox oluşturur"""
     frame = ttk.Frame(parent)